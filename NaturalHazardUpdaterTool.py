@@ -280,6 +280,10 @@ run_coastalerosion = 0
 run_fuds = 0
 run_subsidence = 0
 subsidence_tif = r'C:\workspace\__HazardUpdates\ARE-12797_Subsidence\Subsidence_20150613_20240701_wNoData.tif'
+# Subsidence classes in feet: a bin width (e.g. 0.25) or class breaks (e.g. [-2, -1, -0.5, -0.25, 0]);
+# None for both keeps one polygon per centimeter of displacement
+subsidence_bin_width_ft = None
+subsidence_class_breaks_ft = None
 run_clandestine = 0
 run_railroads = 0
 run_agtimber_resources = 0
@@ -304,6 +308,25 @@ run_firedistricts = 0
 workspace_dir = r'C:\workspace\__HazardUpdates'
 current_jurisdictions_fc_path = r"C:\workspace\__BaseData\Corrected_Jurisdictions.gdb\CA_Jurisdictions"
 ticket = 'ARE-12872'
+# Raw downloads are shared across runs (content-addressed); keep this many versions per source
+raw_data_store_dir = os.path.join(workspace_dir, '_RawDataStore')
+raw_data_keep_versions = 3
+# Geocode results are cached across runs; misses are retried after the shorter TTL
+geocode_cache_path = os.path.join(raw_data_store_dir, 'geocode_cache.sqlite')
+geocode_cache_ttl_days = 180
+geocode_negative_ttl_days = 30
+# Optional offline reference index (OfflineGeocoder.build); ZIP/address-level local matches skip the online services
+geocode_offline_index = None  # e.g. r"C:\workspace\__BaseData\ca_geocode_index.sqlite"
+geocode_online = True  # False = geocode only from the offline index (no network)
+# Network engine limits (all module downloads, REST paging and geocoding share one event loop)
+fetch_max_connections = 16
+fetch_per_host = 4
+# Per-host politeness overrides (defaults in NaturalHazardUpdaterTool_Network.DEFAULT_HOST_POLICIES)
+fetch_host_policies = {
+    # "gis.conservation.ca.gov": HostPolicy(rate=1.0, burst=2, max_concurrent=2),
+}
+# Parallel geoprocessing (county reads, partitioned overlays/dissolves); None = one worker per CPU
+geoprocessing_workers = None
 # Windows example; on mac you can leave it unused/None (modules that use Selenium should handle it)
 chrome_driver_path = r"C:\Program Files (x86)\Google\Chrome\chromedriver.exe"
 
@@ -312,6 +335,14 @@ today = datetime.datetime.now()
 today_string = today.strftime("%Y%m%d_%H%M")
 ticket_suffix = f"_{ticket.strip()}" if ticket.strip() else ""
 
+configureRawDataStore(raw_data_store_dir, raw_data_keep_versions)
+configureGeocodeCache(geocode_cache_path, geocode_cache_ttl_days, geocode_negative_ttl_days)
+configureFetchEngine(max_connections=fetch_max_connections, per_host=fetch_per_host, host_policies=fetch_host_policies)
+configureGeocoder(here_api_key=os.getenv("HERE_API_KEY"), offline_index=geocode_offline_index,
+                  online=geocode_online)  # provider chain decided once for the run
+configureGeoprocessing(max_workers=geoprocessing_workers)
+configureReferenceData(current_jurisdictions_fc_path)  # CA jurisdictions/boundary, read once on first use
+
 # Create run workspace + output targets
 workspace, updates_target, ancillary_target, final_publish_path = create_workspace_paths(
     base_dir=workspace_dir,
@@ -408,7 +439,7 @@ if update_hazards:
     if run_coastalerosion:
         hazard_results.append(safe_call("Coastal Erosion", runCoastalBluffsErosion, *hazard_params))
     if run_subsidence:
-        hazard_results.append(safe_call("Subsidence", runSubsidence, *(hazard_params + [subsidence_tif])))
+        hazard_results.append(safe_call("Subsidence", runSubsidence, *(hazard_params + [subsidence_tif, subsidence_bin_width_ft, subsidence_class_breaks_ft])))
 
 # SRA belongs with natural hazards (keep behavior consistent)
 if run_sra:
@@ -443,6 +474,15 @@ else:
     # If someone insisted on final GDB, you could add a symmetric GDB harvester with ArcPy here.
     pass
 
+closeFetchEngine()
+
+# -------- Retention for the shared raw data store and geocode cache --------
+try:
+    getRawDataStore().prune()
+    getGeocodeCache().prune()
+except Exception as e:
+    writeMessages(log_file_path, f"Raw data store / geocode cache pruning failed — {e}", msg_type="warning")
+
 # Final log
 writeMessages(
     log_file_path,
@@ -0,0 +1,287 @@
+"""
+Content-addressed store for raw source artifacts (zips, CSVs, spreadsheets...).
+
+Layout under the store root:
+    objects/<sha[:2]>/<sha256>      one file per distinct artifact
+    sources/<source>.json           per-source history: url, fetch time, ETag, Last-Modified, sha256
+    outputs/<module>/<fingerprint>  cached module outputs, keyed by input hashes + processing params
+
+Artifacts are shared across runs and hard-linked into each run workspace
+(falling back to a copy where the file system does not support links).
+"""
+from __future__ import annotations
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+import datetime
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+from NaturalHazardUpdaterTool_Network import getFetchEngine
+
+logger = logging.getLogger("hazard_tools")
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _safe_name(source: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", source.strip()).strip("_") or "source"
+
+
+def hashFile(path: str) -> str:
+    """SHA-256 of a file, read in 1 MB chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hashPath(path: str) -> str:
+    """
+    SHA-256 of an input dataset: a file, a folder (e.g. a FileGDB), or a
+    feature class inside a FileGDB / GeoPackage (the whole container is hashed).
+    Raises FileNotFoundError for any other missing path.
+    """
+    probe = path
+    if not os.path.exists(probe):
+        # only a layer path inside an existing .gdb/.gpkg falls back to its container
+        while probe and not probe.lower().rstrip("\\/").endswith((".gdb", ".gpkg")) and os.path.dirname(probe) != probe:
+            probe = os.path.dirname(probe)
+        if not probe.lower().rstrip("\\/").endswith((".gdb", ".gpkg")) or not os.path.exists(probe):
+            raise FileNotFoundError(path)
+    if os.path.isfile(probe):
+        return hashFile(probe)
+    if not os.path.isdir(probe):
+        raise FileNotFoundError(path)
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(probe):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".lock"):
+                continue  # FileGDB lock files change on every open
+            full = os.path.join(root, name)
+            h.update(os.path.relpath(full, probe).replace(os.sep, "/").encode("utf-8"))
+            h.update(hashFile(full).encode("ascii"))
+    return h.hexdigest()
+
+
+def fingerprint(module: str, input_hashes: List[str], params: Dict[str, Any]) -> str:
+    """Stable id for one module run: its input hashes plus its processing parameters."""
+    payload = json.dumps({"module": module, "inputs": list(input_hashes), "params": params},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def linkOrCopy(src: str, dst: str) -> str:
+    """Hard-link `src` to `dst` (replacing `dst`); copy if linking is not possible."""
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+class RawDataStore:
+    """
+    Shared, content-addressed store of raw downloads.
+
+    store = RawDataStore(r"C:\\workspace\\__HazardUpdates\\_RawDataStore", keep_versions=3)
+    zip_path = store.fetch("geotracker_sites", url, other_data_folder, "LUST_Sites.zip")
+    """
+
+    def __init__(self, root: str, keep_versions: int = 3):
+        self.root = root
+        self.keep_versions = keep_versions
+        self._objects = os.path.join(root, "objects")
+        self._sources = os.path.join(root, "sources")
+        self._lock = threading.RLock()
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._sources, exist_ok=True)
+
+    # ---------------- metadata ----------------
+    def _meta_path(self, source: str) -> str:
+        return os.path.join(self._sources, f"{_safe_name(source)}.json")
+
+    def history(self, source: str) -> List[Dict[str, Any]]:
+        """All recorded versions of a source, newest first."""
+        path = self._meta_path(source)
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("versions", [])
+
+    def latest(self, source: str) -> Optional[Dict[str, Any]]:
+        versions = self.history(source)
+        return versions[0] if versions else None
+
+    def _write_history(self, source: str, versions: List[Dict[str, Any]]) -> None:
+        path = self._meta_path(source)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"source": source, "versions": versions}, f, indent=2)
+        os.replace(tmp, path)
+
+    def _record(self, source: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            versions = [v for v in self.history(source) if v["sha256"] != entry["sha256"]]
+            self._write_history(source, [entry] + versions)
+
+    # ---------------- objects ----------------
+    def objectPath(self, sha256: str) -> str:
+        return os.path.join(self._objects, sha256[:2], sha256)
+
+    def _adopt(self, tmp_path: str, sha256: str) -> str:
+        """Move a fully written temp file into the object store (or drop it if already present)."""
+        obj = self.objectPath(sha256)
+        with self._lock:
+            if os.path.exists(obj):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(obj), exist_ok=True)
+                os.replace(tmp_path, obj)
+        return obj
+
+    def ingest(self, source: str, path: str, url: Optional[str] = None,
+               etag: Optional[str] = None, last_modified: Optional[str] = None) -> str:
+        """
+        Add an existing local file (e.g. a browser download) to the store and
+        replace it in place with a hard link to the stored object. Returns its sha256.
+        """
+        sha256 = hashFile(path)
+        obj = self.objectPath(sha256)
+        with self._lock:
+            if not os.path.exists(obj):
+                os.makedirs(os.path.dirname(obj), exist_ok=True)
+                shutil.copy2(path, obj)
+        linkOrCopy(obj, path)
+        self._record(source, self._entry(sha256, obj, url, etag, last_modified, os.path.basename(path)))
+        return sha256
+
+    @staticmethod
+    def _entry(sha256: str, obj: str, url: Optional[str], etag: Optional[str],
+               last_modified: Optional[str], filename: Optional[str]) -> Dict[str, Any]:
+        return {
+            "sha256": sha256,
+            "url": url,
+            "fetched_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": os.path.getsize(obj),
+            "filename": filename,
+        }
+
+    # ---------------- fetch ----------------
+    def fetch(self, source: str, url: str, dest_folder: str, filename: Optional[str] = None) -> str:
+        """
+        Return a path in `dest_folder` to the current artifact for `source`.
+
+        Sends a conditional GET (If-None-Match / If-Modified-Since) through the
+        run's fetch engine when the source has been fetched before; on 304 the
+        stored object is reused. Otherwise the body is streamed to disk and
+        hashed in one pass.
+        """
+        previous = self.latest(source)
+        headers: Dict[str, str] = {}
+        if previous and os.path.exists(self.objectPath(previous["sha256"])):
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+        else:
+            previous = None
+
+        fd, tmp_path = tempfile.mkstemp(dir=self._objects, suffix=".part")
+        os.close(fd)
+        try:
+            status, resp_headers, sha256 = getFetchEngine().download(url, tmp_path, headers)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+        if status == 304 and previous:
+            os.remove(tmp_path)
+            logger.info(f"{source}: not modified since {previous['fetched_at']}, reusing stored copy")
+            obj = self.objectPath(previous["sha256"])
+            name = filename or previous.get("filename") or previous["sha256"]
+            return linkOrCopy(obj, os.path.join(dest_folder, name))
+
+        obj = self._adopt(tmp_path, sha256)
+        if previous and previous["sha256"] == sha256:
+            logger.info(f"{source}: download identical to {previous['fetched_at']} version")
+        name = filename or os.path.basename(url.split("?")[0]) or sha256
+        self._record(source, self._entry(sha256, obj, url, resp_headers.get("ETag"), resp_headers.get("Last-Modified"), name))
+        return linkOrCopy(obj, os.path.join(dest_folder, name))
+
+    # ---------------- module output cache ----------------
+    def outputCacheDir(self, module: str) -> str:
+        """Folder holding cached outputs of `module`, one <fingerprint>.gdb / .gpkg per run."""
+        path = os.path.join(self.root, "outputs", _safe_name(module))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _prune_outputs(self, keep: int) -> int:
+        outputs_root = os.path.join(self.root, "outputs")
+        if not os.path.isdir(outputs_root):
+            return 0
+        removed = 0
+        for module in os.listdir(outputs_root):
+            module_dir = os.path.join(outputs_root, module)
+            entries = sorted((os.path.join(module_dir, e) for e in os.listdir(module_dir)),
+                             key=os.path.getmtime, reverse=True)
+            for stale in entries[max(keep, 1):]:
+                if os.path.isdir(stale):
+                    shutil.rmtree(stale, ignore_errors=True)
+                else:
+                    os.remove(stale)
+                removed += 1
+        return removed
+
+    # ---------------- retention ----------------
+    def prune(self, keep_versions: Optional[int] = None, max_age_days: Optional[int] = None) -> int:
+        """
+        Keep the newest `keep_versions` versions of each source (the newest is
+        always kept, regardless of age), drop older ones and delete objects no
+        longer referenced. Cached module outputs are trimmed to the same count.
+        Returns the number of artifacts removed.
+        """
+        keep = self.keep_versions if keep_versions is None else keep_versions
+        cutoff = None
+        if max_age_days is not None:
+            cutoff = datetime.datetime.now() - datetime.timedelta(days=max_age_days)
+
+        with self._lock:
+            referenced = set()
+            for meta_file in os.listdir(self._sources):
+                if not meta_file.endswith(".json"):
+                    continue
+                with open(os.path.join(self._sources, meta_file), "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                versions = meta.get("versions", [])
+                kept = versions[:max(keep, 1)]
+                if cutoff is not None:
+                    kept = kept[:1] + [v for v in kept[1:] if datetime.datetime.fromisoformat(v["fetched_at"]) >= cutoff]
+                if len(kept) != len(versions):
+                    self._write_history(meta.get("source", meta_file[:-5]), kept)
+                referenced.update(v["sha256"] for v in kept)
+
+            removed = 0
+            for prefix in os.listdir(self._objects):
+                prefix_dir = os.path.join(self._objects, prefix)
+                if not os.path.isdir(prefix_dir):
+                    continue
+                for name in os.listdir(prefix_dir):
+                    if name not in referenced:
+                        os.remove(os.path.join(prefix_dir, name))
+                        removed += 1
+            removed += self._prune_outputs(keep)
+        if removed:
+            logger.info(f"Raw data store: pruned {removed} unreferenced artifact(s)")
+        return removed
@@ -4,20 +4,23 @@ import sys
 import csv
 import glob
 import json
+import io
+import re
 import time
 import math
-import random
+import asyncio
 import shutil
 import logging
+import threading
 import datetime
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 # HTTP & utilities
-import requests
 from urllib.parse import urlencode
 from urllib.request import urlopen
 from fnmatch import fnmatch
+from zipfile import ZipFile
 
 # Selenium (as in your original)
 from selenium import webdriver
@@ -29,6 +32,20 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support import expected_conditions as ec
 
+# Run-wide asyncio network engine (REST paging, downloads, geocoding)
+from NaturalHazardUpdaterTool_Network import FetchError, FetchEngine, HostPolicy, closeFetchEngine, configureFetchEngine, getFetchEngine
+
+# Shared raw-data store (content-addressed, reused across runs)
+from NaturalHazardUpdaterTool_DataStore import RawDataStore, fingerprint, hashFile, hashPath, linkOrCopy
+
+# Geocoding support (run-wide client, persistent result cache)
+from NaturalHazardUpdaterTool_Geocoding import (GeocodeCache, GeocoderClient, OfflineGeocoder, cacheKey, composeAddresses,
+                                                normalizeAddress, normalizeAddresses)
+
+# Vectorized geoprocessing (zone rules, ...)
+from NaturalHazardUpdaterTool_Geoprocessing import (Quantizer, ReferenceData, ZoneRules, configureGeoprocessing, dissolveFrame,
+                                                    overlayDissolve, rasterToPolygons, readFrame, readFramesParallel, workerCount)
+
 # Optional GIS stack (fallback if ArcPy is unavailable)
 ARCPY_AVAILABLE = False
 try:
@@ -53,14 +70,6 @@ def _lazy_import_gis():
         io_driver = "fiona"
     return gp, sh, pj, io_driver
 
-def _lazy_import_esridump():
-    import importlib
-    return importlib.import_module("esridump")
-
-def _lazy_import_geopy():
-    import importlib
-    return importlib.import_module("geopy")
-
 
 # ------------------------------------------------------------------------------
 # Logging
@@ -95,6 +104,139 @@ def writeMessages(log_path: str, message: str, print_bool: bool = True, msg_type
             arcpy.AddError(message)  # type: ignore
 
 
+# ------------------------------------------------------------------------------
+# Raw source artifacts
+# ------------------------------------------------------------------------------
+_raw_data_store: Optional[RawDataStore] = None
+
+
+def configureRawDataStore(root: str, keep_versions: int = 3) -> RawDataStore:
+    """Set the store used by fetchSource()/storeDownload() for this run."""
+    global _raw_data_store
+    _raw_data_store = RawDataStore(root, keep_versions)
+    return _raw_data_store
+
+
+def getRawDataStore() -> RawDataStore:
+    """Configured store, else $HAZARD_RAW_DATA_STORE, else ~/.hazard_tools/raw_data_store."""
+    global _raw_data_store
+    if _raw_data_store is None:
+        root = os.getenv("HAZARD_RAW_DATA_STORE") or os.path.join(os.path.expanduser("~"), ".hazard_tools", "raw_data_store")
+        _raw_data_store = RawDataStore(root)
+    return _raw_data_store
+
+
+def fetchSource(source: str, url: str, dest_folder: str, filename: Optional[str] = None) -> str:
+    """
+    Get the current artifact for `source` from `url` and return its path in `dest_folder`.
+    Unchanged artifacts are reused from the shared store and hard-linked, not re-downloaded or copied.
+    """
+    return getRawDataStore().fetch(source, url, dest_folder, filename)
+
+
+def storeDownload(source: str, path: str, url: Optional[str] = None) -> str:
+    """Move a browser download into the shared store (leaving a hard link behind). Returns `path`."""
+    try:
+        getRawDataStore().ingest(source, path, url)
+    except Exception as e:
+        logger.warning(f"Unable to add {os.path.basename(path)} to the raw data store: {e}")
+    return path
+
+
+# ------------------------------------------------------------------------------
+# Module output cache (skip processing when inputs are unchanged)
+# ------------------------------------------------------------------------------
+def moduleFingerprint(module_name: str, input_paths: Sequence[str], params: Dict[str, Any]) -> str:
+    """
+    Fingerprint a module run from the hashes of its input files/datasets and its
+    processing parameters (field mappings, queries, target WKID, a version number...).
+    """
+    return fingerprint(module_name, [hashPath(p) for p in input_paths], params)
+
+
+def _gpkg_layer_spec(layer_path: str, default_layer: str) -> Tuple[str, str]:
+    # accepts "gpkg:/path/file.gpkg#Layer" (open-source module returns) or a plain .gpkg path
+    if layer_path.startswith("gpkg:"):
+        path, _, layer = layer_path[len("gpkg:"):].partition("#")
+        return path, layer or default_layer
+    return layer_path, default_layer
+
+
+def restoreCachedOutput(module_name: str, fingerprint_id: str, output_name: str, naturalhazards_gdb: str) -> Optional[str]:
+    """
+    If a previous run with the same fingerprint left a cached output, copy it to
+    `naturalhazards_gdb` and return the new layer path. Returns None on a cache miss.
+    The copy's `last_updated` field is restamped with the current time, as a
+    fresh run would do.
+    """
+    cache_dir = getRawDataStore().outputCacheDir(module_name)
+    try:
+        if ARCPY_AVAILABLE:
+            cached_fc = os.path.join(cache_dir, f"{fingerprint_id}.gdb", output_name)
+            if not arcpy.Exists(cached_fc):  # type: ignore
+                return None
+            final_layer = os.path.join(naturalhazards_gdb, output_name)
+            arcpy.CopyFeatures_management(cached_fc, final_layer)  # type: ignore
+            if "last_updated" in [f.name for f in arcpy.ListFields(final_layer)]:  # type: ignore
+                addDTField(final_layer)
+            return final_layer
+
+        cached_gpkg = os.path.join(cache_dir, f"{fingerprint_id}.gpkg")
+        if not os.path.exists(cached_gpkg):
+            return None
+        gp, sh, pj, io_driver = _lazy_import_gis()
+        target, layer = _gpkg_layer_spec(naturalhazards_gdb, output_name)
+        cached_gdf = gp.read_file(cached_gpkg, layer=output_name)
+        if "last_updated" in cached_gdf.columns:
+            cached_gdf["last_updated"] = datetime.datetime.now()
+        cached_gdf.to_file(target, layer=layer, driver="GPKG")
+        return f"gpkg:{target}#{layer}"
+    except Exception as e:
+        logger.warning(f"Unable to reuse cached {module_name} output ({e}); processing from scratch.")
+        return None
+
+
+def cacheModuleOutput(module_name: str, fingerprint_id: str, layer_path: str, output_name: str) -> None:
+    """Keep a copy of a finished module output so an identical future run can skip processing."""
+    cache_dir = getRawDataStore().outputCacheDir(module_name)
+    try:
+        if ARCPY_AVAILABLE:
+            cache_gdb_name = f"{fingerprint_id}.gdb"
+            cache_gdb = os.path.join(cache_dir, cache_gdb_name)
+            if not os.path.exists(cache_gdb):
+                arcpy.CreateFileGDB_management(cache_dir, cache_gdb_name)  # type: ignore
+            arcpy.CopyFeatures_management(layer_path, os.path.join(cache_gdb, output_name))  # type: ignore
+            return
+
+        gp, sh, pj, io_driver = _lazy_import_gis()
+        source, layer = _gpkg_layer_spec(layer_path, output_name)
+        gp.read_file(source, layer=layer).to_file(os.path.join(cache_dir, f"{fingerprint_id}.gpkg"), layer=output_name, driver="GPKG")
+    except Exception as e:
+        logger.warning(f"Unable to cache {module_name} output: {e}")
+
+
+def writeHazardGeoPackage(gdf: Any, final_gdb: str, naturalhazards_gdb: str, output_name: str, today_string: str,
+                          log_file_path: str) -> str:
+    """
+    Open-source output step: write `gdf` as a layer of a dated .gpkg in the final
+    folder and of the natural hazards GeoPackage (a sibling .gpkg when a .gdb
+    path was given). Returns "gpkg:<path>#<layer>".
+    """
+    final_folder = final_gdb if os.path.isdir(final_gdb) else os.path.dirname(final_gdb)
+    gdf.to_file(os.path.join(final_folder, f"{output_name}_{today_string}.gpkg"), layer=output_name, driver="GPKG")
+
+    if naturalhazards_gdb.lower().endswith(".gdb"):
+        nat_gpkg = os.path.splitext(naturalhazards_gdb)[0] + ".gpkg"
+        writeMessages(log_file_path, f"ArcPy not available; writing GeoPackage instead of FileGDB: {nat_gpkg}",
+                      msg_type="warning")
+    elif os.path.isdir(naturalhazards_gdb):
+        nat_gpkg = os.path.join(naturalhazards_gdb, "naturalhazards.gpkg")
+    else:
+        nat_gpkg = os.path.splitext(naturalhazards_gdb)[0] + ".gpkg"
+    gdf.to_file(nat_gpkg, layer=output_name, driver="GPKG")
+    return f"gpkg:{nat_gpkg}#{output_name}"
+
+
 # ------------------------------------------------------------------------------
 # ArcPy helpers (with open-source fallbacks)
 # ------------------------------------------------------------------------------
@@ -183,31 +325,38 @@ def _divide_chunks(seq: Sequence[Any], n: int) -> Iterable[Sequence[Any]]:
         yield seq[i:i+n]
 
 
+def _write_bytes(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
 def extractGeoJson(
     layer_url: str,
     output_name: str,
     download_folder: str,
     sr_wkid: str | int = "3857",
-    wait_time: Tuple[float, float] = (3, 2),
     out_format: str = "gdb_or_gpkg",
 ) -> Optional[str]:
     """
     Download an ArcGIS Feature Service layer into a local dataset.
+    Pages are requested concurrently through the run's fetch engine, paced
+    by its per-host rate limits.
 
     ArcPy mode:
       - Queries in chunks and merges into FileGDB feature class.
 
     Open-source mode:
-      - Uses `esridump` to dump to GeoJSON, then GeoPandas to write a GeoPackage (.gpkg).
+      - Queries GeoJSON pages, then GeoPandas writes a GeoPackage (.gpkg).
 
     Returns path to the final dataset, or None on error.
     """
     os.makedirs(download_folder, exist_ok=True)
+    engine = getFetchEngine()
     if ARCPY_AVAILABLE:
         # ----- ArcPy path (your original flow, slightly hardened) -----
         try:
-            meta = requests.get(layer_url, params={"f": "json"}, timeout=60).json()
-        except Exception as e:
+            meta = engine.getJson(layer_url, {"f": "json"})
+        except FetchError as e:
             logger.error(f"Failed to reach layer metadata: {e}")
             return None
 
@@ -219,7 +368,11 @@ def extractGeoJson(
         fc_geometry_type = geometry_type.replace('esriGeometry', '') + 's'
 
         q_params = {'f': 'json', 'outFields': '*', 'returnIdsOnly': 'true', 'where': '1=1'}
-        data = requests.get(f"{layer_url}/query", params=q_params, timeout=120).json()
+        try:
+            data = engine.getJson(f"{layer_url}/query", q_params)
+        except FetchError as e:
+            logger.error(e)
+            return None
         if "error" in data:
             logger.error(data["error"])
             return None
@@ -228,12 +381,7 @@ def extractGeoJson(
         logger.info(f"{len(object_ids):,} Features Found")
         feature_classes = []
 
-        for i, chunk in enumerate(_divide_chunks(object_ids, 100)):
-            time.sleep(wait_time[0] + random.random() * wait_time[1])
-            out_json = f"{output_name}_{i}.json"
-            out_json_path = os.path.join(download_folder, out_json)
-            logger.info(f"Processing Subset {i+1}...")
-            oid_list = ",".join(map(str, chunk))
+        async def _download_subset(i: int, chunk: Sequence[Any]) -> str:
             params = {
                 'f': 'json',
                 'returnGeometry': 'true',
@@ -244,14 +392,29 @@ def extractGeoJson(
                 'outFields': '*',
                 'where': '1=1',
                 'outSR': sr_wkid,
-                'objectIds': oid_list
+                'objectIds': ",".join(map(str, chunk))
             }
-            resp = requests.get(f"{layer_url}/query", params=params, timeout=300)
-            resp.raise_for_status()
-            with open(out_json_path, "wb") as f:
-                f.write(resp.content)
-            json_fc = arcpy.JSONToFeatures_conversion(out_json_path, rf"in_memory\subset_{i}")  # type: ignore
-            feature_classes.append(json_fc)
+            body = await engine.getBytesAsync(f"{layer_url}/query", params)
+            out_json_path = os.path.join(download_folder, f"{output_name}_{i}.json")
+            # keep the event loop free for the other downloads while the file is written
+            await asyncio.get_running_loop().run_in_executor(None, _write_bytes, out_json_path, body)
+            return out_json_path
+
+        # all subsets download in the background; each is converted as soon as it lands
+        subsets = [engine.submit(_download_subset(i, chunk)) for i, chunk in enumerate(_divide_chunks(object_ids, 100))]
+        try:
+            for i, subset in enumerate(subsets):
+                out_json_path = subset.result()
+                logger.info(f"Processing Subset {i+1}/{len(subsets)}...")
+                json_fc = arcpy.JSONToFeatures_conversion(out_json_path, rf"in_memory\subset_{i}")  # type: ignore
+                feature_classes.append(json_fc)
+        except FetchError as e:
+            for pending in subsets:
+                pending.cancel()
+            for fc in feature_classes:
+                arcpy.Delete_management(fc)  # type: ignore
+            logger.error(f"Failed to download {layer_url}: {e}")
+            return None
 
         final_gdb_name = f"{output_name}_{fc_geometry_type}.gdb"
         final_gdb = os.path.join(download_folder, final_gdb_name)
@@ -272,24 +435,16 @@ def extractGeoJson(
 
     # ----- Open-source path -----
     gp, sh, pj, io_driver = _lazy_import_gis()
-    esridump = _lazy_import_esridump()
-
-    # Dump to GeoJSON
-    geojson_path = os.path.join(download_folder, f"{output_name}.geojson")
-    if os.path.exists(geojson_path):
-        os.remove(geojson_path)
-
-    # esridump handles pagination, geometry conversion to GeoJSON
-    logger.info("Dumping features with esridump...")
-    with open(geojson_path, "w", encoding="utf-8") as f:
-        for feature in esridump.search(layer_url, where="1=1", outSR=sr_wkid):
-            f.write(json.dumps(feature) + "\n")  # newline-delimited GeoJSON Features
-
-    # Read NDJSON into GeoDataFrame
-    logger.info("Loading GeoJSON into GeoPandas...")
-    # Build a proper FeatureCollection in-memory
-    with open(geojson_path, "r", encoding="utf-8") as f:
-        feats = [json.loads(line) for line in f if line.strip()]
+
+    logger.info("Querying features as GeoJSON pages...")
+    try:
+        pages = engine.queryLayer(layer_url, sr_wkid, out_format="geojson")
+    except FetchError as e:
+        logger.error(f"Failed to download {layer_url}: {e}")
+        return None
+    feats = [feature for page in pages for feature in page.get("features") or []]
+    logger.info(f"{len(feats):,} Features Found")
+
     fc = {"type": "FeatureCollection", "features": feats}
     gdf = gp.GeoDataFrame.from_features(fc, crs=f"EPSG:{int(sr_wkid)}")
 
@@ -305,59 +460,312 @@ def extractGeoJson(
 # ------------------------------------------------------------------------------
 # Table → Points (ArcPy or GeoPandas)
 # ------------------------------------------------------------------------------
-def tableToPoints(
-    input_header: List[str],
-    data: List[List[str]],
+def _normalize_header(columns: Iterable[Any]) -> List[str]:
+    # Field names can't start with a digit or contain punctuation
+    names = (re.sub(r"[^0-9A-Za-z_]", "_", h) for h in map(str, columns))
+    return [("_" + h) if h and h[0].isdigit() else h for h in names]
+
+
+def normalizeFieldName(name: Any) -> str:
+    """Header text -> field name as the table readers produce it ("SITE / NAME" -> "SITE___NAME")."""
+    return _normalize_header([str(name).strip().replace(" ", "_")])[0]
+
+
+def applySchema(df: Any, schema: Optional[Dict[str, str]]) -> Any:
+    """
+    Casts columns to compact dtypes. `schema` maps field name -> one of
+    "category" (low-cardinality text), "int" (nullable Int64), "float", "date"
+    or "text". Values that don't parse become null; fields not in `df` are skipped.
+    """
+    import pandas as pd
+    if not schema:
+        return df
+    df = df.copy(deep=False)
+    for field, kind in schema.items():
+        if field not in df.columns:
+            continue
+        col = df[field]
+        if kind == "category":
+            df[field] = col.astype("string").str.strip().astype("category")
+        elif kind == "int":
+            df[field] = pd.to_numeric(col, errors="coerce").round().astype("Int64")
+        elif kind == "float":
+            df[field] = pd.to_numeric(col, errors="coerce").astype("float64")
+        elif kind == "date":
+            df[field] = pd.to_datetime(col, errors="coerce")
+        elif kind == "text":
+            df[field] = col.astype("string")
+        else:
+            raise ValueError(f"Unknown schema type [{kind}] for field [{field}]")
+    return df
+
+
+def _text_columns(df: Any) -> List[str]:
+    import pandas as pd
+    return [c for c in df.columns
+            if not (pd.api.types.is_numeric_dtype(df[c]) or pd.api.types.is_datetime64_any_dtype(df[c]))]
+
+
+def _text_field_lengths(df: Any, columns: Sequence[str]) -> Dict[str, int]:
+    """Longest value + 1 per text column (for ArcPy TEXT sizes), computed column-wise."""
+    import pandas as pd
+    lengths: Dict[str, int] = {}
+    for c in columns:
+        col = df[c]
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            col = col.cat.categories.to_series()  # only the distinct values need measuring
+        longest = col.astype("string").str.len().max()
+        lengths[c] = (0 if pd.isna(longest) else int(longest)) + 1
+    return lengths
+
+
+def _write_points(gdf: Any, open_source_output: str, out_name: str) -> str:
+    # Write or replace the GeoPackage layer (or a shapefile)
+    if open_source_output.lower().endswith(".gpkg"):
+        if os.path.exists(open_source_output):
+            os.remove(open_source_output)
+        gdf.to_file(open_source_output, layer=out_name, driver="GPKG")
+        return open_source_output
+    shp_path = open_source_output if open_source_output.lower().endswith(".shp") else f"{open_source_output}.shp"
+    gdf.to_file(shp_path)
+    return shp_path
+
+
+def _as_frame(table: Any, header: Optional[Sequence[str]] = None) -> Any:
+    """DataFrame with normalized column names from a DataFrame, pyarrow Table/RecordBatch or list of rows."""
+    import pandas as pd
+    if isinstance(table, pd.DataFrame):
+        df = table
+    elif hasattr(table, "to_pandas"):
+        df = table.to_pandas()
+    else:
+        if header is None:
+            raise ValueError("`header` is required when rows are passed as lists")
+        df = pd.DataFrame([r[:len(header)] for r in table], columns=list(header)).fillna("")
+    return df.set_axis(_normalize_header(df.columns), axis=1)
+
+
+# Rejected-row reason codes, in order of precedence
+REJECT_MISSING_LAT = "missing_lat"
+REJECT_MISSING_LONG = "missing_long"
+REJECT_NON_NUMERIC = "non_numeric"
+REJECT_NULL_ISLAND = "null_island"
+REJECT_OUTSIDE_CA = "outside_ca"
+REJECT_REASON_FIELD = "REJECT_REASON"
+
+# California extent in geographic coordinates (xmin, ymin, xmax, ymax), padded ~10 km
+CA_BOUNDS = (-124.6, 32.4, -114.0, 42.1)
+_GEOGRAPHIC_WKIDS = (4326, 4269, 4152)  # WGS84, NAD83, NAD83(HARN)
+
+
+def rejectionReasons(df: Any, lat_field: str, long_field: str,
+                     bounds: Optional[Tuple[float, float, float, float]] = CA_BOUNDS) -> Any:
+    """
+    Vectorized reason code per row (None for usable rows): missing_lat,
+    missing_long, non_numeric, null_island (0, 0) or outside_ca (`bounds`; skip with None).
+    """
+    import numpy as np
+    import pandas as pd
+    raw_lat = df[lat_field].astype("string").str.strip().fillna("")
+    raw_long = df[long_field].astype("string").str.strip().fillna("")
+    lat = pd.to_numeric(raw_lat, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    lon = pd.to_numeric(raw_long, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+    conditions = [
+        (raw_lat == "").to_numpy(dtype=bool),
+        (raw_long == "").to_numpy(dtype=bool),
+        np.isnan(lat) | np.isnan(lon),
+        (np.abs(lat) < 1e-6) & (np.abs(lon) < 1e-6),
+    ]
+    choices = [REJECT_MISSING_LAT, REJECT_MISSING_LONG, REJECT_NON_NUMERIC, REJECT_NULL_ISLAND]
+    if bounds is not None:
+        xmin, ymin, xmax, ymax = bounds
+        conditions.append(~((lon >= xmin) & (lon <= xmax) & (lat >= ymin) & (lat <= ymax)))
+        choices.append(REJECT_OUTSIDE_CA)
+    reasons = np.select(conditions, choices, default="")
+    return pd.Series(reasons, index=df.index, dtype="string").replace("", pd.NA)
+
+
+def _split_valid_points(df: Any, lat_field: str, long_field: str, sr_wkid: int | str = 4326) -> Tuple[Any, Any, Any, Any]:
+    """
+    Returns (usable rows, rejected rows with a REJECT_REASON column, lon, lat) where lon/lat
+    are aligned to the usable rows. The CA bounds check only applies to geographic inputs.
+    """
+    import pandas as pd
+    bounds = CA_BOUNDS if int(sr_wkid) in _GEOGRAPHIC_WKIDS else None
+    reasons = rejectionReasons(df, lat_field, long_field, bounds)
+    valid = reasons.isna().to_numpy()
+    good = df.loc[valid]
+    lat = pd.to_numeric(good[lat_field], errors="coerce")
+    lon = pd.to_numeric(good[long_field], errors="coerce")
+    missed = df.loc[~valid].assign(**{REJECT_REASON_FIELD: reasons[~valid]})
+    return good, missed, lon, lat
+
+
+class RejectedRowsWriter:
+    """
+    Columnar sidecar for rejected rows: Parquet (pyarrow) appended chunk by chunk,
+    or CSV when pyarrow is not installed. Values are stored as text so chunks with
+    different inferred types share one schema.
+
+    with RejectedRowsWriter(path) as rejects:
+        rejects.write(missed_df)
+    """
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow.parquet as pq
+            self._pq = pq
+        except ImportError:
+            self._pq = None
+            path = os.path.splitext(path)[0] + ".csv"
+        self.path = path
+        self.counts: Dict[str, int] = {}
+        self._writer = None
+        self._schema = None
+        if os.path.exists(path):
+            os.remove(path)
+
+    def write(self, missed: Any) -> None:
+        if not len(missed):
+            return
+        for reason, n in missed[REJECT_REASON_FIELD].value_counts().items():
+            self.counts[reason] = self.counts.get(reason, 0) + int(n)
+        text = missed.astype("string")
+        if self._pq is None:
+            text.to_csv(self.path, mode="a", header=not os.path.exists(self.path), index=False)
+            return
+        import pyarrow as pa
+        if self._writer is None:
+            self._schema = pa.schema([(str(c), pa.string()) for c in text.columns])
+            self._writer = self._pq.ParquetWriter(self.path, self._schema)
+        text = text.reindex(columns=self._schema.names)
+        self._writer.write_table(pa.Table.from_pandas(text, schema=self._schema, preserve_index=False))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> "RejectedRowsWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def rejectionSummary(counts: Dict[str, int], rejects_path: Optional[str] = None) -> str:
+    """One log message with the rejected-row count per reason."""
+    total = sum(counts.values())
+    m = "Warning, {} records were rejected:\n".format(total)
+    for reason, n in sorted(counts.items(), key=lambda kv: -kv[1]):
+        m += "\t{}: {}\n".format(reason, n)
+    if rejects_path:
+        m += "\tRejected rows written to {}\n".format(rejects_path)
+    return m
+
+
+def _default_rejects_path(processing_target: str, open_source_output: Optional[str], out_name: str) -> str:
+    base_dir = processing_target if ARCPY_AVAILABLE else os.path.dirname(open_source_output or processing_target)
+    if base_dir.lower().endswith(".gdb"):
+        base_dir = os.path.dirname(base_dir)
+    return os.path.join(base_dir, f"{out_name}_rejected.parquet")
+
+
+def _points_to_records(good: Any, lon: Any, lat: Any, field_lengths: Dict[str, int]) -> Any:
+    """NumPy structured array for arcpy.da.NumPyArrayToFeatureClass (text columns as fixed-width unicode)."""
+    import numpy as np
+    import pandas as pd
+    header = list(good.columns)
+    arrays = []
+    for c in header:
+        col = good[c]
+        if c in field_lengths:
+            width = max(min(field_lengths[c], 255), 1)
+            if isinstance(col.dtype, pd.CategoricalDtype):
+                # encode each category once, then gather by code (-1 -> "")
+                cats = col.cat.categories.astype(str).str.slice(0, width).to_numpy(dtype=f"<U{width}")
+                arrays.append(np.append(cats, np.array([""], dtype=f"<U{width}"))[col.cat.codes.to_numpy()])
+            else:
+                arrays.append(col.astype("string").fillna("").str.slice(0, width).to_numpy(dtype=f"<U{width}"))
+        elif isinstance(col.dtype, pd.Int64Dtype):
+            # ArcPy has no null integers in NumPy input: keep LONG when complete and in range, else DOUBLE
+            complete = not col.isna().any()
+            if complete and (not len(col) or (col.min() >= -2**31 and col.max() < 2**31)):
+                arrays.append(col.to_numpy(dtype="int32"))
+            else:
+                arrays.append(col.to_numpy(dtype="float64", na_value=np.nan))
+        elif pd.api.types.is_datetime64_any_dtype(col):
+            arrays.append(col.to_numpy(dtype="datetime64[us]"))
+        else:
+            arrays.append(col.to_numpy())
+    arrays += [np.asarray(lon, dtype="float64"), np.asarray(lat, dtype="float64")]
+    return np.rec.fromarrays(arrays, names=header + ["POINT_X_", "POINT_Y_"])
+
+
+def tableToPointsFrame(
+    table: Any,
     lat_field: str,
     long_field: str,
     sr_wkid: int | str,
     processing_target: str,
     out_name: str,
-    open_source_output: Optional[str] = None
-) -> Tuple[str, List[List[str]]]:
+    open_source_output: Optional[str] = None,
+    out_sr_wkid: Optional[int | str] = None,
+    schema: Optional[Dict[str, str]] = None,
+    rejects_path: Optional[str] = None,
+) -> Tuple[str, Any]:
     """
-    Create a point dataset from tabular rows.
+    Create a point dataset from a pandas DataFrame (or pyarrow Table) without
+    any Python-level row loops.
 
     ArcPy mode:
-      - Writes a feature class into `processing_target` (a FileGDB path).
+      - Builds a NumPy structured array and writes it with arcpy.da.NumPyArrayToFeatureClass
+        into `processing_target` (a FileGDB path). Text columns are sized to their longest value.
 
     Open-source mode:
-      - Writes a GeoPackage (or Shapefile) to `open_source_output` (path to .gpkg).
-      - Returns that path.
-    """
-    # Normalize headers (no leading digit)
-    header = [("_" + h) if h and h[0].isdigit() else h for h in input_header]
-    header_size = len(header)
+      - Writes a GeoPackage (or Shapefile) to `open_source_output` via points_from_xy.
 
-    # Pad short rows, track max field lengths (for ArcPy TEXT sizes)
-    max_lens: Dict[str, int] = {}
-    for row in data:
-        while len(row) < header_size:
-            row.append("")
-        for i, v in enumerate(row[:header_size]):
-            ml = max_lens.get(header[i], 0)
-            max_lens[header[i]] = max(ml, len(v) + 1)
+    With `out_sr_wkid` the coordinates are reprojected in memory (pyproj) so the
+    output is written once, already in the target spatial reference.
+    `schema` declares compact column types (see applySchema), e.g.
+    {"STATUS": "category", "ZIP": "int", "CLOSED_DATE": "date"}.
 
-    lat_idx = header.index(lat_field)
-    lon_idx = header.index(long_field)
+    Rows are rejected when coordinates are missing, not numeric, at (0, 0), or (for
+    geographic inputs) outside California; each carries a REJECT_REASON code. With
+    `rejects_path` they are also written to a Parquet sidecar (see RejectedRowsWriter).
 
-    missed: List[List[str]] = []
+    Returns (output path, DataFrame of the rejected rows).
+    """
+    df = applySchema(_as_frame(table), schema)
+    good, missed, lon, lat = _split_valid_points(df, lat_field, long_field, sr_wkid)
+    if rejects_path:
+        with RejectedRowsWriter(rejects_path) as rejects:
+            rejects.write(missed)
+    reproject = out_sr_wkid is not None and int(out_sr_wkid) != int(sr_wkid)
 
     if ARCPY_AVAILABLE:
+        x, y, write_wkid = lon.to_numpy(dtype="float64"), lat.to_numpy(dtype="float64"), int(sr_wkid)
+        if reproject:
+            try:
+                from pyproj import Transformer
+                x, y = Transformer.from_crs(int(sr_wkid), int(out_sr_wkid), always_xy=True).transform(x, y)
+                write_wkid = int(out_sr_wkid)
+            except ImportError:
+                pass  # no pyproj in this ArcGIS install; Project after writing instead
+        records = _points_to_records(good, x, y, _text_field_lengths(df, _text_columns(df)))
+
         temp_fc = os.path.join(processing_target, out_name)
-        sr = arcpy.SpatialReference(int(sr_wkid))  # type: ignore
-        arcpy.CreateFeatureclass_management(processing_target, out_name, "POINT", spatial_reference=sr)  # type: ignore
-        for fld, flen in max_lens.items():
-            arcpy.AddField_management(temp_fc, fld, "TEXT", field_length=min(flen, 255))  # type: ignore
-
-        with arcpy.da.InsertCursor(temp_fc, header + ['SHAPE@X', 'SHAPE@Y']) as cur:  # type: ignore
-            for row in data:
-                try:
-                    if row[lat_idx] != "" and row[lon_idx] != "":
-                        lat = float(row[lat_idx]); lon = float(row[lon_idx])
-                        cur.insertRow(row[:header_size] + [lon, lat])
-                except Exception:
-                    missed.append(row)
+        if arcpy.Exists(temp_fc):  # type: ignore
+            arcpy.Delete_management(temp_fc)  # type: ignore
+        sr = arcpy.SpatialReference(write_wkid)  # type: ignore
+        if reproject and write_wkid != int(out_sr_wkid):
+            staged_fc = rf"in_memory\{out_name}_xy"
+            arcpy.da.NumPyArrayToFeatureClass(records, staged_fc, ("POINT_X_", "POINT_Y_"), sr)  # type: ignore
+            arcpy.Project_management(staged_fc, temp_fc, arcpy.SpatialReference(int(out_sr_wkid)))  # type: ignore
+            arcpy.Delete_management(staged_fc)  # type: ignore
+        else:
+            arcpy.da.NumPyArrayToFeatureClass(records, temp_fc, ("POINT_X_", "POINT_Y_"), sr)  # type: ignore
         return temp_fc, missed
 
     # Open-source path
@@ -365,35 +773,268 @@ def tableToPoints(
         raise RuntimeError("open_source_output (.gpkg) path is required when ArcPy is not available.")
 
     gp, sh, pj, io_driver = _lazy_import_gis()
+    gdf = gp.GeoDataFrame(good, geometry=gp.points_from_xy(lon, lat), crs=f"EPSG:{int(sr_wkid)}")
+    if reproject:
+        gdf = gdf.to_crs(epsg=int(out_sr_wkid))
+    return _write_points(gdf, open_source_output, out_name), missed
+
+
+class _NulFilteredReader(io.RawIOBase):
+    """Binary stream that drops NUL bytes as it reads (some exports are NUL-padded)."""
+
+    def __init__(self, raw: Any, block_size: int = 1024 * 1024):
+        self._raw = raw
+        self._block_size = block_size
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            block = self._raw.read(self._block_size)
+            if not block:
+                return 0
+            self._pending = block.replace(b"\x00", b"")
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self) -> None:
+        self._raw.close()
+        super().close()
+
+
+def readDelimitedTable(
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    sep: str = "\t",
+    encoding: str = "cp1252",
+    chunksize: Optional[int] = None,
+    quoted: bool = False,
+    strip_nul: bool = False,
+    numeric: Optional[Sequence[str]] = None,
+    schema: Optional[Dict[str, str]] = None,
+) -> Any:
+    """
+    Columnar read of a delimited text export with the pandas C parser.
+
+    Only `columns` (matched after header normalization) are materialized. Values
+    are read as text with empty cells kept as ""; `numeric` columns are then
+    coerced to float (unparseable values become NaN). With `quoted=False` quotes
+    are left alone, the same as splitting on the delimiter; `quoted=True` parses
+    standard CSV quoting (embedded delimiters and doubled quotes). `strip_nul`
+    drops NUL bytes while the file is decoded. Header names are stripped and
+    spaces replaced by underscores; unnamed empty trailing columns and extra
+    trailing fields are ignored. `schema` is applied to each chunk as it is read
+    (see applySchema).
+    Returns a DataFrame, or an iterator of DataFrames when `chunksize` is set.
+    """
     import pandas as pd
 
-    df = pd.DataFrame([r[:header_size] for r in data], columns=header)
-    def _to_float(x):
+    def clean(names: Iterable[Any]) -> List[str]:
+        return [normalizeFieldName(c) for c in names]
+
+    def finish(df: Any) -> Any:
+        df = df.set_axis(clean(df.columns), axis=1)
+        df = df.loc[:, [c for c in df.columns if not c.startswith("Unnamed__")]]
+        for c in numeric or []:
+            if c in df.columns:
+                df[c] = pd.to_numeric(df[c].str.strip(), errors="coerce").astype("float64")
+        return applySchema(df, schema)
+
+    wanted = set(columns) if columns else None
+    usecols = None if wanted is None else (lambda c: clean([c])[0] in wanted)
+    source: Any = io.BufferedReader(_NulFilteredReader(open(path, "rb"))) if strip_nul else path
+    try:
+        reader = pd.read_csv(source, sep=sep, encoding=encoding, encoding_errors="replace", usecols=usecols,
+                             dtype=str, keep_default_na=False, engine="c", chunksize=chunksize,
+                             quoting=csv.QUOTE_MINIMAL if quoted else csv.QUOTE_NONE)
+    except Exception:
+        if strip_nul:
+            source.close()
+        raise
+    if chunksize is None:
+        if strip_nul:
+            source.close()
+        return finish(reader)
+
+    def chunks() -> Iterable[Any]:
         try:
-            return float(x)
-        except Exception:
-            return None
-    df["_lat"] = df[lat_field].map(_to_float)
-    df["_lon"] = df[long_field].map(_to_float)
+            for chunk in reader:
+                yield finish(chunk)
+        finally:
+            if strip_nul:
+                source.close()
+    return chunks()
 
-    bad = df[df["_lat"].isna() | df["_lon"].isna()]
-    if not bad.empty:
-        missed = bad[header].values.tolist()
-    good = df.dropna(subset=["_lat", "_lon"])
-    gdf = gp.GeoDataFrame(good, geometry=gp.points_from_xy(good["_lon"], good["_lat"]), crs=f"EPSG:{int(sr_wkid)}")
 
-    # Write or append layer
-    if open_source_output.lower().endswith(".gpkg"):
-        mode = "w"
+def _lazy_import_openpyxl():
+    import importlib
+    return importlib.import_module("openpyxl")
+
+
+def readExcelSheet(
+    path: str,
+    sheet_name: str,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Dict[str, Iterable[Any]]] = None,
+    schema: Optional[Dict[str, str]] = None,
+) -> Any:
+    """
+    Streams one worksheet (openpyxl read-only mode) into a DataFrame of text columns.
+
+    Rows are kept only when every `filters` column (stripped) is one of its allowed
+    values, and only `columns` are materialized, so memory scales with the subset
+    rather than the workbook. Header names are stripped and spaces replaced by
+    underscores; missing cells become "". `schema` casts the result (see applySchema).
+    """
+    import pandas as pd
+    openpyxl = _lazy_import_openpyxl()
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb[sheet_name].iter_rows(values_only=True)
+        header = [normalizeFieldName(h if h is not None else "") for h in next(rows)]
+        keep = [i for i, h in enumerate(header) if not columns or h in columns or h in (filters or {})]
+        checks = [(header.index(f), {str(v) for v in allowed}) for f, allowed in (filters or {}).items()]
+
+        data = []
+        for row in rows:
+            if any(str(row[i] if i < len(row) and row[i] is not None else "").strip() not in allowed for i, allowed in checks):
+                continue
+            data.append(["" if i >= len(row) or row[i] is None else str(row[i]) for i in keep])
+    finally:
+        wb.close()
+    return applySchema(pd.DataFrame(data, columns=[header[i] for i in keep], dtype=str), schema)
+
+
+def dmsToDecimal(degrees: Any, minutes: Any, seconds: Any, negative: bool = False) -> Any:
+    """
+    Vectorized degrees/minutes/seconds -> decimal degrees. Inputs are array-likes
+    of numbers or numeric strings; rows where any part is not numeric are NaN.
+    `negative` marks the hemisphere (S/W) and applies to the whole value.
+    """
+    import numpy as np
+    import pandas as pd
+    d, m, sec = (pd.to_numeric(pd.Series(np.asarray(v)).astype(str).str.strip(), errors="coerce").to_numpy(dtype="float64")
+                 for v in (degrees, minutes, seconds))
+    decimal = np.abs(d) + (m + sec / 60.0) / 60.0
+    return -decimal if negative else decimal
+
+
+def textFieldLengths(chunks: Iterable[Any]) -> Dict[str, int]:
+    """
+    Longest value + 1 per text column over all `chunks` (DataFrames), for the
+    `field_lengths` of tableToPointsStream when the chunks are read a second time.
+    """
+    lengths: Dict[str, int] = {}
+    for df in chunks:
+        for c, n in _text_field_lengths(df, _text_columns(df)).items():
+            lengths[c] = max(lengths.get(c, 0), n)
+    return lengths
+
+
+def tableToPointsStream(
+    chunks: Iterable[Any],
+    lat_field: str,
+    long_field: str,
+    sr_wkid: int | str,
+    processing_target: str,
+    out_name: str,
+    open_source_output: Optional[str] = None,
+    header: Optional[Sequence[str]] = None,
+    rejects_path: Optional[str] = None,
+    field_lengths: Optional[Dict[str, int]] = None,
+    schema: Optional[Dict[str, str]] = None,
+) -> Tuple[str, Dict[str, int], Optional[str]]:
+    """
+    Streaming tableToPoints: converts each chunk (DataFrame, pyarrow batch, or list of
+    rows with `header`) to points and appends it to the output layer, so peak memory
+    depends on the chunk size rather than the table size.
+
+    Text widths can't be measured up front, so ArcPy TEXT fields default to 255 unless
+    given in `field_lengths` (see textFieldLengths). Rejected rows (see tableToPointsFrame) are appended to a
+    Parquet sidecar (`rejects_path`, default "<out_name>_rejected.parquet" next to the
+    output). `schema` is applied to every chunk (see applySchema).
+
+    Returns (output path, rejected-row count per reason, sidecar path or None).
+    """
+    out_path: Optional[str] = None
+    rejects = RejectedRowsWriter(rejects_path or _default_rejects_path(processing_target, open_source_output, out_name))
+
+    if not ARCPY_AVAILABLE:
+        if not open_source_output:
+            raise RuntimeError("open_source_output (.gpkg) path is required when ArcPy is not available.")
+        gp, sh, pj, io_driver = _lazy_import_gis()
         if os.path.exists(open_source_output):
             os.remove(open_source_output)
-        gdf.to_file(open_source_output, layer=out_name, driver="GPKG")
-        return open_source_output, missed
-    else:
-        # default to shapefile folder
-        shp_path = open_source_output if open_source_output.lower().endswith(".shp") else f"{open_source_output}.shp"
-        gdf.to_file(shp_path)
-        return shp_path, missed
+
+    try:
+        for i, chunk in enumerate(chunks):
+            df = applySchema(_as_frame(chunk, header), schema)
+            good, missed, lon, lat = _split_valid_points(df, lat_field, long_field, sr_wkid)
+            rejects.write(missed)
+            if not len(good):
+                continue
+
+            if ARCPY_AVAILABLE:
+                lengths = {c: (field_lengths or {}).get(c, 255) for c in _text_columns(good)}
+                records = _points_to_records(good, lon, lat, lengths)
+                sr = arcpy.SpatialReference(int(sr_wkid))  # type: ignore
+                if out_path is None:
+                    out_path = os.path.join(processing_target, out_name)
+                    if arcpy.Exists(out_path):  # type: ignore
+                        arcpy.Delete_management(out_path)  # type: ignore
+                    arcpy.da.NumPyArrayToFeatureClass(records, out_path, ("POINT_X_", "POINT_Y_"), sr)  # type: ignore
+                else:
+                    chunk_fc = rf"in_memory\points_chunk_{i}"
+                    arcpy.da.NumPyArrayToFeatureClass(records, chunk_fc, ("POINT_X_", "POINT_Y_"), sr)  # type: ignore
+                    arcpy.Append_management(chunk_fc, out_path, "NO_TEST")  # type: ignore
+                    arcpy.Delete_management(chunk_fc)  # type: ignore
+            else:
+                gdf = gp.GeoDataFrame(good, geometry=gp.points_from_xy(lon, lat), crs=f"EPSG:{int(sr_wkid)}")
+                gdf.to_file(open_source_output, layer=out_name, driver="GPKG", mode="w" if out_path is None else "a")
+                out_path = open_source_output
+    finally:
+        rejects.close()
+
+    if out_path is None:
+        raise RuntimeError(f"No rows with valid coordinates were found for {out_name}.")
+    return out_path, rejects.counts, (rejects.path if rejects.counts else None)
+
+
+def tableToPoints(
+    input_header: List[str],
+    data: List[List[str]],
+    lat_field: str,
+    long_field: str,
+    sr_wkid: int | str,
+    processing_target: str,
+    out_name: str,
+    open_source_output: Optional[str] = None,
+    schema: Optional[Dict[str, str]] = None,
+) -> Tuple[str, List[List[str]]]:
+    """
+    Create a point dataset from tabular rows (list of string lists; short rows are padded).
+
+    ArcPy mode:
+      - Writes a feature class into `processing_target` (a FileGDB path).
+
+    Open-source mode:
+      - Writes a GeoPackage (or Shapefile) to `open_source_output` (path to .gpkg).
+      - Returns that path.
+
+    Row-list front end for tableToPointsFrame(); prefer passing a DataFrame there directly.
+    """
+    import pandas as pd
+
+    header = _normalize_header(input_header)
+    header_size = len(header)
+    df = pd.DataFrame([r[:header_size] for r in data], columns=header).fillna("")
+    out_path, missed = tableToPointsFrame(df, lat_field, long_field, sr_wkid, processing_target, out_name, open_source_output,
+                                          schema=schema)
+    return out_path, missed.drop(columns=REJECT_REASON_FIELD).values.tolist()
 
 
 # ------------------------------------------------------------------------------
@@ -406,88 +1047,225 @@ def checkMissingFields(expected_fields: Sequence[str], available_fields: Sequenc
     return True, ""
 
 
+# ------------------------------------------------------------------------------
+# California reference layers (jurisdictions / boundary), loaded once per run
+# ------------------------------------------------------------------------------
+_reference_data: Dict[str, ReferenceData] = {}
+_default_reference_path: Optional[str] = None
+
+
+def configureReferenceData(jurisdictions_path: str, boundary_path: Optional[str] = None) -> ReferenceData:
+    """Set the run's CA reference layers (used by getReferenceData() without a path)."""
+    global _default_reference_path
+    _reference_data[jurisdictions_path] = ReferenceData(jurisdictions_path, boundary_path)
+    _default_reference_path = jurisdictions_path
+    return _reference_data[jurisdictions_path]
+
+
+def getReferenceData(jurisdictions_path: Optional[str] = None) -> ReferenceData:
+    """Cached reference layers for `jurisdictions_path` (default: the configured ones)."""
+    path = jurisdictions_path or _default_reference_path
+    if path is None:
+        raise RuntimeError("No CA reference data configured (configureReferenceData)")
+    if path not in _reference_data:
+        _reference_data[path] = ReferenceData(path)
+    return _reference_data[path]
+
+
 # ------------------------------------------------------------------------------
 # Geocoding (HERE v7 by default, with Nominatim fallback)
 # ------------------------------------------------------------------------------
+_geocode_cache: Optional[GeocodeCache] = None
+
+
+def configureGeocodeCache(path: str, ttl_days: float = 180, negative_ttl_days: float = 30) -> GeocodeCache:
+    """Set the persistent cache checked by forwardGeocode() for this run."""
+    global _geocode_cache
+    if _geocode_cache is not None:
+        _geocode_cache.close()
+    _geocode_cache = GeocodeCache(path, ttl_days, negative_ttl_days)
+    return _geocode_cache
+
+
+def getGeocodeCache() -> GeocodeCache:
+    """Configured cache, else $HAZARD_GEOCODE_CACHE, else ~/.hazard_tools/geocode_cache.sqlite."""
+    global _geocode_cache
+    if _geocode_cache is None:
+        path = os.getenv("HAZARD_GEOCODE_CACHE") or os.path.join(os.path.expanduser("~"), ".hazard_tools", "geocode_cache.sqlite")
+        _geocode_cache = GeocodeCache(path)
+    return _geocode_cache
+
+
+_geocoder: Optional[GeocoderClient] = None
+
+
+def configureGeocoder(here_api_key: Optional[str] = None, provider: str = "here", offline_index: Optional[str] = None,
+                      offline_min_confidence: str = "zip", online: bool = True) -> GeocoderClient:
+    """
+    Create the run's geocoder (provider chain decided here, once). With `offline_index`
+    (see OfflineGeocoder.build) addresses resolved locally at `offline_min_confidence`
+    or better never reach the network; `online=False` geocodes entirely offline.
+    """
+    global _geocoder
+    offline = OfflineGeocoder(offline_index) if offline_index else None
+    _geocoder = GeocoderClient(getFetchEngine(), getGeocodeCache(), here_api_key, provider,
+                               offline, offline_min_confidence, online)
+    return _geocoder
+
+
+def getGeocoder() -> GeocoderClient:
+    """The run's geocoder; created on first use (HERE if $HERE_API_KEY is set, else Nominatim)."""
+    if _geocoder is None:
+        return configureGeocoder()
+    if _geocoder.engine is not getFetchEngine():
+        _geocoder.engine = getFetchEngine()
+    return _geocoder
+
+
 def forwardGeocode(full_address: str, here_api_key: Optional[str] = None, provider: str = "here") -> Tuple[Optional[float], Optional[float]]:
     """
     Geocode an address.
     provider="here" (v7; recommended) or "nominatim" (open)
+
+    Uses the run's GeocoderClient (pooled connections, persistent cache); passing a
+    different key/provider builds a one-off client. For many addresses use geocodeBatch().
     """
-    provider = provider.lower()
-    if provider == "here":
-        api_key = here_api_key or os.getenv("HERE_API_KEY")
-        if not api_key:
-            # fallback to nominatim
-            provider = "nominatim"
-        else:
-            # HERE v7 endpoint
-            url = "https://geocode.search.hereapi.com/v1/geocode"
-            params = {"q": full_address, "apiKey": api_key}
-            try:
-                r = requests.get(url, params=params, timeout=30)
-                r.raise_for_status()
-                js = r.json()
-                items = js.get("items") or []
-                if not items:
-                    return None, None
-                pos = items[0]["position"]
-                return pos.get("lat"), pos.get("lng")
-            except Exception as e:
-                logger.warning(f"HERE geocoding failed ({e}), falling back to Nominatim.")
-                provider = "nominatim"
-
-    # Nominatim fallback (respect usage policy; set a UA)
-    try:
-        from geopy.geocoders import Nominatim  # type: ignore
-    except Exception:
-        _lazy_import_geopy()
-        from geopy.geocoders import Nominatim  # type: ignore
+    geocoder = getGeocoder()
+    if here_api_key or provider.lower() != "here":
+        geocoder = GeocoderClient(geocoder.engine, geocoder.cache, here_api_key, provider, geocoder.offline,
+                                  geocoder.offline_min_confidence, bool(geocoder.chain))
+    return geocoder.geocode(full_address)
 
-    geolocator = Nominatim(user_agent="hazard-tools/1.0")
-    try:
-        loc = geolocator.geocode(full_address, timeout=30)
-        if not loc:
-            return None, None
-        return loc.latitude, loc.longitude
-    except Exception:
-        logger.info(f"Unable to geocode [{full_address}]")
-        return None, None
+
+def geocodeBatch(addresses: Iterable[Optional[str]], here_api_key: Optional[str] = None, provider: str = "here",
+                 label: str = "Geocoding") -> Tuple[Any, Any]:
+    """Geocode many addresses concurrently; see GeocoderClient.geocodeMany."""
+    geocoder = getGeocoder()
+    if here_api_key or provider.lower() != "here":
+        geocoder = GeocoderClient(geocoder.engine, geocoder.cache, here_api_key, provider, geocoder.offline,
+                                  geocoder.offline_min_confidence, bool(geocoder.chain))
+    return geocoder.geocodeMany(addresses, label)
 
 
 # ------------------------------------------------------------------------------
-# Selenium download waiter (unchanged logic, cleaned a bit)
+# Browser download watcher (event-driven, with polling fallback)
 # ------------------------------------------------------------------------------
-def clickToDownloadFile(download_button: WebElement, output_download_folder: str) -> None:
-    """Click a download button and block until the file is present and stable in size."""
-    download_button.click()
-    time.sleep(1.5)
-
-    # Wait for any file to appear
-    for _ in range(600):  # up to ~60s
-        if os.listdir(output_download_folder):
-            break
-        time.sleep(0.1)
-
-    # Wait for temp files to disappear
-    temp_ext = (".crdownload", ".tmp", ".part")
-    while True:
-        names = os.listdir(output_download_folder)
-        if names and not any(n.endswith(temp_ext) for n in names):
-            break
-        time.sleep(0.2)
-
-    # Wait for size to stabilize
-    file_path = os.path.join(output_download_folder, os.listdir(output_download_folder)[0])
-    prev = -1
-    while True:
-        size = os.path.getsize(file_path)
-        if size == prev:
-            break
-        prev = size
-        print(".", end="", flush=True)
-        time.sleep(0.5)
-    print("")
+_DOWNLOAD_TEMP_EXT = (".crdownload", ".tmp", ".part", ".download")
+
+
+def _lazy_import_watchdog():
+    import importlib
+    observers = importlib.import_module("watchdog.observers")
+    events = importlib.import_module("watchdog.events")
+    return observers, events
+
+
+class DownloadWatcher:
+    """
+    Watches a browser download folder and attributes each finished file to the
+    action (click / page load) that triggered it.
+
+    Uses `watchdog` (inotify on Linux, native watchers on Windows/macOS) to wake
+    as soon as the browser renames its temp file; falls back to polling the
+    folder when watchdog is not installed.
+
+    Files already in the folder when the watcher is created, and files handed
+    out by earlier calls, are never returned again.
+    """
+
+    def __init__(self, folder: str, poll_interval: float = 0.25):
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.poll_interval = poll_interval
+        self._claimed = set(os.listdir(folder))
+        self._wake = threading.Event()
+        self._observer = None
+        try:
+            observers, events = _lazy_import_watchdog()
+            wake = self._wake
+
+            class _Handler(events.FileSystemEventHandler):  # type: ignore
+                def on_any_event(self, event):
+                    wake.set()
+
+            self._observer = observers.Observer()
+            self._observer.schedule(_Handler(), folder, recursive=False)
+            self._observer.start()
+        except Exception:
+            self._observer = None  # polling fallback
+
+    def __enter__(self) -> "DownloadWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+
+    def _finished_files(self, exclude: set) -> List[str]:
+        names = os.listdir(self.folder)
+        pending = {n.rsplit(".", 1)[0] for n in names if n.endswith(_DOWNLOAD_TEMP_EXT)}
+        finished = [
+            n for n in names
+            if n not in exclude and not n.endswith(_DOWNLOAD_TEMP_EXT) and n not in pending
+            and os.path.isfile(os.path.join(self.folder, n))
+        ]
+        # Oldest first so simultaneous downloads are attributed in click order
+        return sorted(finished, key=lambda n: os.path.getmtime(os.path.join(self.folder, n)))
+
+    def expect(self, trigger: Callable[[], Any], timeout: float = 600) -> str:
+        """Run `trigger` and block until the download it started is finished. Returns the file path."""
+        exclude = self._claimed | set(os.listdir(self.folder))
+        self._wake.clear()
+        trigger()
+
+        deadline = time.monotonic() + timeout
+        # even with an observer, re-scan periodically in case an event is missed
+        max_wait = 2.0 if self._observer is not None else self.poll_interval
+        while True:
+            finished = self._finished_files(exclude)
+            if finished:
+                name = finished[0]
+                self._claimed.add(name)
+                path = os.path.join(self.folder, name)
+                logger.info(f"Downloaded {name} ({os.path.getsize(path):,} bytes)")
+                return path
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No finished download appeared in {self.folder} within {timeout:g}s")
+            self._wake.wait(min(max_wait, remaining))
+            self._wake.clear()
+
+
+def waitForDownload(
+    output_download_folder: str,
+    trigger: Callable[[], Any],
+    timeout: float = 600,
+    watcher: Optional[DownloadWatcher] = None,
+) -> str:
+    """
+    Run `trigger` (e.g. `lambda: driver.get(url)`) and return the path of the file it downloaded.
+    Raises TimeoutError if no finished file shows up within `timeout` seconds.
+    Pass a shared `watcher` when triggering several downloads into the same folder.
+    """
+    if watcher is not None:
+        return watcher.expect(trigger, timeout)
+    with DownloadWatcher(output_download_folder) as w:
+        return w.expect(trigger, timeout)
+
+
+def clickToDownloadFile(
+    download_button: WebElement,
+    output_download_folder: str,
+    timeout: float = 600,
+    watcher: Optional[DownloadWatcher] = None,
+) -> str:
+    """Click a download button and block until the file it started is finished. Returns the file path."""
+    return waitForDownload(output_download_folder, download_button.click, timeout, watcher)
 
 
 # ------------------------------------------------------------------------------
@@ -0,0 +1,418 @@
+"""
+Geocoding support shared by the hazard modules.
+
+GeocoderClient is created once per run: it holds the provider configuration,
+decides the fallback chain (HERE -> Nominatim) up front, and sends every request
+through the run's FetchEngine, which keeps pooled connections and per-provider
+rate limits.
+
+GeocodeCache keeps provider results in a local SQLite file so addresses seen in
+earlier runs (e.g. every DEA clandestine lab since 2000) are not sent to the
+rate-limited services again:
+
+    geocode_cache(address, provider, lat, lon, quality, fetched_at)
+
+Misses ("no match") are cached too, with their own, shorter TTL.
+
+OfflineGeocoder resolves addresses without the network from a local reference
+index (address points and ZIP / city centroids in SQLite, city names full-text
+indexed), at address, ZIP or city precision.
+"""
+from __future__ import annotations
+import os
+import re
+import sqlite3
+import logging
+import datetime
+import threading
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from NaturalHazardUpdaterTool_Network import FetchEngine
+
+logger = logging.getLogger("hazard_tools")
+
+CachedResult = Tuple[Optional[float], Optional[float], Optional[float]]  # lat, lon, quality
+GeocodeResult = CachedResult
+
+
+# USPS street suffix / unit / directional abbreviations
+ADDRESS_ABBREVIATIONS = {
+    "ALLEY": "ALY", "AVENUE": "AVE", "BOULEVARD": "BLVD", "CIRCLE": "CIR", "COURT": "CT",
+    "DRIVE": "DR", "EXPRESSWAY": "EXPY", "FREEWAY": "FWY", "HIGHWAY": "HWY", "LANE": "LN",
+    "PARKWAY": "PKWY", "PLACE": "PL", "ROAD": "RD", "ROUTE": "RTE", "SQUARE": "SQ",
+    "STREET": "ST", "TERRACE": "TER", "TRAIL": "TRL", "APARTMENT": "APT", "BUILDING": "BLDG",
+    "SUITE": "STE", "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+    "CALIFORNIA": "CA",
+}
+_ABBREVIATION_RE = r"\b(" + "|".join(sorted(ADDRESS_ABBREVIATIONS, key=len, reverse=True)) + r")\b"
+
+
+def normalizeAddresses(addresses: Any) -> Any:
+    """
+    Vectorized address normalization (pandas string ops over the whole column):
+    uppercase, ZIP+4 cut to ZIP5, punctuation (commas included) folded to
+    whitespace, whitespace collapsed, USPS suffix / directional abbreviations.
+    "1 Main Street, Fresno" and "1 MAIN ST FRESNO" share a key. Returns a string
+    Series aligned with `addresses` ("" for missing values).
+    """
+    import pandas as pd
+    s = addresses if isinstance(addresses, pd.Series) else pd.Series(list(addresses), dtype="object")
+    s = s.astype("string").fillna("").str.upper()
+    s = s.str.replace(r"[.']", "", regex=True).str.replace(r"\b(\d{5})-\d{4}\b", r"\1", regex=True)
+    # explicit ASCII punctuation ranges: \W is ASCII-only under the arrow string dtype and would split "PIÑON"
+    s = s.str.replace(r"[!-/:-@\[-`{-~]+", " ", regex=True)
+    s = s.str.replace(_ABBREVIATION_RE, lambda m: ADDRESS_ABBREVIATIONS[m.group(1)], regex=True)
+    return s.str.split().str.join(" ").astype(str)
+
+
+def normalizeAddress(address: Optional[str]) -> str:
+    return normalizeAddresses([address]).iloc[0]
+
+
+def composeAddresses(frame: Any, fields: Iterable[str], suffix: Optional[str] = None) -> Any:
+    """
+    Joins address component columns of `frame` (a DataFrame or a dict of
+    equal-length lists) with ", " (blank components drop out),
+    optionally appends `suffix` (e.g. "CA"), and normalizes. Rows with no
+    components at all become "" and are not geocoded.
+    """
+    import pandas as pd
+    columns = [frame[f] if isinstance(frame[f], pd.Series) else pd.Series(list(frame[f]), dtype="object") for f in fields]
+    parts = [c.astype("string").fillna("").str.strip() for c in columns]
+    blank = pd.concat([p == "" for p in parts], axis=1).all(axis=1)
+    if suffix:
+        parts.append(pd.Series(suffix, index=parts[0].index, dtype="string"))
+    joined = parts[0].str.cat(parts[1:], sep=", ") if len(parts) > 1 else parts[0]
+    return normalizeAddresses(joined.mask(blank, ""))
+
+
+def cacheKey(address: str) -> str:
+    """Cache key for an address: its normalized form (see normalizeAddresses)."""
+    return normalizeAddress(address)
+
+
+class GeocodeCache:
+    """
+    Persistent geocode results keyed by (address, provider).
+
+    cache = GeocodeCache(r"C:\\workspace\\__HazardUpdates\\_RawDataStore\\geocode_cache.sqlite")
+    hit = cache.get("1 MAIN ST SACRAMENTO CA", "here")   # None on a miss / expired entry
+    cache.put("1 MAIN ST SACRAMENTO CA", "here", 38.58, -121.49, 0.97)
+    """
+
+    def __init__(self, path: str, ttl_days: float = 180, negative_ttl_days: float = 30):
+        self.path = path
+        self.ttl_days = ttl_days
+        self.negative_ttl_days = negative_ttl_days
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode_cache ("
+            " address TEXT NOT NULL,"
+            " provider TEXT NOT NULL,"
+            " lat REAL,"
+            " lon REAL,"
+            " quality REAL,"
+            " fetched_at TEXT NOT NULL,"
+            " PRIMARY KEY (address, provider))"
+        )
+
+    def _expired(self, fetched_at: str, negative: bool) -> bool:
+        ttl = self.negative_ttl_days if negative else self.ttl_days
+        if ttl is None:
+            return False
+        age = datetime.datetime.now() - datetime.datetime.fromisoformat(fetched_at)
+        return age > datetime.timedelta(days=ttl)
+
+    def get(self, address: str, provider: str) -> Optional[CachedResult]:
+        """(lat, lon, quality) for a fresh entry (lat/lon None for a cached miss), else None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT lat, lon, quality, fetched_at FROM geocode_cache WHERE address = ? AND provider = ?",
+                (cacheKey(address), provider)).fetchone()
+        if row is None:
+            return None
+        lat, lon, quality, fetched_at = row
+        if self._expired(fetched_at, lat is None):
+            return None
+        return lat, lon, quality
+
+    def put(self, address: str, provider: str, lat: Optional[float], lon: Optional[float],
+            quality: Optional[float] = None) -> None:
+        """Store a result; pass lat/lon None to record that the provider found no match."""
+        if lat is None or lon is None:
+            lat = lon = None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode_cache (address, provider, lat, lon, quality, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (cacheKey(address), provider, lat, lon, quality,
+                 datetime.datetime.now().isoformat(timespec="seconds")))
+
+    def prune(self) -> int:
+        """Delete expired entries. Returns the number removed."""
+        now = datetime.datetime.now()
+        removed = 0
+        with self._lock:
+            for negative, ttl in ((False, self.ttl_days), (True, self.negative_ttl_days)):
+                if ttl is None:
+                    continue
+                cutoff = (now - datetime.timedelta(days=ttl)).isoformat(timespec="seconds")
+                null_test = "lat IS NULL" if negative else "lat IS NOT NULL"
+                cur = self._conn.execute(f"DELETE FROM geocode_cache WHERE {null_test} AND fetched_at < ?", (cutoff,))
+                removed += cur.rowcount
+        if removed:
+            logger.info(f"Geocode cache: pruned {removed} expired entr{'y' if removed == 1 else 'ies'}")
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Offline match precision, weakest first
+CONFIDENCE_LEVELS = ("city", "zip", "address")
+_ZIP_RE = re.compile(r"\b(9[0-6]\d{3})\b")  # California ZIPs are 90000-96199
+_STATE_ZIP_TAIL_RE = re.compile(r"( CA)?( \d{5})?( \d{4})?$")
+
+
+def _place_key(text: str) -> str:
+    return " ".join(re.sub(r"[^A-Z0-9 ]", " ", str(text or "").upper()).split())
+
+
+class OfflineGeocoder:
+    """
+    Local geocoder over a SQLite reference index.
+
+    OfflineGeocoder.build(r"C:\\workspace\\__BaseData\\ca_geocode_index.sqlite", reference_df)
+    offline = OfflineGeocoder(r"C:\\workspace\\__BaseData\\ca_geocode_index.sqlite")
+    lat, lon, confidence = offline.lookup("1 MAIN ST, SACRAMENTO, CA 95814")   # confidence: address / zip / city / None
+    """
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+
+    @staticmethod
+    def build(path: str, reference: Any) -> str:
+        """
+        (Re)build the index from a DataFrame (or CSV path) with columns
+        kind ("address", "zip" or "city"), name, lat, lon. Address names are
+        "<street> <city>" (no state / ZIP), e.g. "1 MAIN ST SACRAMENTO".
+        """
+        import pandas as pd
+        df = pd.read_csv(reference, dtype={"name": str}) if isinstance(reference, str) else reference
+        df = df[["kind", "name", "lat", "lon"]].dropna()
+        df = df.assign(kind=df["kind"].str.lower(), name=df["name"].map(_place_key))
+        if os.path.exists(path):
+            os.remove(path)
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute("CREATE TABLE places (kind TEXT NOT NULL, name TEXT NOT NULL, lat REAL, lon REAL, PRIMARY KEY (kind, name))")
+            conn.executemany("INSERT OR REPLACE INTO places (kind, name, lat, lon) VALUES (?, ?, ?, ?)",
+                             df.itertuples(index=False, name=None))
+            conn.execute("CREATE VIRTUAL TABLE city_fts USING fts5(name)")
+            conn.execute("INSERT INTO city_fts (rowid, name) SELECT rowid, name FROM places WHERE kind = 'city'")
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info(f"Offline geocoder index: {len(df)} reference places written to {path}")
+        return path
+
+    def _place(self, kind: str, name: str) -> Optional[Tuple[float, float]]:
+        row = self._conn.execute("SELECT lat, lon FROM places WHERE kind = ? AND name = ?", (kind, name)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _city(self, key: str) -> Optional[Tuple[float, float]]:
+        tokens = [t for t in key.split() if not t.isdigit()]
+        if not tokens:
+            return None
+        query = " OR ".join(f'"{t}"' for t in set(tokens))
+        candidates = self._conn.execute(
+            "SELECT p.name, p.lat, p.lon FROM city_fts JOIN places p ON p.rowid = city_fts.rowid "
+            "WHERE city_fts MATCH ? ORDER BY bm25(city_fts) LIMIT 50", (query,)).fetchall()
+        padded = f" {key} "
+        # the whole city name must appear in the address; prefer the longest ("SOUTH SAN FRANCISCO" over "SAN FRANCISCO")
+        matches = [c for c in candidates if f" {c[0]} " in padded]
+        if not matches:
+            return None
+        name, lat, lon = max(matches, key=lambda c: len(c[0]))
+        return lat, lon
+
+    def lookup(self, address: str) -> Tuple[Optional[float], Optional[float], Optional[str]]:
+        """(lat, lon, confidence) at the best precision the index supports; (None, None, None) when unresolved."""
+        key = _place_key(address)
+        if not key:
+            return None, None, None
+        with self._lock:
+            hit = self._place("address", _STATE_ZIP_TAIL_RE.sub("", key))
+            if hit:
+                return hit[0], hit[1], "address"
+            zip_match = _ZIP_RE.search(key)
+            if zip_match:
+                hit = self._place("zip", zip_match.group(1))
+                if hit:
+                    return hit[0], hit[1], "zip"
+            hit = self._city(key)
+            if hit:
+                return hit[0], hit[1], "city"
+        return None, None, None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _lazy_import_tqdm():
+    import importlib
+    return importlib.import_module("tqdm").tqdm
+
+
+class GeocoderClient:
+    """
+    Run-wide geocoder.
+
+    geocoder = GeocoderClient(getFetchEngine(), getGeocodeCache(), here_api_key)
+    lat, lon = geocoder.geocode("1 Main St, Sacramento, CA")
+    lats, lons = geocoder.geocodeMany(addresses)
+    """
+
+    HERE_URL = "https://geocode.search.hereapi.com/v1/geocode"
+    NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+
+    def __init__(self, engine: FetchEngine, cache: Optional[GeocodeCache] = None,
+                 here_api_key: Optional[str] = None, provider: str = "here",
+                 offline: Optional[OfflineGeocoder] = None, offline_min_confidence: str = "zip",
+                 online: bool = True):
+        self.engine = engine
+        self.cache = cache
+        self.offline = offline
+        self.offline_min_confidence = offline_min_confidence
+        self.here_api_key = here_api_key or os.getenv("HERE_API_KEY")
+        self.chain: List[Tuple[str, Callable[[str], Awaitable[GeocodeResult]]]] = []
+        if online:
+            if provider.lower() == "here" and self.here_api_key:
+                self.chain.append(("here", self._here))
+            self.chain.append(("nominatim", self._nominatim))
+        steps = [name for name, _ in self.chain]
+        if offline is not None:
+            steps = [f"offline (>= {offline_min_confidence})"] + steps + ["offline (any)"]
+        logger.info("Geocoder: " + " -> ".join(steps))
+
+    # ---------------- providers ----------------
+    async def _here(self, address: str) -> GeocodeResult:
+        js = await self.engine.getJsonAsync(self.HERE_URL, {"q": address, "apiKey": self.here_api_key})
+        items = js.get("items") or []
+        if not items:
+            return None, None, None
+        pos = items[0]["position"]
+        return pos.get("lat"), pos.get("lng"), (items[0].get("scoring") or {}).get("queryScore")
+
+    async def _nominatim(self, address: str) -> GeocodeResult:
+        # the engine paces nominatim to the 1 request/second usage policy
+        results = await self.engine.getJsonAsync(self.NOMINATIM_URL, {"q": address, "format": "jsonv2", "limit": 1})
+        if not results:
+            return None, None, None
+        return float(results[0]["lat"]), float(results[0]["lon"]), results[0].get("importance")
+
+    # ---------------- geocoding ----------------
+    async def resolveAsync(self, address: str) -> Tuple[Optional[float], Optional[float], Optional[str]]:
+        """
+        (lat, lon, source) where source is the provider name or "offline_<confidence>".
+
+        A confident offline match (>= offline_min_confidence) is used directly;
+        otherwise the online chain is tried, cache first. A provider's "no match"
+        is final (and cached); a transport error falls through to the next
+        provider. A low-confidence offline match is the last resort.
+        """
+        offline_hit: Tuple[Optional[float], Optional[float], Optional[str]] = (None, None, None)
+        if self.offline is not None:
+            offline_hit = self.offline.lookup(address)
+            confidence = offline_hit[2]
+            if confidence and CONFIDENCE_LEVELS.index(confidence) >= CONFIDENCE_LEVELS.index(self.offline_min_confidence):
+                return offline_hit[0], offline_hit[1], f"offline_{confidence}"
+
+        for i, (name, provider) in enumerate(self.chain):
+            if self.cache is not None:
+                cached = self.cache.get(address, name)
+                if cached is not None and cached[0] is not None:
+                    return cached[0], cached[1], name
+                if cached is not None:
+                    break
+            try:
+                lat, lon, quality = await provider(address)
+            except Exception as e:
+                if i + 1 < len(self.chain):
+                    logger.warning(f"{name} geocoding failed ({e}), falling back to {self.chain[i + 1][0]}.")
+                continue
+            if self.cache is not None:
+                self.cache.put(address, name, lat, lon, quality)
+            if lat is not None:
+                return lat, lon, name
+            break
+
+        if offline_hit[2]:
+            return offline_hit[0], offline_hit[1], f"offline_{offline_hit[2]}"
+        logger.info(f"Unable to geocode [{address}]")
+        return None, None, None
+
+    async def geocodeAsync(self, address: str) -> Tuple[Optional[float], Optional[float]]:
+        lat, lon, _ = await self.resolveAsync(address)
+        return lat, lon
+
+    def geocode(self, address: str) -> Tuple[Optional[float], Optional[float]]:
+        return self.engine.run(self.geocodeAsync(address))
+
+    def geocodeMany(self, addresses: Iterable[Optional[str]], label: str = "Geocoding",
+                    return_source: bool = False) -> Tuple[Any, ...]:
+        """
+        Geocode many addresses. Returns (lat, lon) float arrays aligned with
+        `addresses` (NaN where no location was found), plus the source of each
+        result ("here", "nominatim", "offline_zip", ...) with `return_source`.
+
+        Addresses are normalized and deduplicated, then requested concurrently; the
+        engine holds each provider to its own rate limit (HERE is allowed far more
+        requests per second than Nominatim). Progress is shown with tqdm when
+        installed, otherwise logged every 10%.
+        """
+        import numpy as np
+        import pandas as pd
+        series = addresses if isinstance(addresses, pd.Series) else pd.Series(list(addresses), dtype="object")
+        # each distinct normalized address is geocoded once and fanned back out to its rows
+        keys = normalizeAddresses(series)
+        unique = [k for k in keys.unique() if k]
+
+        futures = {self.engine.submit(self.resolveAsync(key)): key for key in unique}
+        total = len(futures)
+        logger.info(f"{label}: {total} unique addresses for {len(series)} rows")
+        try:
+            bar = _lazy_import_tqdm()(total=total, desc=label, unit="addr")
+        except Exception:
+            bar = None
+        results: Dict[str, Tuple[Optional[float], Optional[float], Optional[str]]] = {}
+        step = max(total // 10, 1)
+        for done, fut in enumerate(concurrent.futures.as_completed(futures), start=1):
+            results[futures[fut]] = fut.result()
+            if bar is not None:
+                bar.update(1)
+            elif done % step == 0 or done == total:
+                logger.info(f"{label}: {done}/{total}")
+        if bar is not None:
+            bar.close()
+
+        resolved = keys.map(lambda k: results.get(k, (None, None, None)))
+        lat = resolved.str[0].to_numpy(dtype="float64", na_value=np.nan)
+        lon = resolved.str[1].to_numpy(dtype="float64", na_value=np.nan)
+        sources = resolved.str[2]
+        by_source = ", ".join(f"{k}: {v}" for k, v in sources.value_counts().items())
+        logger.info(f"{label}: located {int(np.count_nonzero(~np.isnan(lat)))} of {len(series)} rows ({by_source})")
+        if return_source:
+            return lat, lon, sources.to_numpy(dtype=object)
+        return lat, lon
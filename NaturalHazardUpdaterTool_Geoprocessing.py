@@ -0,0 +1,701 @@
+"""
+Vectorized geoprocessing helpers shared by the hazard modules.
+
+ZoneRules describes how a layer's ZONE value is derived (a code -> zone map,
+overrides conditioned on another field, a default) and evaluates it over whole
+columns at once instead of row by row:
+
+    rules = ZoneRules("polygon_ty", {"P": "IN", "Cl": "OUT"}, default="OUT")
+    rules.override("Cl", "county_nam", ["fre", "kin"], "IN")
+    zones, unknown = rules.apply(gdf)
+
+readFramesParallel loads many vector sources (e.g. one shapefile per county) on a
+thread pool, reprojecting each inside its worker; pyogrio and PROJ release the
+GIL, so reads and transforms overlap across cores.
+
+overlayDissolve is the open-source counterpart of an ArcPy Intersect followed
+by a Dissolve: candidate pairs come from a shapely STRtree, the pairs are split
+by a partition field that is also a dissolve key (e.g. the county), and each
+partition is intersected and dissolved on its own worker.
+
+dissolveFrame replaces a single-threaded Dissolve: features are grouped on the
+dissolve keys, very large groups are split into grid tiles, every group / tile
+is unioned on the worker pool and the tile results of a group are unioned once
+more, which stitches polygons crossing tile edges back together.
+
+rasterToPolygons vectorizes a single-band raster window by window (rasterio):
+each window is scaled and cast in place, polygonized on the worker pool, and
+polygons touching an inner window edge are merged with their neighbours of the
+same value afterwards. Memory follows the window size, not the raster size.
+A Quantizer (fixed bin width or class breaks) can replace the scale-and-truncate
+step, so neighbouring cells in the same class form one polygon.
+
+ReferenceData holds the California jurisdictions and boundary in memory for the
+whole run (prepared geometries, an STRtree), so clip / erase / point-in-CA
+steps are vectorized predicates instead of repeated reads and Erase calls.
+"""
+from __future__ import annotations
+import os
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger("hazard_tools")
+
+_max_workers: Optional[int] = None
+
+
+def configureGeoprocessing(max_workers: Optional[int] = None) -> None:
+    """Set the worker count for parallel geoprocessing (None = one per CPU)."""
+    global _max_workers
+    _max_workers = max_workers
+
+
+def workerCount(n_tasks: int) -> int:
+    """Workers to use for `n_tasks` independent tasks."""
+    limit = _max_workers or os.cpu_count() or 1
+    return max(1, min(limit, n_tasks))
+
+
+def _code_key(value: Any) -> Optional[str]:
+    """Text form of a code; integral floats drop their ".0" so 1, 1.0 and "1" all match."""
+    import numpy as np
+    import pandas as pd
+    if value is None or value is pd.NA or (isinstance(value, (float, np.floating)) and np.isnan(value)):
+        return None
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _code_strings(values):
+    """Series -> string Series of _code_key()s (a float column, or an int column with nulls, still matches 1)."""
+    import pandas as pd
+    if pd.api.types.is_float_dtype(values):
+        integral = values.notna() & (values % 1 == 0)
+        out = values.astype("string")
+        out[integral] = values[integral].astype("int64").astype("string")
+        return out
+    if values.dtype == object:
+        return values.map(_code_key).astype("string")
+    return values.astype("string")
+
+
+class ZoneRules:
+    """
+    Declarative zone classification.
+
+    code_field   field holding the source code (None -> every feature gets `default`)
+    codes        code -> zone
+    default      zone for codes not in `codes` (and for null / blank codes)
+
+    Overrides are checked before the code map, in the order they were added.
+    Override values are compared case-insensitively after stripping whitespace.
+    """
+
+    def __init__(self, code_field: Optional[str] = None, codes: Optional[Dict[Any, str]] = None,
+                 default: str = "OUT"):
+        self.code_field = code_field
+        self.codes = {_code_key(k): v for k, v in (codes or {}).items()}
+        self.default = default
+        self._overrides: List[Tuple[str, str, Set[str], str]] = []
+
+    def override(self, code: Any, field: str, values: Iterable[Any], zone: str) -> "ZoneRules":
+        """Features with `code` whose `field` is one of `values` get `zone`."""
+        self._overrides.append((_code_key(code), field, {_code_key(v).strip().lower() for v in values}, zone))
+        return self
+
+    @property
+    def fields(self) -> List[str]:
+        """Fields `apply` reads, for building a cursor or a column selection."""
+        names = [self.code_field] if self.code_field else []
+        for _, field, _, _ in self._overrides:
+            if field not in names:
+                names.append(field)
+        return names
+
+    def apply(self, frame) -> Tuple[Any, Set[str]]:
+        """
+        Evaluate the rules over `frame` (a DataFrame or a dict of equal-length lists).
+        Returns (zones as an object ndarray, set of non-blank codes missing from `codes`).
+        """
+        import numpy as np
+        import pandas as pd
+
+        if not isinstance(frame, pd.DataFrame):
+            frame = pd.DataFrame({k: list(v) for k, v in frame.items()})
+        n = len(frame)
+        if self.code_field is None:
+            return np.full(n, self.default, dtype=object), set()
+
+        if self.code_field in frame:
+            codes = _code_strings(frame[self.code_field])
+        else:
+            codes = pd.Series(pd.NA, index=frame.index, dtype="string")
+        mapped = codes.map(self.codes)
+
+        conditions, choices = [], []
+        for code, field, values, zone in self._overrides:
+            if field not in frame:
+                continue
+            keys = _code_strings(frame[field]).str.strip().str.lower()
+            hit = codes.eq(code) & keys.isin(values)
+            conditions.append(hit.fillna(False).to_numpy(dtype=bool))
+            choices.append(zone)
+        known = mapped.notna().to_numpy(dtype=bool)
+        conditions.append(known)
+        choices.append(mapped.to_numpy(dtype=object, na_value=None))
+
+        zones = np.select(conditions, choices, default=self.default) if n else np.empty(0, dtype=object)
+        zones = zones.astype(object)
+
+        missing = codes[~known].dropna()
+        unknown = set(missing[missing.str.strip() != ""].unique())
+        return zones, unknown
+
+
+def _lazy_import_pyogrio():
+    import importlib
+    try:
+        return importlib.import_module("pyogrio")
+    except Exception:
+        return None
+
+
+def _arrow_available() -> bool:
+    import importlib
+    try:
+        importlib.import_module("pyarrow")
+        return True
+    except Exception:
+        return False
+
+
+def _split_dataset_path(path: str) -> Tuple[str, Optional[str]]:
+    # "C:\\data\\x.gdb\\Layer" / "x.gpkg/Layer" -> (container, layer)
+    parent, name = os.path.split(path)
+    if parent.lower().endswith((".gdb", ".gpkg")) and not os.path.isfile(path):
+        return parent, name
+    return path, None
+
+
+def readFrame(path: str, layer: Optional[str] = None, to_epsg: Optional[int] = None,
+              assume_epsg: int = 4326, use_arrow: Optional[bool] = None, where: Optional[str] = None):
+    """
+    Read one vector source into a GeoDataFrame, through pyogrio (Arrow batches
+    when pyarrow is installed) if available. With `to_epsg`, sources without a
+    CRS are assumed to be `assume_epsg` and the frame is reprojected. `where`
+    is an SQL attribute filter applied by the driver.
+    """
+    import geopandas as gp
+
+    kwargs: Dict[str, Any] = {}
+    if layer is None:
+        path, layer = _split_dataset_path(path)
+    if layer is not None:
+        kwargs["layer"] = layer
+    if _lazy_import_pyogrio() is not None:
+        kwargs["engine"] = "pyogrio"
+        kwargs["use_arrow"] = _arrow_available() if use_arrow is None else use_arrow
+    if where:
+        kwargs["where"] = where
+    gdf = gp.read_file(path, **kwargs)
+
+    if to_epsg is not None:
+        if gdf.crs is None:
+            gdf = gdf.set_crs(epsg=int(assume_epsg))
+        gdf = gdf.to_crs(epsg=int(to_epsg))
+    return gdf
+
+
+def readFramesParallel(paths: Sequence[str], to_epsg: Optional[int] = None, assume_epsg: int = 4326,
+                       prepare=None, max_workers: Optional[int] = None,
+                       use_arrow: Optional[bool] = None) -> List[Any]:
+    """
+    readFrame() over `paths` on a thread pool. Results come back in the order
+    of `paths`. `prepare(index, gdf)` runs in the worker after the read
+    (e.g. to stamp source columns) and returns the frame to keep. `use_arrow`
+    is passed through to readFrame().
+    """
+    paths = list(paths)
+
+    def _load(i: int):
+        gdf = readFrame(paths[i], to_epsg=to_epsg, assume_epsg=assume_epsg, use_arrow=use_arrow)
+        return prepare(i, gdf) if prepare is not None else gdf
+
+    workers = max_workers or workerCount(len(paths))
+    if workers <= 1 or len(paths) <= 1:
+        return [_load(i) for i in range(len(paths))]
+    with concurrent.futures.ThreadPoolExecutor(workers, "hazard-read") as pool:
+        return list(pool.map(_load, range(len(paths))))
+
+
+_POLYGON_TYPE_IDS = (3, 6)  # shapely type ids: Polygon, MultiPolygon
+
+
+def _polygon_parts(geoms):
+    """Polygon parts of `geoms` (dropping points/lines left by touching edges) and their source index."""
+    import numpy as np
+    import shapely
+
+    parts, index = shapely.get_parts(geoms, return_index=True)
+    keep = np.isin(shapely.get_type_id(parts), _POLYGON_TYPE_IDS) & ~shapely.is_empty(parts)
+    return parts[keep], index[keep]
+
+
+def _dissolve_parts(parts, keys):
+    """Union `parts` per distinct row of `keys` (a DataFrame aligned with `parts`); nulls form their own group."""
+    import numpy as np
+    import shapely
+
+    rows, geoms = [], []
+    for key, positions in keys.groupby(list(keys.columns), dropna=False, sort=True).indices.items():
+        rows.append(key if isinstance(key, tuple) else (key,))
+        geoms.append(shapely.union_all(parts[np.asarray(positions)]))
+    return rows, geoms
+
+
+def _overlay_partition(left_geoms, right_geoms, keys):
+    """Intersect aligned geometry pairs and dissolve the polygonal result on `keys`."""
+    import shapely
+
+    pieces = shapely.intersection(left_geoms, right_geoms)
+    parts, index = _polygon_parts(pieces)
+    if len(parts) == 0:
+        return [], []
+    return _dissolve_parts(parts, keys.iloc[index].reset_index(drop=True))
+
+
+def overlayDissolve(left, right, right_fields: Sequence[str], dissolve_fields: Sequence[str],
+                    partition_field: str, max_workers: Optional[int] = None):
+    """
+    Intersect polygon layers `left` and `right` (attributes of both, polygon
+    output) and dissolve the result on `dissolve_fields` (multipart), like
+    arcpy Intersect_analysis + Dissolve_management.
+
+    `partition_field` must be one of `right_fields` and of `dissolve_fields`:
+    no dissolve group then spans two partitions, so partitions are processed
+    independently on a thread pool (shapely releases the GIL). Output rows
+    are sorted by the dissolve fields.
+    """
+    import numpy as np
+    import pandas as pd
+    import shapely
+    import geopandas as gp
+
+    if partition_field not in right_fields or partition_field not in dissolve_fields:
+        raise ValueError(f"partition_field '{partition_field}' must be a right field and a dissolve field")
+    dissolve_fields = list(dissolve_fields)
+    if right.crs is not None and left.crs is not None and right.crs != left.crs:
+        right = right.to_crs(left.crs)
+
+    left_geoms = left.geometry.to_numpy()
+    right_geoms = right.geometry.to_numpy()
+    tree = shapely.STRtree(left_geoms)
+    right_idx, left_idx = tree.query(right_geoms, predicate="intersects")
+
+    left_attrs = left.drop(columns=left.geometry.name).reset_index(drop=True)
+    right_attrs = right[list(right_fields)].reset_index(drop=True)
+    keys = pd.concat([left_attrs.iloc[left_idx].reset_index(drop=True),
+                      right_attrs.iloc[right_idx].reset_index(drop=True)], axis=1)[dissolve_fields]
+
+    partitions = list(keys.groupby(partition_field, dropna=False, sort=False).indices.values())
+    logger.info(f"Overlay: {len(left_idx):,} candidate pairs in {len(partitions)} partition(s)")
+
+    def _run(positions):
+        positions = np.asarray(positions)
+        return _overlay_partition(left_geoms[left_idx[positions]], right_geoms[right_idx[positions]],
+                                  keys.iloc[positions].reset_index(drop=True))
+
+    workers = max_workers or workerCount(len(partitions))
+    if workers <= 1:
+        results = [_run(p) for p in partitions]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(workers, "hazard-overlay") as pool:
+            results = list(pool.map(_run, partitions))
+
+    rows = [r for part_rows, _ in results for r in part_rows]
+    geoms = [g for _, part_geoms in results for g in part_geoms]
+    out = pd.DataFrame.from_records(rows, columns=dissolve_fields) if rows else keys.iloc[:0].reset_index(drop=True)
+    for col in dissolve_fields:
+        out[col] = out[col].astype(keys[col].dtype)
+    out = gp.GeoDataFrame(out, geometry=gp.GeoSeries(geoms, crs=left.crs), crs=left.crs)
+    return out.sort_values(dissolve_fields, kind="stable").reset_index(drop=True)
+
+
+def _grid_tiles(geoms, positions, max_parts: int) -> List[Any]:
+    """Split `positions` into square grid tiles of roughly `max_parts` features (by bounding-box center)."""
+    import math
+    import numpy as np
+    import shapely
+
+    bounds = shapely.bounds(geoms)
+    cx = (bounds[:, 0] + bounds[:, 2]) / 2.0
+    cy = (bounds[:, 1] + bounds[:, 3]) / 2.0
+    valid = ~np.isnan(cx)
+    if not valid.any():
+        return [positions]
+    side = max(1, math.ceil(math.sqrt(len(positions) / float(max_parts))))
+    x0, x1 = np.nanmin(cx), np.nanmax(cx)
+    y0, y1 = np.nanmin(cy), np.nanmax(cy)
+    ix = np.clip(((cx - x0) / ((x1 - x0) or 1.0) * side).astype(np.int64, copy=False), 0, side - 1)
+    iy = np.clip(((cy - y0) / ((y1 - y0) or 1.0) * side).astype(np.int64, copy=False), 0, side - 1)
+    tile = np.where(valid, ix * side + iy, 0)
+    return [positions[tile == t] for t in np.unique(tile)]
+
+
+def dissolveFrame(gdf, by: Sequence[str], single_part: bool = False, max_parts: int = 5000,
+                  max_workers: Optional[int] = None):
+    """
+    Dissolve `gdf` on the `by` fields, like arcpy Dissolve_management
+    (MULTI_PART, or SINGLE_PART with `single_part=True`). Null keys form their
+    own group. Groups with more than `max_parts` features are split into grid
+    tiles that are unioned in parallel and then stitched. Output rows are
+    sorted by the dissolve fields.
+    """
+    import numpy as np
+    import pandas as pd
+    import shapely
+    import geopandas as gp
+
+    by = list(by)
+    keys = pd.DataFrame(gdf[by]).reset_index(drop=True)
+    geoms = gdf.geometry.to_numpy()
+    groups = keys.groupby(by, dropna=False, sort=True).indices
+    group_keys = [k if isinstance(k, tuple) else (k,) for k in groups.keys()]
+
+    tasks: List[Tuple[int, Any]] = []
+    for g, positions in enumerate(groups.values()):
+        positions = np.asarray(positions)
+        if len(positions) > max_parts:
+            tasks.extend((g, tile) for tile in _grid_tiles(geoms[positions], positions, max_parts))
+        else:
+            tasks.append((g, positions))
+    split = len(tasks) - len(group_keys)
+    logger.info(f"Dissolve: {len(geoms):,} feature(s), {len(group_keys):,} group(s)"
+                + (f", {split:,} extra grid tile(s)" if split else ""))
+
+    def _run(pool, func, items):
+        return list(pool.map(func, items)) if pool is not None else [func(i) for i in items]
+
+    workers = max_workers or workerCount(len(tasks))
+    pool = concurrent.futures.ThreadPoolExecutor(workers, "hazard-dissolve") if workers > 1 else None
+    try:
+        unions = _run(pool, lambda task: shapely.union_all(geoms[task[1]]), tasks)
+        pieces: List[List[Any]] = [[] for _ in group_keys]
+        for (g, _), geom in zip(tasks, unions):
+            pieces[g].append(geom)
+        # stitch: tile results of one group share edges, union them once more
+        merged = _run(pool, lambda p: p[0] if len(p) == 1 else shapely.union_all(np.asarray(p, dtype=object)), pieces)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    out = pd.DataFrame.from_records(group_keys, columns=by) if group_keys else keys.iloc[:0].copy()
+    for col in by:
+        out[col] = out[col].astype(keys[col].dtype)
+    merged = np.asarray(merged, dtype=object)
+    if single_part:
+        parts, index = shapely.get_parts(merged, return_index=True)
+        keep = ~shapely.is_empty(parts)
+        out = out.iloc[index[keep]].reset_index(drop=True)
+        merged = parts[keep]
+    return gp.GeoDataFrame(out, geometry=gp.GeoSeries(merged, index=out.index, crs=gdf.crs), crs=gdf.crs)
+
+
+def _lazy_import_rasterio():
+    import importlib
+    rio = importlib.import_module("rasterio")
+    importlib.import_module("rasterio.features")
+    importlib.import_module("rasterio.windows")
+    return rio
+
+
+class Quantizer:
+    """
+    Vectorized value classes: either fixed-width bins or explicit class breaks.
+
+        Quantizer(bin_width=0.25)            bin k covers [k * 0.25, (k + 1) * 0.25)
+        Quantizer(breaks=[-2, -1, -0.5, 0])  classes (< -2), [-2, -1), ..., (>= 0)
+
+    codes() maps values to int32 class codes; lower()/upper() give each code's
+    bounds (-inf / inf for open-ended classes) and describe() its range as text.
+    """
+
+    def __init__(self, bin_width: Optional[float] = None, breaks: Optional[Sequence[float]] = None):
+        if (bin_width is None) == (breaks is None):
+            raise ValueError("Quantizer needs exactly one of bin_width or breaks")
+        if bin_width is not None and not bin_width > 0:
+            raise ValueError(f"bin_width must be positive, got {bin_width}")
+        self.bin_width = float(bin_width) if bin_width is not None else None
+        self.breaks = sorted(float(b) for b in breaks) if breaks is not None else None
+        if self.breaks is not None and len(set(self.breaks)) != len(self.breaks):
+            raise ValueError(f"class breaks must be distinct: {list(breaks)}")
+
+    def codes(self, values):
+        import numpy as np
+        values = np.asarray(values, dtype="float64")
+        if self.bin_width is not None:
+            # round the quotient first so edge values (0.3 / 0.1 = 2.9999999999999996) land in their own bin
+            return np.floor(np.round(values / self.bin_width, 9)).astype(np.int32)
+        return np.digitize(values, self.breaks).astype(np.int32)
+
+    def lower(self, codes):
+        import numpy as np
+        codes = np.asarray(codes, dtype=np.int64)
+        if self.bin_width is not None:
+            return codes * self.bin_width
+        edges = np.concatenate([[-np.inf], self.breaks])
+        return edges[codes]
+
+    def upper(self, codes):
+        import numpy as np
+        codes = np.asarray(codes, dtype=np.int64)
+        if self.bin_width is not None:
+            return (codes + 1) * self.bin_width
+        edges = np.concatenate([self.breaks, [np.inf]])
+        return edges[codes]
+
+    def midpoint(self, codes):
+        """Representative value per code (the finite bound for open-ended classes)."""
+        import numpy as np
+        low, high = self.lower(codes), self.upper(codes)
+        return np.where(np.isinf(low), high, np.where(np.isinf(high), low, (low + high) / 2.0))
+
+    def describe(self, codes, unit: str = "") -> List[str]:
+        """Range text per code, e.g. "-0.5 to -0.25 Feet", "< -2 Feet", ">= 0 Feet"."""
+        import numpy as np
+        codes = np.asarray(codes, dtype=np.int64)
+        suffix = f" {unit}" if unit else ""
+        unique = np.unique(codes)
+        text = {}
+        for code, low, high in zip(unique, self.lower(unique), self.upper(unique)):
+            if np.isinf(low):
+                text[code] = f"< {round(high, 6):g}{suffix}"
+            elif np.isinf(high):
+                text[code] = f">= {round(low, 6):g}{suffix}"
+            else:
+                text[code] = f"{round(low, 6):g} to {round(high, 6):g}{suffix}"
+        return [text[c] for c in codes]
+
+
+def _polygonize_window(raster_path: str, window, scale: float, nodata: Optional[float], connectivity: int,
+                       quantizer: Optional[Quantizer] = None):
+    """Polygonize one window: returns (geometries, values, touches-inner-edge flags)."""
+    import numpy as np
+    import shapely
+    rio = _lazy_import_rasterio()
+
+    with rio.open(raster_path) as src:  # one handle per task: dataset handles are not thread-safe
+        data = src.read(1, window=window, out_dtype="float64")
+        transform = src.window_transform(window)
+        inner_edges = (window.col_off > 0, window.row_off > 0,
+                       window.col_off + window.width < src.width, window.row_off + window.height < src.height)
+        src_nodata = src.nodata
+
+    valid = np.isfinite(data)
+    for nd in (src_nodata, nodata):
+        if nd is not None:
+            valid &= data != nd
+    if not valid.any():
+        return [], [], []
+    data[~valid] = 0
+    if scale != 1:
+        np.multiply(data, scale, out=data)
+    if quantizer is not None:
+        values = quantizer.codes(data)
+    else:
+        values = data.astype(np.int32)  # truncates toward zero, like astype(int) on the scaled array
+    del data
+
+    geoms, codes = [], []
+    for geom, value in rio.features.shapes(values, mask=valid, transform=transform, connectivity=connectivity):
+        geoms.append(shapely.geometry.shape(geom))
+        codes.append(int(value))
+    geoms = np.asarray(geoms, dtype=object)
+
+    # window bounds in map units; polygons reaching an inner edge may continue in the next window
+    left, top = transform * (0, 0)
+    right, bottom = transform * (window.width, window.height)
+    bounds = shapely.bounds(geoms)
+    eps = abs(transform.a) / 2.0
+    on_edge = np.zeros(len(geoms), dtype=bool)
+    for inner, side in zip(inner_edges, (bounds[:, 0] <= min(left, right) + eps, bounds[:, 3] >= max(top, bottom) - eps,
+                                         bounds[:, 2] >= max(left, right) - eps, bounds[:, 1] <= min(top, bottom) + eps)):
+        if inner:
+            on_edge |= side
+    return list(geoms), codes, list(on_edge)
+
+
+def rasterToPolygons(raster_path: str, scale: float = 1, nodata: Optional[float] = None, value_field: str = "gridcode",
+                     window_size: int = 1024, connectivity: int = 4, assume_epsg: Optional[int] = None,
+                     quantizer: Optional[Quantizer] = None, max_workers: Optional[int] = None):
+    """
+    Open-source RasterToPolygon (NO_SIMPLIFY) for band 1 of `raster_path`.
+
+    Cell values are multiplied by `scale` and truncated to int32 per window
+    (or, with a `quantizer`, scaled and replaced by their class codes); the
+    raster's NoData, `nodata` and non-finite cells are left out. Windows of
+    `window_size` x `window_size` cells are polygonized in parallel, then
+    same-value polygons meeting across window edges are merged. Returns a
+    GeoDataFrame with `value_field` (int) and polygon geometry.
+    """
+    import numpy as np
+    import pandas as pd
+    import shapely
+    import geopandas as gp
+    rio = _lazy_import_rasterio()
+
+    with rio.open(raster_path) as src:
+        width, height, crs = src.width, src.height, src.crs
+    if crs is None and assume_epsg is not None:
+        crs = f"EPSG:{int(assume_epsg)}"
+
+    windows = [rio.windows.Window(col, row, min(window_size, width - col), min(window_size, height - row))
+               for row in range(0, height, window_size) for col in range(0, width, window_size)]
+
+    def _run(window):
+        return _polygonize_window(raster_path, window, scale, nodata, connectivity, quantizer)
+
+    workers = max_workers or workerCount(len(windows))
+    pool = concurrent.futures.ThreadPoolExecutor(workers, "hazard-raster") if workers > 1 else None
+    try:
+        results = list(pool.map(_run, windows)) if pool is not None else [_run(w) for w in windows]
+
+        geoms = np.asarray([g for r in results for g in r[0]], dtype=object)
+        codes = np.asarray([c for r in results for c in r[1]], dtype=np.int64)
+        on_edge = np.asarray([e for r in results for e in r[2]], dtype=bool)
+        del results
+
+        # merge edge pieces per value; parts that only touch at a corner stay separate, as in a single pass
+        edge_codes = np.unique(codes[on_edge])
+
+        def _merge(code):
+            return shapely.get_parts(shapely.union_all(geoms[on_edge & (codes == code)]))
+
+        merged = list(pool.map(_merge, edge_codes)) if pool is not None else [_merge(c) for c in edge_codes]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    logger.info(f"Raster to polygon: {len(windows)} window(s), {int(on_edge.sum()):,} edge piece(s) "
+                f"merged into {sum(len(m) for m in merged):,}")
+    out_geoms = np.concatenate([geoms[~on_edge]] + merged) if merged else geoms[~on_edge]
+    out_codes = np.concatenate([codes[~on_edge]] + [np.full(len(m), c, dtype=np.int64) for c, m in zip(edge_codes, merged)])
+    out = pd.DataFrame({value_field: out_codes.astype(np.int32)})
+    return gp.GeoDataFrame(out, geometry=gp.GeoSeries(out_geoms, crs=crs), crs=crs)
+
+
+class ReferenceData:
+    """
+    California reference layers, read once and cached per EPSG code: the
+    jurisdictions, the CA boundary (their union, or `boundary_path`) as a
+    prepared geometry, and an STRtree over the jurisdictions.
+
+        ref = ReferenceData(r"C:\\workspace\\__BaseData\\Corrected_Jurisdictions.gdb\\CA_Jurisdictions")
+        in_ca = ref.containsPoints(x, y, epsg=4326)
+        na_area = ref.erase(subsidence_gdf, epsg=3310)
+
+    Returned frames are shared; copy them before modifying.
+    """
+
+    def __init__(self, jurisdictions_path: str, boundary_path: Optional[str] = None):
+        self.jurisdictions_path = jurisdictions_path
+        self.boundary_path = boundary_path
+        self._lock = threading.RLock()
+        self._frames: Dict[Optional[int], Any] = {}
+        self._boundaries: Dict[Optional[int], Any] = {}
+        self._trees: Dict[Optional[int], Any] = {}
+
+    def jurisdictions(self, epsg: Optional[int] = None):
+        """Jurisdiction polygons (in `epsg`, or their own CRS)."""
+        key = int(epsg) if epsg is not None else None
+        with self._lock:
+            if key not in self._frames:
+                if None not in self._frames:
+                    logger.info(f"Loading reference jurisdictions: {self.jurisdictions_path}")
+                    self._frames[None] = readFrame(self.jurisdictions_path)
+                if key is not None:
+                    self._frames[key] = self._frames[None].to_crs(epsg=key)
+            return self._frames[key]
+
+    def boundary(self, epsg: Optional[int] = None):
+        """The CA boundary as one prepared shapely geometry."""
+        import shapely
+
+        key = int(epsg) if epsg is not None else None
+        with self._lock:
+            if key not in self._boundaries:
+                if self.boundary_path:
+                    frame = readFrame(self.boundary_path, to_epsg=key)
+                    geom = shapely.union_all(frame.geometry.to_numpy())
+                else:
+                    frame = self.jurisdictions(key)
+                    geom = dissolveFrame(frame[[]].assign(_ca=1).set_geometry(frame.geometry), ["_ca"]).geometry.iloc[0]
+                shapely.prepare(geom)
+                self._boundaries[key] = geom
+            return self._boundaries[key]
+
+    def tree(self, epsg: Optional[int] = None):
+        """STRtree over jurisdictions(epsg).geometry."""
+        import shapely
+
+        key = int(epsg) if epsg is not None else None
+        with self._lock:
+            if key not in self._trees:
+                self._trees[key] = shapely.STRtree(self.jurisdictions(key).geometry.to_numpy())
+            return self._trees[key]
+
+    def containsPoints(self, x, y, epsg: int):
+        """Boolean mask: which (x, y) points in `epsg` fall inside California."""
+        import numpy as np
+        import shapely
+
+        x = np.asarray(x, dtype="float64")
+        y = np.asarray(y, dtype="float64")
+        return shapely.contains_xy(self.boundary(epsg), x, y) & np.isfinite(x) & np.isfinite(y)
+
+    def clip(self, gdf):
+        """`gdf` clipped to the CA boundary (features outside dropped), in gdf's CRS."""
+        import shapely
+
+        boundary = self.boundary(gdf.crs.to_epsg())
+        geoms = gdf.geometry.to_numpy()
+        inside = shapely.contains(boundary, geoms)
+        partial = ~inside & shapely.intersects(boundary, geoms)
+        out = gdf[inside | partial].copy()
+        clipped = geoms[inside | partial].copy()
+        clipped[partial[inside | partial]] = shapely.intersection(geoms[partial], boundary)
+        out[out.geometry.name] = clipped
+        return out[~out.geometry.is_empty]
+
+    def erase(self, gdf, epsg: Optional[int] = None):
+        """
+        Jurisdictions with the area of `gdf` removed (arcpy Erase_analysis with
+        the jurisdictions as input). Only jurisdictions the STRtree finds
+        under `gdf` are cut; the rest are returned as is.
+        """
+        import numpy as np
+        import shapely
+
+        key = int(epsg) if epsg is not None else gdf.crs.to_epsg()
+        if gdf.crs is not None and gdf.crs.to_epsg() != key:
+            gdf = gdf.to_crs(epsg=key)
+        juris = self.jurisdictions(key)
+
+        eraser = dissolveFrame(gdf[[]].assign(_erase=1).set_geometry(gdf.geometry), ["_erase"], single_part=True)
+        parts = eraser.geometry.to_numpy()
+        part_idx, juris_idx = self.tree(key).query(parts, predicate="intersects")
+
+        geoms = juris.geometry.to_numpy().copy()
+        order = np.argsort(juris_idx, kind="stable")
+        hit, starts = np.unique(juris_idx[order], return_index=True)
+        cutters = [shapely.union_all(parts[group]) for group in np.split(part_idx[order], starts[1:])] if len(hit) else []
+        if len(hit):
+            geoms[hit] = shapely.difference(geoms[hit], np.asarray(cutters, dtype=object))
+        logger.info(f"Erase: {len(hit):,} of {len(geoms):,} jurisdiction(s) cut")
+
+        out = juris.copy()
+        out[out.geometry.name] = geoms
+        return out[~out.geometry.is_empty]
@@ -0,0 +1,389 @@
+"""
+Asyncio network engine shared by every module in a run.
+
+One event loop runs on a background thread for the whole run. Module code
+stays synchronous and calls the blocking wrappers (getJson, download,
+queryLayer...) or submit()s coroutines and collects the futures later, so
+downloads keep going while CPU-bound stages (ArcPy, GeoPandas) run on the
+calling thread.
+
+Uses aiohttp when installed; otherwise each request runs `requests` on the
+loop's thread pool, with the same concurrency limits.
+
+Every request also passes through a per-host politeness scheduler: a token
+bucket (requests/second + burst) and a concurrency cap per host, with
+adaptive backoff when a host answers 429/503.
+"""
+from __future__ import annotations
+import re
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+import contextlib
+import email.utils
+import concurrent.futures
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("hazard_tools")
+
+_CHUNK_SIZE = 1024 * 1024
+USER_AGENT = "hazard-tools/1.0"
+_RETRY_STATUSES = (429, 503)
+
+
+def _lazy_import_aiohttp():
+    import importlib
+    return importlib.import_module("aiohttp")
+
+
+class FetchError(RuntimeError):
+    """HTTP error from the fetch engine (`status` is None for connection failures)."""
+
+    def __init__(self, url: str, status: Optional[int], message: str = "", headers: Optional[Dict[str, str]] = None):
+        super().__init__(f"{status or 'connection error'} fetching {url}" + (f": {message}" if message else ""))
+        self.url = url
+        self.status = status
+        self.headers = headers or {}
+
+
+# ------------------------------------------------------------------------------
+# Per-host politeness
+# ------------------------------------------------------------------------------
+@dataclass
+class HostPolicy:
+    rate: float = 4.0         # sustained requests per second
+    burst: int = 4            # requests allowed back-to-back before pacing kicks in
+    max_concurrent: int = 4   # simultaneous requests to the host
+
+
+DEFAULT_HOST_POLICIES: Dict[str, HostPolicy] = {
+    # public Nominatim usage policy: max 1 request/second, no bulk parallelism
+    "nominatim.openstreetmap.org": HostPolicy(rate=1.0, burst=1, max_concurrent=1),
+    "gis.conservation.ca.gov": HostPolicy(rate=2.0, burst=4, max_concurrent=4),
+    "services.arcgis.com": HostPolicy(rate=5.0, burst=10, max_concurrent=6),
+    "geocode.search.hereapi.com": HostPolicy(rate=5.0, burst=5, max_concurrent=5),
+}
+
+
+def _retry_after_seconds(headers: Dict[str, str]) -> Optional[float]:
+    value = next((v for k, v in headers.items() if k.lower() == "retry-after"), None)
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+        return max(when.timestamp() - time.time(), 0.0)
+    except Exception:
+        return None
+
+
+class HostLimiter:
+    """
+    Token bucket + concurrency cap for one host.
+
+    On 429/503 the sustained rate is halved (down to 1/16 of the policy) and the
+    host is paused for Retry-After, or an exponential delay capped at 60 s.
+    Successful responses restore the rate gradually.
+    """
+
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self._tokens = float(policy.burst)
+        self._last = time.monotonic()
+        self._factor = 1.0
+        self._strikes = 0
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self.slots = asyncio.Semaphore(policy.max_concurrent)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                rate = self.policy.rate * self._factor
+                self._tokens = min(float(self.policy.burst), self._tokens + (now - self._last) * rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / rate)
+
+    def penalize(self, retry_after: Optional[float]) -> float:
+        self._strikes += 1
+        self._factor = max(self._factor / 2.0, 1.0 / 16.0)
+        delay = retry_after if retry_after is not None else min(2.0 ** self._strikes, 60.0)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        self._tokens = 0.0
+        return delay
+
+    def reward(self) -> None:
+        self._strikes = 0
+        if self._factor < 1.0:
+            self._factor = min(self._factor * 1.25, 1.0)
+
+
+class FetchEngine:
+    """
+    engine = FetchEngine(max_connections=16, per_host=4)
+    meta = engine.getJson(layer_url, {"f": "json"})
+    engine.close()
+
+    `per_host` is the concurrency for hosts without an entry in `host_policies`
+    (which defaults to DEFAULT_HOST_POLICIES).
+    """
+
+    def __init__(self, max_connections: int = 16, per_host: int = 4, timeout: float = 300,
+                 user_agent: str = USER_AGENT, host_policies: Optional[Dict[str, HostPolicy]] = None,
+                 max_retries: int = 5):
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.max_retries = max_retries
+        self.host_policies = dict(DEFAULT_HOST_POLICIES)
+        self.host_policies.update(host_policies or {})
+        try:
+            self._aiohttp = _lazy_import_aiohttp()
+        except Exception:
+            self._aiohttp = None
+            logger.info("aiohttp not installed; network engine is using requests on worker threads.")
+        self._session = None
+        self._requests_session = None
+        self._global_slots: Optional[asyncio.Semaphore] = None
+        self._hosts: Dict[str, HostLimiter] = {}
+
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(max_connections, "hazard-fetch"))
+        self._thread = threading.Thread(target=self._loop.run_forever, name="hazard-fetch-loop", daemon=True)
+        self._thread.start()
+
+    # ---------------- loop plumbing ----------------
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the engine loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """Run a coroutine on the engine loop and block for its result."""
+        return self.submit(coro).result()
+
+    def close(self) -> None:
+        if not self._loop.is_running():
+            return
+
+        async def _shutdown():
+            if self._session is not None:
+                await self._session.close()
+        self.run(_shutdown())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+        if self._requests_session is not None:
+            self._requests_session.close()
+
+    def _host(self, url: str) -> HostLimiter:
+        host = (urlsplit(url).hostname or "").lower()
+        if host not in self._hosts:
+            # "services.arcgis.com" also covers "services3.arcgis.com" etc.
+            policy = self.host_policies.get(host) or self.host_policies.get(re.sub(r"^([a-z-]+)\d+\.", r"\1.", host))
+            self._hosts[host] = HostLimiter(policy or HostPolicy(rate=float(self.per_host), burst=self.per_host,
+                                                                 max_concurrent=self.per_host))
+        return self._hosts[host]
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, limiter: HostLimiter):
+        """Wait for the host's rate limit, then hold a host slot and a global slot for the request."""
+        if self._global_slots is None:
+            self._global_slots = asyncio.Semaphore(self.max_connections)
+        async with limiter.slots:
+            await limiter.acquire()
+            async with self._global_slots:
+                yield
+
+    def _aiohttp_session(self):
+        if self._session is None:
+            aiohttp = self._aiohttp
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=0),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=60, sock_read=self.timeout),
+                headers={"User-Agent": self.user_agent},
+            )
+        return self._session
+
+    def _blocking_session(self):
+        if self._requests_session is None:
+            import requests
+            adapter = requests.adapters.HTTPAdapter(pool_connections=self.max_connections, pool_maxsize=self.max_connections)
+            self._requests_session = requests.Session()
+            self._requests_session.mount("http://", adapter)
+            self._requests_session.mount("https://", adapter)
+            self._requests_session.headers["User-Agent"] = self.user_agent
+        return self._requests_session
+
+    # ---------------- core request ----------------
+    async def _request(self, url: str, params: Optional[Dict[str, Any]] = None,
+                       headers: Optional[Dict[str, str]] = None, dest_path: Optional[str] = None,
+                       ok_statuses: Sequence[int] = ()) -> Tuple[int, Dict[str, str], Optional[bytes], Optional[str]]:
+        """
+        GET `url`. Returns (status, headers, body, sha256). When `dest_path` is
+        given the body is streamed to that file (body is None) and hashed on the way.
+        429/503 responses are retried after the host's backoff delay.
+        """
+        limiter = self._host(url)
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._slot(limiter):
+                    if self._aiohttp is not None:
+                        result = await self._request_aiohttp(url, params, headers, dest_path, ok_statuses)
+                    else:
+                        result = await asyncio.get_running_loop().run_in_executor(
+                            None, self._request_blocking, url, params, headers, dest_path, ok_statuses)
+                limiter.reward()
+                return result
+            except FetchError as e:
+                if e.status not in _RETRY_STATUSES or attempt == self.max_retries:
+                    raise
+                delay = limiter.penalize(_retry_after_seconds(e.headers))
+                logger.info(f"{urlsplit(url).hostname} answered {e.status}; backing off {delay:.1f}s")
+        raise AssertionError("unreachable")
+
+    async def _request_aiohttp(self, url, params, headers, dest_path, ok_statuses):
+        aiohttp = self._aiohttp
+        try:
+            async with self._aiohttp_session().get(url, params=params, headers=headers) as resp:
+                resp_headers = dict(resp.headers)
+                if resp.status >= 400 and resp.status not in ok_statuses:
+                    raise FetchError(url, resp.status, resp.reason or "", resp_headers)
+                if resp.status in ok_statuses or dest_path is None:
+                    return resp.status, resp_headers, await resp.read(), None
+                h = hashlib.sha256()
+                with open(dest_path, "wb") as f:
+                    async for chunk in resp.content.iter_chunked(_CHUNK_SIZE):
+                        h.update(chunk)
+                        f.write(chunk)
+                return resp.status, resp_headers, None, h.hexdigest()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise FetchError(url, None, str(e)) from e
+
+    def _request_blocking(self, url, params, headers, dest_path, ok_statuses):
+        import requests
+        try:
+            with self._blocking_session().get(url, params=params, headers=headers, stream=True, timeout=self.timeout) as resp:
+                resp_headers = dict(resp.headers)
+                if resp.status_code >= 400 and resp.status_code not in ok_statuses:
+                    raise FetchError(url, resp.status_code, resp.reason or "", resp_headers)
+                if resp.status_code in ok_statuses or dest_path is None:
+                    return resp.status_code, resp_headers, resp.content, None
+                h = hashlib.sha256()
+                with open(dest_path, "wb") as f:
+                    for chunk in resp.iter_content(_CHUNK_SIZE):
+                        h.update(chunk)
+                        f.write(chunk)
+                return resp.status_code, resp_headers, None, h.hexdigest()
+        except requests.RequestException as e:
+            raise FetchError(url, None, str(e)) from e
+
+    # ---------------- async API ----------------
+    async def getBytesAsync(self, url: str, params: Optional[Dict[str, Any]] = None,
+                            headers: Optional[Dict[str, str]] = None) -> bytes:
+        _, _, body, _ = await self._request(url, params, headers)
+        return body or b""
+
+    async def getJsonAsync(self, url: str, params: Optional[Dict[str, Any]] = None,
+                           headers: Optional[Dict[str, str]] = None) -> Any:
+        return json.loads(await self.getBytesAsync(url, params, headers))
+
+    async def downloadAsync(self, url: str, dest_path: str, headers: Optional[Dict[str, str]] = None,
+                            ok_statuses: Sequence[int] = (304,)) -> Tuple[int, Dict[str, str], Optional[str]]:
+        """Stream `url` to `dest_path`. Returns (status, response headers, sha256 of the body)."""
+        status, resp_headers, _, sha256 = await self._request(url, None, headers, dest_path, ok_statuses)
+        return status, resp_headers, sha256
+
+    async def queryLayerAsync(self, layer_url: str, out_sr: int | str = 3857, where: str = "1=1",
+                              out_format: str = "json", chunk_size: int = 100,
+                              object_ids: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Page through an ArcGIS REST layer by objectIds and return one payload per
+        page (Esri JSON or GeoJSON, per `out_format`), in object-id order.
+        Pages are requested concurrently within the engine's limits.
+        """
+        query_url = f"{layer_url}/query"
+        if object_ids is None:
+            ids = await self.getJsonAsync(query_url, {"f": "json", "where": where, "returnIdsOnly": "true"})
+            if "error" in ids:
+                raise FetchError(layer_url, None, str(ids["error"]))
+            object_ids = sorted(ids.get("objectIds") or [])
+        pages = [object_ids[i:i + chunk_size] for i in range(0, len(object_ids), chunk_size)]
+
+        async def _page(oids):
+            params = {
+                "f": out_format, "where": where, "outFields": "*", "returnGeometry": "true",
+                "outSR": out_sr, "objectIds": ",".join(map(str, oids)),
+            }
+            payload = await self.getJsonAsync(query_url, params)
+            if "error" in payload:
+                raise FetchError(layer_url, None, str(payload["error"]))
+            return payload
+
+        return list(await asyncio.gather(*(_page(p) for p in pages)))
+
+    # ---------------- blocking wrappers (for module code) ----------------
+    def getBytes(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> bytes:
+        return self.run(self.getBytesAsync(url, params, headers))
+
+    def getJson(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Any:
+        return self.run(self.getJsonAsync(url, params, headers))
+
+    def download(self, url: str, dest_path: str, headers: Optional[Dict[str, str]] = None,
+                 ok_statuses: Sequence[int] = (304,)) -> Tuple[int, Dict[str, str], Optional[str]]:
+        return self.run(self.downloadAsync(url, dest_path, headers, ok_statuses))
+
+    def downloadMany(self, jobs: Iterable[Tuple[str, str]]) -> List[Tuple[int, Dict[str, str], Optional[str]]]:
+        """Download several (url, dest_path) pairs concurrently."""
+        async def _all():
+            return await asyncio.gather(*(self.downloadAsync(url, dest) for url, dest in jobs))
+        return self.run(_all())
+
+    def queryLayer(self, layer_url: str, out_sr: int | str = 3857, where: str = "1=1",
+                   out_format: str = "json", chunk_size: int = 100) -> List[Dict[str, Any]]:
+        return self.run(self.queryLayerAsync(layer_url, out_sr, where, out_format, chunk_size))
+
+
+# ------------------------------------------------------------------------------
+# One engine per run
+# ------------------------------------------------------------------------------
+_engine: Optional[FetchEngine] = None
+_engine_lock = threading.Lock()
+_engine_settings: Dict[str, Any] = {}
+
+
+def configureFetchEngine(max_connections: int = 16, per_host: int = 4, timeout: float = 300,
+                         host_policies: Optional[Dict[str, HostPolicy]] = None) -> None:
+    """Set limits for the run's engine (call before the first request)."""
+    _engine_settings.update(max_connections=max_connections, per_host=per_host, timeout=timeout,
+                            host_policies=host_policies)
+
+
+def getFetchEngine() -> FetchEngine:
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = FetchEngine(**_engine_settings)
+        return _engine
+
+
+def closeFetchEngine() -> None:
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.close()
+            _engine = None
@@ -44,11 +44,7 @@ def runAllWells(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb
 
         m = "Dowloading file"
         writeMessages(log_file_path, m, False)
-        download_button.click()
-        time.sleep(20) # the download should take less than 20 seconds
-
-        download_zip = os.listdir(other_data_folder)[0]
-        download_zip_path = os.path.join(other_data_folder, download_zip)
+        download_zip_path = storeDownload("doggr_all_wells", clickToDownloadFile(download_button, other_data_folder), web_address)
 
         m = "Extrating contents from zip file"
         writeMessages(log_file_path, m, False)
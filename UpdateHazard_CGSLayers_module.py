@@ -27,7 +27,7 @@ def runCGS(
               "fault":       "https://.../FeatureServer/###",
               "evaluation":  "https://.../FeatureServer/###"
             }
-      - Downloads with esridump → GeoJSON → GeoPandas
+      - Downloads GeoJSON pages via extractGeoJson → GeoPandas
       - Adds fields and concatenates like ArcPy Merge
       - Writes a GeoPackage (.gpkg) in the final folder and, if possible, to `naturalhazards_gdb`
         * If `naturalhazards_gdb` ends with ".gpkg", writes there
@@ -41,6 +41,9 @@ def runCGS(
     last_updated_field = "last_updated"
     zone_field = "ZONE"
 
+    zone_rules      = ZoneRules(default="IN")  # inside zone
+    eval_zone_rules = ZoneRules(default="NA")  # not evaluated
+
     landslide_output_name    = "CGS_Landslide_Zone"
     liquifaction_output_name = "CGS_Liquefaction_Zone"
     fault_output_name        = "Alquist_Priolo_Fault_Rupture"
@@ -85,11 +88,9 @@ def runCGS(
             for fc in [landslide_fc, liquifaction_fc, fault_fc, cgs_evaluation_fc]:
                 arcpy.AddField_management(fc, last_updated_field, "DATE")                    # type: ignore
                 arcpy.AddField_management(fc, zone_field, "TEXT", field_length=10)           # type: ignore
+                rules = eval_zone_rules if fc == cgs_evaluation_fc else zone_rules
                 with arcpy.da.UpdateCursor(fc, [last_updated_field, zone_field]) as ucur:     # type: ignore
-                    if fc == cgs_evaluation_fc:
-                        update_record = [today, 'NA']  # not evaluated
-                    else:
-                        update_record = [today, 'IN']  # inside zone
+                    update_record = [today, rules.default]
                     for _ in ucur:
                         ucur.updateRow(update_record)
 
@@ -148,7 +149,7 @@ def runCGS(
         stamp = today  # pandas will keep tz-naive timestamp fine
         for gdf, is_eval in [(gdf_land, False), (gdf_liq, False), (gdf_fault, False), (gdf_eval, True)]:
             gdf[last_updated_field] = stamp
-            gdf[zone_field] = "NA" if is_eval else "IN"
+            gdf[zone_field] = (eval_zone_rules if is_eval else zone_rules).apply(gdf)[0]
 
         writeMessages(log_file_path, "Creating Final Outputs (GeoPackage)...", False)
 
@@ -33,13 +33,15 @@ def runClandestineLabs(workspace, chrome_driver_path, log_file_path, naturalhaza
         # go to address
         this_year = today.year
 
-        for year in range(start_date, this_year +1):
-            download_link = base_url.replace('[YEAR]', str(year))
-            driver.get(download_link)
-            time.sleep(5)  # allow plenty of time for the download to complete
-
-        downloaded_csvs = os.listdir(other_data_folder)
-        downloaded_csv_paths = [os.path.join(other_data_folder, downloaded_csv) for downloaded_csv in downloaded_csvs]
+        downloaded_csv_paths = []
+        with DownloadWatcher(other_data_folder) as download_watcher:
+            for year in range(start_date, this_year +1):
+                download_link = base_url.replace('[YEAR]', str(year))
+                try:
+                    csv_path = waitForDownload(other_data_folder, lambda: driver.get(download_link), 120, download_watcher)
+                    downloaded_csv_paths.append(storeDownload("dea_clan_labs_{}".format(year), csv_path, download_link))
+                except TimeoutError as e:
+                    writeMessages(log_file_path, "{}: {}".format(year, e), msg_type='warning')
 
         # process data
         arcpy.env.workspace = gis_data_folder
@@ -55,17 +57,17 @@ def runClandestineLabs(workspace, chrome_driver_path, log_file_path, naturalhaza
         for field in [lat_field, long_field]:
             arcpy.AddField_management(merged_table, field, "DOUBLE")
 
+        # geocode every distinct normalized address once, concurrently, then write the results back in cursor order
+        with arcpy.da.SearchCursor(merged_table, ['address', 'city']) as search_cursor:
+            address_rows = [((address or '').strip(), (city or '').strip()) for address, city in search_cursor]
+        address_frame = {'address': [r[0] for r in address_rows], 'city': [r[1] for r in address_rows]}
+        latitudes, longitudes = geocodeBatch(composeAddresses(address_frame, ['address', 'city'], 'CA'), label="Geocoding DEA labs")
+
         with arcpy.da.UpdateCursor(merged_table, ['address', 'city', lat_field, long_field]) as update_cursor:
-            for row in update_cursor:
-                address = row[0].strip()
-                if row[1] is not None:
-                    city = row[1].strip()
-                else:
-                    city = ''
-                complete_address = "{}, {}, CA".format(address, city)
-                latitude, longitude = forwardGeocode(complete_address)
-
-                updated_row = [address, city, latitude, longitude]
+            for i, row in enumerate(update_cursor):
+                latitude = None if math.isnan(latitudes[i]) else float(latitudes[i])
+                longitude = None if math.isnan(longitudes[i]) else float(longitudes[i])
+                updated_row = [address_rows[i][0], address_rows[i][1], latitude, longitude]
                 update_cursor.updateRow(updated_row)
 
         xy_event_layer = "event_layer"
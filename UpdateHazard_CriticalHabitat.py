@@ -5,6 +5,7 @@ def runCriticalHabitat(workspace, chrome_driver_path, log_file_path, naturalhaza
     output_sr_wkid = 3857  # WGS_1984_Web_Mercator_Auxiliary_Sphere
     output_name = "CA_Critical_Habitat_Animals"
     hazard_nickname = "Critical Animal Habitat (CNNDB)"
+    processing_version = 1  # bump when the processing below changes, so cached outputs are not reused
 
     output_common_name_field = 'COMNAME'
     output_description_field = 'DESCRIPTIO'
@@ -76,7 +77,29 @@ def runCriticalHabitat(workspace, chrome_driver_path, log_file_path, naturalhaza
 
         return subset_features
 
-    arcpy.env.overwriteOutput = True
+    def processCriticalHabitatFrame(path, query, field_mapping, name):
+        # open-source counterpart of processCriticalHabitatLayer
+        gdf = readFrame(path, to_epsg=output_sr_wkid, where=query)
+
+        current_fields = {f.upper(): f for f in gdf.columns}
+        field_check, m = checkMissingFields([f.upper() for f in field_mapping.keys()], list(current_fields))
+
+        if field_check is False:
+            writeMessages(log_file_path, m, True, "warning")
+            return None
+
+        gdf = gdf.rename(columns={current_fields[f.upper()]: out_f for f, out_f in field_mapping.items()})
+        gdf[output_description_field] = name[1]
+        gdf['ZONE'] = 'IN'
+        gdf['last_updated'] = today
+        return gdf
+
+    def findShapefile(pattern):
+        matches = sorted(f for f in os.listdir(other_data_folder) if fnmatch(f.lower(), pattern + ".shp"))
+        return os.path.join(other_data_folder, matches[0])
+
+    if ARCPY_AVAILABLE:
+        arcpy.env.overwriteOutput = True
 
     today = datetime.datetime.now()
     today_string = today.strftime("%Y%m%d_%H%M")
@@ -88,6 +111,41 @@ def runCriticalHabitat(workspace, chrome_driver_path, log_file_path, naturalhaza
 
 
     try:
+        # skip the merge + dissolve when both source zips match a previous run
+        run_fingerprint = moduleFingerprint(output_name, [cnndb_zip, fs_zip_file],
+                                            {"version": processing_version, "output_sr_wkid": output_sr_wkid,
+                                             "cnndb_query": cnndb_query, "cnndb_field_mapping": cnndb_field_mapping,
+                                             "fws_query": fws_query, "fws_field_mapping": fws_field_mapping})
+        cached_layer = restoreCachedOutput(output_name, run_fingerprint, output_name, naturalhazards_gdb)
+        if cached_layer:
+            writeMessages(log_file_path, "Input unchanged since a previous run, reusing cached output\n\tSUCCESS\n")
+            return cached_layer
+
+        dissolve_fields = ['COMNAME','DESCRIPTIO','last_updated','ZONE']
+
+        if not ARCPY_AVAILABLE:
+            # --------- Open-source mode ----------
+            for zip_file in [cnndb_zip, fs_zip_file]:
+                with ZipFile(zip_file, "r") as zip_reader:
+                    zip_reader.extractall(other_data_folder)
+
+            cnndb_gdf = processCriticalHabitatFrame(findShapefile("*cnddb*"), cnndb_query, cnndb_field_mapping, cnndb_name)
+            fws_gdf = processCriticalHabitatFrame(findShapefile("*crithab_poly*"), fws_query, fws_field_mapping, fws_name)
+
+            import pandas as pd
+            merged_gdf = pd.concat([gdf[dissolve_fields + [gdf.geometry.name]] for gdf in [fws_gdf, cnndb_gdf] if gdf is not None],
+                                   ignore_index=True)
+
+            writeMessages(log_file_path, "Dissolving Features...", False)
+            dissolved_gdf = dissolveFrame(merged_gdf, dissolve_fields, single_part=True)
+
+            final_natural_hazard_layer = writeHazardGeoPackage(dissolved_gdf, final_gdb, naturalhazards_gdb, output_name,
+                                                               today_string, log_file_path)
+            cacheModuleOutput(output_name, run_fingerprint, final_natural_hazard_layer, output_name)
+
+            writeMessages(log_file_path, "\tSUCCESS\n")
+            return final_natural_hazard_layer
+
         # CNNDB piece
         # extract the zip file
 
@@ -123,10 +181,10 @@ def runCriticalHabitat(workspace, chrome_driver_path, log_file_path, naturalhaza
         #merged_features = arcpy.Merge_management([fws_fc, cnndb_fc], os.path.join(final_gdb, output_name))
         merged_features = arcpy.Merge_management([fws_fc, cnndb_fc], os.path.join(processing_gdb, "Merged_Features"))
 
-        dissolve_fields = ['COMNAME','DESCRIPTIO','last_updated','ZONE']
         dissolved_features = arcpy.management.Dissolve(merged_features, os.path.join(final_gdb, output_name), dissolve_fields, None, "SINGLE_PART", "DISSOLVE_LINES")
         final_natural_hazard_layer = os.path.join(naturalhazards_gdb, output_name)
         arcpy.CopyFeatures_management(dissolved_features, final_natural_hazard_layer)
+        cacheModuleOutput(output_name, run_fingerprint, final_natural_hazard_layer, output_name)
 
         m = "\tSUCCESS\n"
         writeMessages(log_file_path, m)
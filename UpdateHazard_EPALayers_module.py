@@ -90,15 +90,7 @@ def runEPALayers(workspace, chrome_driver_path, log_file_path, naturalhazards_gd
         m = "Downloading latest EPA Hazards Geodatabase..."
         writeMessages(log_file_path, m, False)
 
-        filedata = urllib2.urlopen(download_link)
-        the_data = filedata.read()
-
-        m = "Done. Creating Zip File File..."
-        writeMessages(log_file_path, m, False)
-
-        download_zip_path = os.path.join(other_data_folder, "epa_hazard_gdb.zip")
-        with open(download_zip_path, 'wb') as f:
-            f.write(the_data)
+        download_zip_path = fetchSource("epa_frs_interests", download_link, other_data_folder, "epa_hazard_gdb.zip")
 
         m = "Done. Unzipping..."
         writeMessages(log_file_path, m, False)
@@ -173,7 +165,27 @@ def runEPALayers(workspace, chrome_driver_path, log_file_path, naturalhazards_gd
                     fc_name = os.path.basename(fc)
                     m = "\t{}...".format(fc_name)
                     writeMessages(log_file_path, m, False)
+                    # keep CA-coded records and any record located inside California: only the
+                    # non-CA-coded rows are read, and the ones that fall inside CA are excluded
+                    # from the delete selection
+                    not_ca = "STATE_CODE <> 'CA' OR STATE_CODE IS NULL"
                     query = "STATE_CODE <> 'CA'"
+                    try:
+                        desc = arcpy.Describe(fc)
+                        with arcpy.da.SearchCursor(fc, ["OID@", "SHAPE@X", "SHAPE@Y"], not_ca) as search_cursor:
+                            rows = [row for row in search_cursor]
+                        inside = getReferenceData().containsPoints([r[1] if r[1] is not None else float("nan") for r in rows],
+                                                                   [r[2] if r[2] is not None else float("nan") for r in rows],
+                                                                   epsg=desc.spatialReference.factoryCode)
+                        keep_oids = [str(r[0]) for r, in_ca in zip(rows, inside) if in_ca]
+                        ca_query = "({})".format(not_ca)
+                        if keep_oids:
+                            oid_field = arcpy.AddFieldDelimiters(fc, desc.OIDFieldName)
+                            ca_query += " AND {} NOT IN ({})".format(oid_field, ",".join(keep_oids))
+                        query = ca_query
+                    except Exception as e:
+                        writeMessages(log_file_path, "\tCA boundary unavailable ({}), filtering on STATE_CODE".format(e), False)
+
                     feature_layer = "feature_layer"
                     arcpy.MakeFeatureLayer_management(fc, feature_layer, query)  # delete records outside california
                     arcpy.DeleteFeatures_management(feature_layer)
@@ -2,10 +2,6 @@ from NaturalHazardUpdaterTool_Functions import *
 
 def runERNSHazard(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb):
 
-    def convertCoordToDec(deg, min, sec):
-        decimal_deg = float(deg) + (float(min) + (float(sec)/60.0))/60.0
-        return decimal_deg
-
     ### These variables should not change ###
     download_link = r"https://nrc.uscg.mil/FOIAFiles/Current.xlsx"
     output_sr_wkid = 3857  # WGS_1984_Web_Mercator_Auxiliary_Sphere
@@ -18,7 +14,8 @@ def runERNSHazard(workspace, chrome_driver_path, log_file_path, naturalhazards_g
     latitude_fields = ['LAT_DEG', 'LAT_MIN', 'LAT_SEC']  # lat/long fields, The quad field has errors so assuming everything is N + W
     longitude_fields = ['LONG_DEG', 'LONG_MIN', 'LONG_SEC']
 
-    subset_query = "LOCATION_STATE = 'CA'"
+    subset_filter = {'LOCATION_STATE': ['CA']}  # applied while the sheet is streamed
+    field_schema = {'LOCATION_STATE': 'category', 'LOCATION_NEAREST_CITY': 'category'}  # low-cardinality fields
 
     default_value = 'N/A'  # missing data is assigned this value
 
@@ -48,68 +45,36 @@ def runERNSHazard(workspace, chrome_driver_path, log_file_path, naturalhazards_g
         chrome_options.add_argument("--start-maximized")
         driver = webdriver.Chrome(chrome_driver_path, chrome_options=chrome_options)  # run chrome from the driver path with the new options
 
-        # go to address
-        driver.get(download_link)
-        time.sleep(30)  # allow plenty of time for the download to complete
-
-        #download the file
-        downloaded_xlsx = os.listdir(other_data_folder)[0]
-        downloaded_xlsx_path = os.path.join(other_data_folder, downloaded_xlsx)
-
-        erns_table = os.path.join(processing_gdb, "erns_table")
-        arcpy.ExcelToTable_conversion(downloaded_xlsx_path, erns_table, excel_sheet_name)
+        # go to address and wait for the download to finish
+        downloaded_xlsx_path = storeDownload("nrc_erns_current", waitForDownload(other_data_folder, lambda: driver.get(download_link)), download_link)
 
-        erns_subset_table = os.path.join(processing_gdb, "erns_subset")
-        arcpy.TableSelect_analysis(erns_table, erns_subset_table, subset_query)
+        # stream the sheet, keeping only CA rows and the columns used below
+        read_fields = address_component_fields + latitude_fields + longitude_fields + list(field_mapping.keys())
+        erns_subset = readExcelSheet(downloaded_xlsx_path, excel_sheet_name, read_fields, subset_filter, field_schema)
 
-        record_count = int(arcpy.GetCount_management(erns_subset_table).getOutput(0))
-        failed_locations = 0  # stores addresses that could not be geocoded
+        record_count = len(erns_subset)
 
         lat_field = 'LATITUDE'
         long_field = 'LONGITUDE'
-        arcpy.AddField_management(erns_subset_table, lat_field, 'DOUBLE')
-        arcpy.AddField_management(erns_subset_table, long_field, 'DOUBLE')
-
-        cursor_fields = address_component_fields + latitude_fields + longitude_fields + [lat_field, long_field]
-
-        with arcpy.da.UpdateCursor(erns_subset_table, cursor_fields) as update_cursor:
-            for row in update_cursor:
-                try:  # test if latitude is available (any strings that are numeric)
-                    lat_deg, lat_min, lat_sec = [float(row[cursor_fields.index(field)]) for field in latitude_fields]
-                    long_deg, long_min, long_sec = [float(row[cursor_fields.index(field)]) for field in longitude_fields]
-                    decimal_lat = convertCoordToDec(lat_deg, lat_min, lat_sec)
-                    decimal_long = convertCoordToDec(-long_deg, long_min, long_sec)  # !!! NOTE: THIS IS ASSUMED TO BE WEST !!!
-                except ValueError:
-                    # if lat long is not available, geocode
-                    address_complete = " ".join(
-                        [row[i] for i in [cursor_fields.index(f) for f in address_component_fields]]).strip()
-                    decimal_lat, decimal_long = forwardGeocode(address_complete)
-                    if decimal_lat is None:
-                        failed_locations += 1
-
-                row[cursor_fields.index(lat_field)] = decimal_lat
-                row[cursor_fields.index(long_field)] = decimal_long
-                update_cursor.updateRow(row)
-
-        failed_percent = round(float(failed_locations)/float(record_count), 1)
+        erns_subset[lat_field] = dmsToDecimal(*[erns_subset[f] for f in latitude_fields])
+        erns_subset[long_field] = dmsToDecimal(*[erns_subset[f] for f in longitude_fields], negative=True)  # !!! NOTE: THIS IS ASSUMED TO BE WEST !!!
+
+        # if lat long is not usable (missing, 0/0, outside CA), geocode
+        needs_geocode = rejectionReasons(erns_subset, lat_field, long_field).notna()
+        addresses = composeAddresses(erns_subset.loc[needs_geocode], address_component_fields)
+        geocoded_lat, geocoded_long = geocodeBatch(addresses, label="Geocoding ERNS incidents")
+        erns_subset.loc[needs_geocode, lat_field] = geocoded_lat
+        erns_subset.loc[needs_geocode, long_field] = geocoded_long
+
+        failed_locations = int(rejectionReasons(erns_subset, lat_field, long_field).notna().sum())  # addresses that could not be geocoded
+        failed_percent = round(float(failed_locations)/float(max(record_count, 1)), 1)
         m = "{} ({}%) Of The Records Had Invalid Location Information".format(failed_locations, failed_percent)
         writeMessages(log_file_path, m, True, "warning")
 
-        # covert to Featureclass
-        event_layer = "erns_event_layer"
-        arcpy.MakeXYEventLayer_management(erns_subset_table, long_field, lat_field, event_layer, arcpy.SpatialReference(4326))
-
-        erns_fc = os.path.join(processing_gdb, "{}_points".format(output_name))
-        arcpy.CopyFeatures_management(event_layer,erns_fc)
-
-        projected_fc = os.path.join(processing_gdb, output_name)
-        output_sr = arcpy.SpatialReference(output_sr_wkid)
-        arcpy.Project_management(erns_fc, projected_fc, output_sr)
-
         # add required fields
         required_fields = [k for k in field_mapping.keys()]
 
-        current_fields = [f.name for f in arcpy.ListFields(projected_fc)]
+        current_fields = list(erns_subset.columns)
 
         field_check, m = checkMissingFields(required_fields, current_fields)
 
@@ -121,16 +86,21 @@ def runERNSHazard(workspace, chrome_driver_path, log_file_path, naturalhazards_g
 
             missing_fields = [v for k, v in field_mapping.items() if k not in current_fields]
             for field in missing_fields:
-                arcpy.AddField_management(projected_fc, field, "TEXT", field_length=255)
-                arcpy.CalculateField_management(projected_fc, field, "'{}'".format(default_value), "PYTHON_9.3")
-
-        for field in field_mapping:
-            if field in current_fields:
-                output_field = field_mapping[field]
-                if output_field == field:
-                    pass
-                else:
-                    arcpy.AlterField_management(projected_fc, field, output_field, output_field)
+                erns_subset[field] = default_value
+
+        erns_subset = erns_subset.rename(columns={k: v for k, v in field_mapping.items() if k in current_fields})
+
+        # covert to Featureclass
+        rejects_path = os.path.join(other_data_folder, "{}_rejected.parquet".format(output_name))
+        erns_fc, missed_records = tableToPointsFrame(erns_subset, lat_field, long_field, 4326, processing_gdb, "{}_points".format(output_name),
+                                                     rejects_path=rejects_path)
+        if len(missed_records) > 0:
+            rejected_counts = missed_records[REJECT_REASON_FIELD].value_counts().to_dict()
+            writeMessages(log_file_path, rejectionSummary(rejected_counts, rejects_path), True, "warning")
+
+        projected_fc = os.path.join(processing_gdb, output_name)
+        output_sr = arcpy.SpatialReference(output_sr_wkid)
+        arcpy.Project_management(erns_fc, projected_fc, output_sr)
 
         addDTField(projected_fc)
 
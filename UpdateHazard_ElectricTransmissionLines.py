@@ -24,12 +24,7 @@ def runElectricTransmissionLines(workspace, chrome_driver_path, log_file_path, n
 
     try:
         # Get zip file
-        filedata = urllib2.urlopen(download_link)
-        the_data = filedata.read()
-
-        download_zip_path = os.path.join(other_data_folder, "WebsiteDownload.zip")
-        with open(download_zip_path, 'wb') as f:
-            f.write(the_data)
+        download_zip_path = fetchSource("cec_transmission_lines", download_link, other_data_folder, "WebsiteDownload.zip")
 
         # extract the zip file
         with ZipFile(download_zip_path, "r") as zip_reader:
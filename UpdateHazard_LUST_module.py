@@ -20,6 +20,8 @@ def runLUST(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb):
     longitude_field = 'LONGITUDE'
     address_component_fields = ['STREET_NUMBER', 'STREET_NAME', 'CITY', 'STATE', 'ZIP']
     output_address_field = 'address'
+    chunk_size = 50000  # rows converted per chunk; bounds peak memory
+    field_schema = {'STATUS': 'category', 'CITY': 'category', 'STATE': 'category'}  # low-cardinality fields
 
 
 
@@ -43,12 +45,7 @@ def runLUST(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb):
         m = "Downloading Data..."
         writeMessages(log_file_path, m, False)
 
-        filedata = urllib2.urlopen(download_link)
-        the_data = filedata.read()
-
-        download_zip_path = os.path.join(other_data_folder, "LUST_Sites.zip")
-        with open(download_zip_path, 'wb') as f:
-            f.write(the_data)
+        download_zip_path = fetchSource("geotracker_sites", download_link, other_data_folder, "LUST_Sites.zip")
 
         # extract the zip file
         with ZipFile(download_zip_path, "r") as zip_reader:
@@ -58,29 +55,25 @@ def runLUST(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb):
         download_folder_contents = os.listdir(other_data_folder)
         sites_txt_file = [os.path.join(other_data_folder, f) for f in download_folder_contents if f == file_name][0]
 
-        # Create Feature class
-        with codecs.open(sites_txt_file, 'r', encoding='cp1252', errors='replace') as file_obj:
-            reader = file_obj.readlines()
-            raw_data = [r.rstrip('\r\n').split('\t') for r in reader]
+        # Create Feature class, reading only the needed columns in chunks
+        m = "Converting To Point Featureclass..."
+        writeMessages(log_file_path, m, False)
 
-        header = [h.strip().replace(' ','_') for h in raw_data.pop(0)]
+        read_fields = required_fields + [latitude_field, longitude_field]
 
-        data = [r[:len(header)] for r in raw_data]
+        def readSites():
+            return readDelimitedTable(sites_txt_file, read_fields, sep='\t', encoding='cp1252', chunksize=chunk_size,
+                                      schema=field_schema)
 
-        m = "Converting To Point Featureclass..."
-        writeMessages(log_file_path, m, False)
+        # size the ArcPy TEXT fields to the longest value in the file, as the single-pass loader did
+        field_lengths = textFieldLengths(readSites()) if ARCPY_AVAILABLE else None
+        rejects_path = os.path.join(other_data_folder, "{}_rejected.parquet".format(output_name))
+        temp_fc, rejected_counts, rejects_path = tableToPointsStream(readSites(), latitude_field, longitude_field,
+                                                                     input_sr_wkid, processing_gdb, "{}_temp".format(output_name),
+                                                                     rejects_path=rejects_path, field_lengths=field_lengths)
 
-        temp_fc, missed_records = tableToPoints(header, data, latitude_field, longitude_field, input_sr_wkid, processing_gdb, "{}_temp".format(output_name))
-
-        if len(missed_records) > 0:
-            m = "Warning, {} records could not be processed due to unknow error:\n".format(len(missed_records))
-            for missed_record_i, missed_record in enumerate(missed_records):
-                if missed_record_i < 20:
-                    m += "\t{}\n".format(missed_record)
-                else:
-                    m += "\t..."
-                    break
-            writeMessages(log_file_path, m, False)
+        if rejected_counts:
+            writeMessages(log_file_path, rejectionSummary(rejected_counts, rejects_path), False)
 
         # check fields
         current_fields = [f.name for f in arcpy.ListFields(temp_fc)]
@@ -19,7 +19,7 @@ def runRailroads(workspace, chrome_driver_path, log_file_path, naturalhazards_gd
 
     Open-source mode (no ArcPy):
       - Requires `layer_url` (REST URL to the railroad layer)
-      - Downloads features via esridump -> GeoPandas, maps names, writes to GeoPackage (.gpkg)
+      - Downloads features via extractGeoJson -> GeoPandas, maps names, writes to GeoPackage (.gpkg)
       - If `naturalhazards_gdb` ends with .gdb, writes a sibling .gpkg instead
 
     Returns:
@@ -147,7 +147,7 @@ def runRailroads(workspace, chrome_driver_path, log_file_path, naturalhazards_gd
             )
             return None
 
-        # download layer to gpkg via esridump
+        # download layer to gpkg via extractGeoJson
         writeMessages(log_file_path, "Downloading railroad layer via REST...", False)
         gpkg_path = extractGeoJson(layer_url, output_name, gis_data_folder, sr_wkid=output_sr_wkid)
         if not gpkg_path:
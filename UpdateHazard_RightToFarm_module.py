@@ -72,6 +72,9 @@ def runFarmland(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb
     # Counties where "Cl" (Confined Animal Agriculture) counts as farmland (IN)
     confined_animal_agriculture_counties = ['fre', 'kin', 'pla', 'riv', 'sac', 'sjq', 'srv', 'tul']
 
+    zone_rules = ZoneRules(land_type_field, land_type_flags, default="OUT")
+    zone_rules.override("Cl", county_name_field, confined_animal_agriculture_counties, "IN")
+
     today = datetime.datetime.now()
     today_string = today.strftime("%Y%m%d_%H%M")
 
@@ -114,13 +117,18 @@ def runFarmland(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb
         m = "Downloading {} Files...".format(download_count)
         writeMessages(log_file_path, m, False)
 
-        # Click each "download" and wait for completion using the helper
-        i = 1
-        for download in downloads:
-            m = "\nFile {}/{}".format(i, download_count)
-            writeMessages(log_file_path, m, False)
-            clickToDownloadFile(download, other_data_folder)  # blocks until size stabilizes
-            i += 1
+        # Click each "download" and wait for the file that click produced
+        with DownloadWatcher(other_data_folder) as download_watcher:
+            i = 1
+            for download in downloads:
+                m = "\nFile {}/{}".format(i, download_count)
+                writeMessages(log_file_path, m, False)
+                try:
+                    zip_path = clickToDownloadFile(download, other_data_folder, watcher=download_watcher)
+                    storeDownload("fmmp_{}".format(os.path.splitext(os.path.basename(zip_path))[0]), zip_path)
+                except TimeoutError as e:
+                    writeMessages(log_file_path, str(e), msg_type='warning')
+                i += 1
 
         m = "\n{} Files Successfully Downloaded".format(download_count)
         writeMessages(log_file_path, m, False)
@@ -205,27 +213,26 @@ def runFarmland(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb
 
             addDTField(projected_fc)  # uses ArcPy path
 
-            unknown_land_types = []
-
-            cursor_fields = [land_type_field, county_name_field, zone_field]
-            with arcpy.da.UpdateCursor(projected_fc, cursor_fields) as update_cursor:  # type: ignore
-                for row in update_cursor:
-                    land_type = row[0]
-                    county_val = row[1]
-                    if land_type in land_type_flags:
-                        if land_type == 'Cl' and (county_val and str(county_val).strip().lower() in confined_animal_agriculture_counties):
-                            zone = 'IN'
-                        else:
-                            zone = land_type_flags[land_type]
-                    else:
-                        if land_type not in unknown_land_types:
-                            unknown_land_types.append(land_type)
-                        zone = 'OUT'
-                    update_cursor.updateRow((land_type, county_val, zone))
+            # read the rule inputs once, classify in bulk, write ZONE back by OID
+            rule_fields = zone_rules.fields
+            rule_columns = {f: [] for f in rule_fields}
+            oids = []
+            with arcpy.da.SearchCursor(projected_fc, ["OID@"] + rule_fields) as search_cursor:  # type: ignore
+                for row in search_cursor:
+                    oids.append(row[0])
+                    for f, v in zip(rule_fields, row[1:]):
+                        rule_columns[f].append(v)
+
+            zones, unknown_land_types = zone_rules.apply(rule_columns)
+            zone_by_oid = dict(zip(oids, zones))
+
+            with arcpy.da.UpdateCursor(projected_fc, ["OID@", zone_field]) as update_cursor:  # type: ignore
+                for oid, _ in update_cursor:
+                    update_cursor.updateRow((oid, zone_by_oid[oid]))
 
             if len(unknown_land_types) > 0:
                 m = ("The following landcover codes were not defined: ({}). "
-                     "They were defaulted to 'OUT'").format(unknown_land_types)
+                     "They were defaulted to 'OUT'").format(sorted(unknown_land_types))
                 writeMessages(log_file_path, m, msg_type='warning')
 
             # write to natural hazards gdb (.gdb expected)
@@ -241,63 +248,34 @@ def runFarmland(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb
         gp, sh, pj, io_driver = _lazy_import_gis()
         import pandas as pd
 
-        gdfs = []
-        for county_key, info in shapefile_dict.items():
-            year = info['year']; shp_path = info['file']
-            writeMessages(log_file_path, f"\t{county_key} ({year})", False)
-            gdf = gp.read_file(shp_path)
-            gdf["__src_year"] = year
+        county_items = list(shapefile_dict.items())
+        for county_key, info in county_items:
+            writeMessages(log_file_path, f"\t{county_key} ({info['year']})", False)
+
+        def _stamp_county(i, gdf):
+            county_key, info = county_items[i]
+            gdf["__src_year"] = info['year']
             gdf["__county_key"] = county_key
-            gdfs.append(gdf)
+            return gdf
+
+        # Read + project each county on the worker pool (EPSG:3857); a lot of FMMP
+        # data is EPSG:3310 or 4326 - if a shapefile has no CRS, assume 4326.
+        # No Arrow here: keep the dtypes the plain gp.read_file() read produced
+        gdfs = readFramesParallel([info['file'] for _, info in county_items], to_epsg=int(output_sr_wkid),
+                                  assume_epsg=4326, prepare=_stamp_county, use_arrow=False)
 
         if not gdfs:
             driver.quit()
             writeMessages(log_file_path, "No shapefiles found to process.", msg_type="warning")
             return None
 
-        merged_gdf = pd.concat(gdfs, ignore_index=True)
-
-        # Project to target CRS (EPSG:3857)
-        if merged_gdf.crs is None:
-            # best-effort: a lot of FMMP data is EPSG:3310 or 4326; if unknown, assume 4326
-            merged_gdf.set_crs("EPSG:4326", inplace=True)
-        proj_gdf = merged_gdf.to_crs(epsg=int(output_sr_wkid))
+        proj_gdf = pd.concat(gdfs, ignore_index=True)
 
-        # Add zone + timestamp
-        proj_gdf[zone_field] = "OUT"
+        # Add zone (rules evaluated over whole columns) + timestamp
+        proj_gdf[zone_field], unknown_land_types = zone_rules.apply(proj_gdf)
         stamp = today
         proj_gdf["last_updated"] = stamp
 
-        # Compute zone using rules
-        lt = proj_gdf.get(land_type_field)
-        cn = proj_gdf.get(county_name_field)
-
-        # normalize helper
-        def _norm(x):
-            return str(x).strip().lower() if x is not None else ""
-
-        unknown_land_types = set()
-
-        def _zone_for_row(land_type_val, county_val):
-            lt_code = str(land_type_val) if land_type_val is not None else ""
-            if lt_code in land_type_flags:
-                if lt_code == "Cl":
-                    # use county name/code as provided; normalize to lowercase
-                    if _norm(county_val) in confined_animal_agriculture_counties:
-                        return "IN"
-                    return land_type_flags[lt_code]  # OUT
-                return land_type_flags[lt_code]
-            else:
-                if lt_code != "":
-                    unknown_land_types.add(lt_code)
-                return "OUT"
-
-        proj_gdf[zone_field] = [
-            _zone_for_row(lt.iloc[i] if lt is not None else None,
-                          cn.iloc[i] if cn is not None else None)
-            for i in range(len(proj_gdf))
-        ]
-
         if unknown_land_types:
             writeMessages(
                 log_file_path,
@@ -6,6 +6,9 @@ def runSRA(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb, jur
     https://osfm.fire.ca.gov/what-we-do/community-wildfire-preparedness-and-mitigation/fire-hazard-severity-zones
 
     Click "SRA FHSZ Data Effective April 1, 2024" (https://34c031f8-c9fd-4018-8c5a-4159cdff6b0d-cdn-endpoint.azureedge.net/-/media/osfm-website/what-we-do/community-wildfire-preparedness-and-mitigation/fire-hazard-severity-zones/fhszsra233gdb.zip?rev=2d584712566846bbbf87b169585b4705&hash=6BEC25A31025690E411872D44DBCA8F6)
+
+    Without ArcPy the intersect + dissolve runs through overlayDissolve (STRtree
+    candidate pairs, partitioned by county) and a GeoPackage layer is written.
     """
     sra_url = r'https://osfm.fire.ca.gov/what-we-do/community-wildfire-preparedness-and-mitigation/fire-hazard-severity-zones'
     input_sr_wkid = 4326  # WGS84
@@ -14,6 +17,7 @@ def runSRA(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb, jur
     jurisdiction_fields = ["CITY_Spatial", "COUNTY_Spatial"]
     output_name = "State_Responsibility_Area_Fire"
     hazard_nickname = "State Responsibility Area"
+    processing_version = 1  # bump when the processing below changes, so cached outputs are not reused
 
 
     # Used to convert the input fields to the current version of the table. If the fields are the same, not mapping is performed
@@ -21,7 +25,8 @@ def runSRA(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb, jur
         "FHSZ_Description": "HAZ_CLASS"
     }
 
-    arcpy.env.overwriteOutput = True
+    if ARCPY_AVAILABLE:
+        arcpy.env.overwriteOutput = True
 
     today = datetime.datetime.now()
     today_string = today.strftime("%Y%m%d_%H%M")
@@ -53,10 +58,17 @@ def runSRA(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb, jur
         actions.move_to_element(download_element).perform()
         time.sleep(1)
 
-        clickToDownloadFile(download_element, other_data_folder)
+        sra_zip_path = storeDownload("calfire_sra_fhsz", clickToDownloadFile(download_element, other_data_folder), sra_url)
 
-        sra_zip = os.listdir(other_data_folder)[0]
-        sra_zip_path = os.path.join(other_data_folder, sra_zip)
+        # skip the intersect + dissolve when the SRA zip and jurisdictions match a previous run
+        run_fingerprint = moduleFingerprint(output_name, [sra_zip_path, jurisdictions_fc],
+                                            {"version": processing_version, "output_sr_wkid": output_sr_wkid,
+                                             "field_mappings": field_mappings, "jurisdiction_fields": jurisdiction_fields})
+        cached_layer = restoreCachedOutput(output_name, run_fingerprint, output_name, naturalhazards_gdb)
+        if cached_layer:
+            writeMessages(log_file_path, "Input unchanged since a previous run, reusing cached output\n\tSUCCESS\n")
+            driver.close()
+            return cached_layer
 
         with ZipFile(sra_zip_path, "r") as zip_reader:
             zip_reader.extractall(other_data_folder)
@@ -74,7 +86,7 @@ def runSRA(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb, jur
             driver.close()
             return None
 
-        else:
+        elif ARCPY_AVAILABLE:
             arcpy.env.workspace = sra_gdb
             arcpy.env.overwriteOutput = True
             sra_features = arcpy.ListFeatureClasses()[0]
@@ -109,11 +121,38 @@ def runSRA(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb, jur
 
             final_natural_hazard_layer = os.path.join(naturalhazards_gdb, output_name)
             arcpy.CopyFeatures_management(final_output, final_natural_hazard_layer)
+            cacheModuleOutput(output_name, run_fingerprint, final_natural_hazard_layer, output_name)
 
             m = "\tSUCCESS\n"
             writeMessages(log_file_path, m)
             driver.close()
             return final_natural_hazard_layer
+
+        # --------- Open-source mode ----------
+        writeMessages(log_file_path, "Projecting Data...", False)
+        sra_gdf = readFrame(sra_gdb, to_epsg=output_sr_wkid, assume_epsg=input_sr_wkid)
+        sra_gdf = sra_gdf.rename(columns=field_mappings)
+        sra_gdf[zone_field] = "IN"
+
+        # SRA attributes to preserve (the FileGDB's own Shape_Length/Shape_Area are not dissolved on)
+        sra_fields = [f for f in sra_gdf.columns
+                      if f != sra_gdf.geometry.name and f.lower() not in ("shape_length", "shape_area")]
+
+        jurisdictions_gdf = getReferenceData(jurisdictions_fc).jurisdictions(output_sr_wkid)
+
+        writeMessages(log_file_path, "Intersecting With Jurisdictions...", False)
+        final_gdf = overlayDissolve(sra_gdf[sra_fields + [sra_gdf.geometry.name]], jurisdictions_gdf,
+                                    jurisdiction_fields, sra_fields + jurisdiction_fields,
+                                    partition_field="COUNTY_Spatial")
+        final_gdf["last_updated"] = today
+
+        final_natural_hazard_layer = writeHazardGeoPackage(final_gdf, final_gdb, naturalhazards_gdb, output_name,
+                                                           today_string, log_file_path)
+        cacheModuleOutput(output_name, run_fingerprint, final_natural_hazard_layer, output_name)
+
+        writeMessages(log_file_path, "\tSUCCESS\n")
+        driver.close()
+        return final_natural_hazard_layer
     except:
         m = "\t!!! ERROR !!!\n\tSomething Went Wrong"
         writeMessages(log_file_path, m, msg_type='warning')
@@ -26,6 +26,13 @@ def runSolidWasteFacilities(workspace, chrome_driver_path, log_file_path, natura
         'OPERATOR': 'N/A'
     }
 
+    field_schema = {  # compact dtypes for the low-cardinality fields
+        'Site_Operational_Status': 'category',
+        'City': 'category',
+        'State': 'category',
+        'PLACENAME': 'category',
+    }
+
     latitude_field = 'Latitude'
     longitude_field = 'Longitude'
 
@@ -69,44 +76,12 @@ def runSolidWasteFacilities(workspace, chrome_driver_path, log_file_path, natura
         # download the file
         download_button_xpath = '//*[@id="DownloadButton"]'
         download_button = driver.find_element_by_xpath(download_button_xpath)
-        download_button.click()
+        downloaded_csv_path = storeDownload("calrecycle_swis", clickToDownloadFile(download_button, other_data_folder), web_address)
 
-        # download the file
-        time.sleep(3)
-        waiting = True
-        downloaded_files = os.listdir(other_data_folder)
-        downloaded_file_count = len(downloaded_files)
-        while waiting:
-            time.sleep(0.1)
-            downloaded_file_count = len(os.listdir(other_data_folder))
-            if downloaded_file_count > 0:
-                waiting = False
-
-        downloaded_csv = os.listdir(other_data_folder)[0]
-        downloaded_csv_path = os.path.join(other_data_folder, downloaded_csv)
-
-        with open(downloaded_csv_path, "r") as file_obj:
-            reader = file_obj.readlines()
-            raw_data = [r.replace('\x00', '').rstrip(',\r\n') for r in reader]
-
-        original_header = raw_data.pop(0).split(',')
-        header = [h.strip().replace(' ', '_') for h in original_header]
-        data = [r.lstrip('"').rstrip('",').split('","') for r in raw_data]
-
-        m = "Converting To Point Featureclass..."
-        writeMessages(log_file_path, m, False)
-
-        temp_fc, missed_records = tableToPoints(header, data, latitude_field, longitude_field, input_sr_wkid, processing_gdb, "{}_temp".format(output_name))
-
-        if len(missed_records) > 0:
-            m = "Warning, {} records could not be processed due to unknow error:\n".format(len(missed_records))
-            for missed_record_i, missed_record in enumerate(missed_records):
-                if missed_record_i < 20:
-                    m += "\t{}\n".format(missed_record)
-                else:
-                    m += "\t..."
-                    break
-            writeMessages(log_file_path, m, msg_type='warning')
+        # NUL bytes are dropped while decoding; quoting (embedded commas/quotes) is handled by the CSV parser
+        table = readDelimitedTable(downloaded_csv_path, sep=',', encoding='utf-8', quoted=True, strip_nul=True,
+                                   numeric=[latitude_field, longitude_field])
+        header = list(table.columns)
 
         #Sitename field
         sitename_field_mapping_errors = False
@@ -117,9 +92,7 @@ def runSolidWasteFacilities(workspace, chrome_driver_path, log_file_path, natura
                 writeMessages(log_file_path, m, msg_type='warning')
 
         if not sitename_field_mapping_errors:
-            expression = "!{}! + '- (' + !{}! +')'".format(sitename_input_fields[0], sitename_input_fields[1])
-            arcpy.AddField_management(temp_fc, sitename_output_field, "TEXT", field_length=255)
-            arcpy.CalculateField_management(temp_fc, sitename_output_field, expression, "PYTHON_9.3")
+            table[sitename_output_field] = table[sitename_input_fields[0]] + '- (' + table[sitename_input_fields[1]] + ')'
 
         #location/address field
         location_field_mapping_errors = False
@@ -130,9 +103,8 @@ def runSolidWasteFacilities(workspace, chrome_driver_path, log_file_path, natura
                 writeMessages(log_file_path, m, msg_type='warning')
 
         if not location_field_mapping_errors:
-            expression = "!" + "! + ' ' + !".join(location_input_fields) + "!.strip().replace('  ',' ')"
-            arcpy.AddField_management(temp_fc, location_output_field, "TEXT", field_length=255)
-            arcpy.CalculateField_management(temp_fc, location_output_field, expression, "PYTHON_9.3")
+            location = table[location_input_fields[0]].str.cat(table[location_input_fields[1:]], sep=' ')
+            table[location_output_field] = location.str.replace(r'\s{2,}', ' ', regex=True).str.strip()
 
         # mapped fields
         field_mapping_errors = False
@@ -143,18 +115,26 @@ def runSolidWasteFacilities(workspace, chrome_driver_path, log_file_path, natura
                 writeMessages(log_file_path, m, msg_type='warning')
 
         if not field_mapping_errors:
-            for input_field, output_field in field_mappings.items():
-                arcpy.AlterField_management(temp_fc, input_field, output_field, output_field)
+            table = table.rename(columns=field_mappings)
 
         if not any([sitename_field_mapping_errors, location_field_mapping_errors, field_mapping_errors]):
             m = "All Fields Mapping Successfully"
             writeMessages(log_file_path, m, False)
 
             # add any missing fields
-            if len(missing_fields) > 0:
-                for field, value in missing_fields.items():
-                    arcpy.AddField_management(temp_fc, field, "TEXT", field_length=len(value))
-                    arcpy.CalculateField_management(temp_fc, field, "'{}'".format(value), "PYTHON_9.3")
+            for field, value in missing_fields.items():
+                table[field] = value
+
+            m = "Converting To Point Featureclass..."
+            writeMessages(log_file_path, m, False)
+
+            rejects_path = os.path.join(other_data_folder, "{}_rejected.parquet".format(output_name))
+            temp_fc, missed_records = tableToPointsFrame(table, latitude_field, longitude_field, input_sr_wkid, processing_gdb, "{}_temp".format(output_name),
+                                                         schema=field_schema, rejects_path=rejects_path)
+
+            if len(missed_records) > 0:
+                rejected_counts = missed_records[REJECT_REASON_FIELD].value_counts().to_dict()
+                writeMessages(log_file_path, rejectionSummary(rejected_counts, rejects_path), msg_type='warning')
 
             # project data
             m = "Projecting..."
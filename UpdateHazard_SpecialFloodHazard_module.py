@@ -7,6 +7,7 @@ def runFlood(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb, f
     output_sr_wkid = 3857  # WGS_1984_Web_Mercator_Auxiliary_Sphere
     hazard_nickname = "Special Flood Hazard Layer"
     output_name = "CA_Flood"
+    processing_version = 1  # bump when the processing below changes, so cached outputs are not reused
 
     arcpy.env.overwriteOutput = True
 
@@ -23,6 +24,15 @@ def runFlood(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb, f
     writeMessages(log_file_path, "### {} UPDATE ###\n".format(hazard_nickname.upper()))
 
     try:
+        # skip the (very expensive) NFHL projection when the zip matches a previous run
+        run_fingerprint = moduleFingerprint(output_name, [flood_zip_file_path],
+                                            {"version": processing_version, "output_sr_wkid": output_sr_wkid,
+                                             "flood_fc_name": "S_FLD_HAZ_AR"})
+        cached_layer = restoreCachedOutput(output_name, run_fingerprint, output_name, naturalhazards_gdb)
+        if cached_layer:
+            writeMessages(log_file_path, "Input unchanged since a previous run, reusing cached output\n\tSUCCESS\n")
+            return cached_layer
+
         with ZipFile(flood_zip_file_path, "r") as zip_reader:
             zip_reader.extractall(gis_data_folder)
 
@@ -68,6 +78,7 @@ def runFlood(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb, f
 
             final_natural_hazard_layer = os.path.join(naturalhazards_gdb, output_name)
             arcpy.CopyFeatures_management(final_flood_fc, final_natural_hazard_layer)
+            cacheModuleOutput(output_name, run_fingerprint, final_natural_hazard_layer, output_name)
             m = "\tSUCCESS\n"
             writeMessages(log_file_path, m)
 
@@ -24,6 +24,8 @@ def runStatePriorityList(workspace, chrome_driver_path, log_file_path, naturalha
         "STATUS": "Status"
     }
 
+    field_schema = {'Site_Type': 'category', 'Status': 'category'}  # low-cardinality fields
+
     arcpy.env.overwriteOutput = True
 
     today = datetime.datetime.now()
@@ -38,55 +40,22 @@ def runStatePriorityList(workspace, chrome_driver_path, log_file_path, naturalha
     try:
 
 
-        # create csv
-        table_csv_name = "SPL_Table"
-        table_csv = os.path.join(other_data_folder, table_csv_name + ".csv")
-
-        m = "Converted Excel File to CSV..."
-        writeMessages(log_file_path, m, False)
-
-        # Read in the Excel Data (it's actually Tab delineated with the wrong extension)
-        with open(spl_excel_file) as excel_obj:
-            data = csv.reader(excel_obj)
-            spl_data = [d[0].split('\t') for d in data]
-            header = spl_data[0]
-            # replace the header with the expected fields
-            for i, field_name in enumerate(header):
-                if field_name in field_mappings:
-                    header[i] = field_mappings[field_name]
-            spl_data[0] = header
-
-
-            #write each row to a csv so it can be converted
-            with open(table_csv, 'wb') as f:   # open('a_file.csv', 'w', newline="") for python 3
-                c = csv.writer(f)
-                for row in spl_data:
-                    row_vals_encoded = [unicode(r).encode("utf-8") for r in row]
-                    c.writerow(row_vals_encoded)
-
-        # convert to FGDB table
-        spl_temp_table = os.path.join(processing_gdb, table_csv_name)
-        arcpy.TableToTable_conversion(table_csv, processing_gdb, table_csv_name)
-
-        # convert to features
-        m = "Creating XY Features..."
+        m = "Reading Export and Creating Projected XY Features..."
         writeMessages(log_file_path, m, False)
 
-        input_sr = arcpy.SpatialReference(input_sr_wkid)  # WGS84
-        output_sr = arcpy.SpatialReference(output_sr_wkid)  # WGS_1984_Web_Mercator_Auxiliary_Sphere
-
-        layer_view = "layer_view"
-        arcpy.MakeXYEventLayer_management(spl_temp_table, long_field, lat_field, layer_view, input_sr)
-        spl_feature_name = "{}_wkid{}".format(output_name, input_sr_wkid)
-        spl_features = os.path.join(processing_gdb, spl_feature_name)
-        arcpy.CopyFeatures_management(layer_view, spl_features)
+        # Read the Excel export directly (it's actually Tab delineated with the wrong extension)
+        spl_table = readDelimitedTable(spl_excel_file, sep='\t', encoding='cp1252', numeric=[lat_field, long_field])
 
-        # project data
-        m = "Projecting Data..."
-        writeMessages(log_file_path, m, False)
+        # replace the header with the expected fields
+        spl_table = spl_table.rename(columns={normalizeFieldName(k): v for k, v in field_mappings.items()})
 
-        final_output = os.path.join(final_gdb, output_name)
-        arcpy.Project_management(spl_features, final_output, output_sr)
+        # build the points reprojected in memory and write the final layer once
+        rejects_path = os.path.join(other_data_folder, "{}_rejected.parquet".format(output_name))
+        final_output, missed_records = tableToPointsFrame(spl_table, lat_field, long_field, input_sr_wkid, final_gdb, output_name,
+                                                          out_sr_wkid=output_sr_wkid, schema=field_schema, rejects_path=rejects_path)
+        if len(missed_records) > 0:
+            rejected_counts = missed_records[REJECT_REASON_FIELD].value_counts().to_dict()
+            writeMessages(log_file_path, rejectionSummary(rejected_counts, rejects_path), msg_type='warning')
 
         #add the last_update field
         addDTField(final_output)
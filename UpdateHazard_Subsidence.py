@@ -12,7 +12,7 @@ and the processing template (properties) are set to 'None' export to NAD 1983 Ca
 
 from NaturalHazardUpdaterTool_Functions import *
 
-def runSubsidence(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb, input_tif):
+def runSubsidence(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb, input_tif, bin_width_ft=None, class_breaks_ft=None):
     ### These variables should not change ###
     # get the map document that contains links to the feature services
     script_path = os.path.dirname(os.path.abspath(__file__))
@@ -21,16 +21,23 @@ def runSubsidence(workspace, chrome_driver_path, log_file_path, naturalhazards_g
     output_name = "SubsidenceAreas"  # the name of the dataset in out database
     hazard_nickname = "Subsidence"
 
-    # Used for setting NA/no data features
+    # Used for setting NA/no data features with ArcPy (the open-source path uses getReferenceData())
     ca_polygon = r'C:\workspace\__BaseData\Corrected_Jurisdictions.gdb\CA_Jurisdictions'
     no_data_value = -999
 
     input_sr_wkid = 3310  # NAD 1983 California (Teale) Albers (Meters)
     output_sr_wkid = 3857  # WGS 1984 Web Mercator (auxiliary sphere)
 
+    # Optional displacement classes (feet): a bin width or a list of class breaks.
+    # Without either, every distinct centimeter value becomes its own polygon.
+    quantizer = None
+    if bin_width_ft is not None or class_breaks_ft is not None:
+        quantizer = Quantizer(bin_width=bin_width_ft, breaks=class_breaks_ft)
+
     root_services_url = r'https://gis.water.ca.gov/arcgisimg/rest/services/SAR'
 
-    arcpy.env.overwriteOutput = True
+    if ARCPY_AVAILABLE:
+        arcpy.env.overwriteOutput = True
 
     today = datetime.datetime.now()
     today_string = today.strftime("%Y%m%d_%H%M")
@@ -80,6 +87,38 @@ def runSubsidence(workspace, chrome_driver_path, log_file_path, naturalhazards_g
         
         """
 
+        numeric_field = "VerticalDisplacement"
+        desc_field = "VerticalDisplacement_Desc"
+        zone_field = "Zone"
+        zone_rules = ZoneRules(default="IN")
+
+        if not ARCPY_AVAILABLE:
+            # --------- Open-source mode ----------
+            # windowed read + polygonize (x100, truncated to int, like the ArcPy steps below; or class codes)
+            subsidence_gdf = rasterToPolygons(input_tif, scale=1 if quantizer else 100, nodata=no_data_value,
+                                              assume_epsg=input_sr_wkid, quantizer=quantizer)
+            if quantizer:
+                subsidence_gdf[numeric_field] = quantizer.midpoint(subsidence_gdf["gridcode"])
+                subsidence_gdf[desc_field] = quantizer.describe(subsidence_gdf["gridcode"], "Feet")
+            else:
+                subsidence_gdf[numeric_field] = subsidence_gdf["gridcode"] / 100.0
+                subsidence_gdf[desc_field] = subsidence_gdf[numeric_field].round(2).astype(str) + " Feet"
+            subsidence_gdf[zone_field], _ = zone_rules.apply(subsidence_gdf)
+
+            # No data feature: CA with the subsidence areas removed, as single parts
+            import pandas as pd
+            ca_erase_gdf = getReferenceData().erase(subsidence_gdf, epsg=input_sr_wkid)
+            ca_erase_gdf = ca_erase_gdf[[ca_erase_gdf.geometry.name]].explode(index_parts=False)
+            ca_erase_gdf[zone_field] = "NA"  # only geometry + Zone; jurisdiction attributes don't belong in the output
+
+            subsidence_gdf = pd.concat([subsidence_gdf, ca_erase_gdf], ignore_index=True)
+            subsidence_gdf["last_updated"] = today
+
+            final_natural_hazard_layer = writeHazardGeoPackage(subsidence_gdf.to_crs(epsg=output_sr_wkid), final_gdb,
+                                                               naturalhazards_gdb, output_name, today_string, log_file_path)
+            writeMessages(log_file_path, "\tSUCCESS\n")
+            return final_natural_hazard_layer
+
         # Get input Raster properties
         input_raster = arcpy.Raster(input_tif)
         lowerLeft = arcpy.Point(input_raster.extent.XMin,input_raster.extent.YMin)
@@ -88,11 +127,17 @@ def runSubsidence(workspace, chrome_driver_path, log_file_path, naturalhazards_g
         # Convert Raster to numpy array
         np_array = arcpy.RasterToNumPyArray(input_raster, nodata_to_value=no_data_value)
 
-        # multiply by 100
-        new_array = np_array * 100
+        if quantizer:
+            # class codes in one vectorized step; keep NoData cells as NoData
+            new_array = np_array
+            int_array = quantizer.codes(np_array)
+            int_array[np_array == no_data_value] = no_data_value * 100
+        else:
+            # multiply by 100
+            new_array = np_array * 100
 
-        # convert to int
-        int_array = new_array.astype(int)
+            # convert to int
+            int_array = new_array.astype(int)
 
         #Convert Array to raster (keep the origin and cellsize the same as the input)
         new_raster = arcpy.NumPyArrayToRaster(int_array, lowerLeft, cellSize, value_to_nodata=no_data_value*100)
@@ -106,23 +151,26 @@ def runSubsidence(workspace, chrome_driver_path, log_file_path, naturalhazards_g
 
         arcpy.DefineProjection_management(subsidence_fc, arcpy.SpatialReference(input_sr_wkid))
 
-        numeric_field = "VerticalDisplacement"
-        desc_field = "VerticalDisplacement_Desc"
-        zone_field = "Zone"
-
         arcpy.AddField_management(subsidence_fc, numeric_field, "DOUBLE")
         arcpy.AddField_management(subsidence_fc, desc_field, "TEXT", field_length=50)
         arcpy.AddField_management(subsidence_fc, zone_field, "TEXT", field_length=10)
 
         cursor_fields = ["gridcode", numeric_field, desc_field, zone_field]
 
+        with arcpy.da.SearchCursor(subsidence_fc, ["gridcode"]) as search_cursor:
+            gridcodes = [row[0] for row in search_cursor]
+        zones, _ = zone_rules.apply({"gridcode": gridcodes})
+        if quantizer:
+            numeric_values = quantizer.midpoint(gridcodes)
+            displacement_texts = quantizer.describe(gridcodes, "Feet")
+        else:
+            numeric_values = [float(v) / 100.0 for v in gridcodes]
+            displacement_texts = ["{} Feet".format(str(round(v, 2))) for v in numeric_values]
+
         with arcpy.da.UpdateCursor(subsidence_fc, cursor_fields) as update_cursor:
-            for row in update_cursor:
+            for row, numeric_value, displacement_text, zone in zip(update_cursor, numeric_values, displacement_texts, zones):
                 raw_value = row[0]
-                numeric_value = float(raw_value) / 100.0
-                displacement_text = "{} Feet".format(str(round(numeric_value, 2)))
-                zone = 'IN'
-                updated_record = [raw_value, numeric_value, displacement_text, zone]
+                updated_record = [raw_value, float(numeric_value), displacement_text, zone]
                 update_cursor.updateRow(updated_record)
 
         #create No data feature with subsidence areas removed
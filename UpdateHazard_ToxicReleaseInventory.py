@@ -74,15 +74,7 @@ def runTRI(workspace, chrome_driver_path, log_file_path, naturalhazards_gdb):
         m = "Downloading latest EPA Hazards Geodatabase..."
         writeMessages(log_file_path, m, False)
 
-        filedata = urllib2.urlopen(download_link)
-        the_data = filedata.read()
-
-        m = "Done. Creating Zip File File..."
-        writeMessages(log_file_path, m, False)
-
-        download_zip_path = os.path.join(other_data_folder, "epa_hazard_gdb.zip")
-        with open(download_zip_path, 'wb') as f:
-            f.write(the_data)
+        download_zip_path = fetchSource("epa_frs_interests", download_link, other_data_folder, "epa_hazard_gdb.zip")
 
         m = "Done. Unzipping..."
         writeMessages(log_file_path, m, False)
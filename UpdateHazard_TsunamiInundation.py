@@ -38,12 +38,9 @@ def runTsunamiInundaiton(workspace, chrome_driver_path, log_file_path, naturalha
         driver = webdriver.Chrome(chrome_driver_path,
                                   chrome_options=chrome_options)  # run chrome from the driver path with the new options
 
-        # go to address
-        driver.get(download_link)
-        time.sleep(30)  # allow plenty of time for the download to complete
-
-        downloaded_zip = os.listdir(other_data_folder)[0]
-        downloaded_zip_path = os.path.join(other_data_folder, downloaded_zip)
+        # go to address and wait for the download to finish
+        downloaded_zip_path = storeDownload("tsunami_inundation", waitForDownload(other_data_folder, lambda: driver.get(download_link)), download_link)
+        downloaded_zip = os.path.basename(downloaded_zip_path)
 
         # extract the zip file
         with ZipFile(downloaded_zip_path, "r") as zip_reader:
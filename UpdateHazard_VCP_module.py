@@ -39,13 +39,8 @@ def runVCPHazard(workspace, chrome_driver_path, log_file_path, naturalhazards_gd
         driver = webdriver.Chrome(chrome_driver_path,
                                   chrome_options=chrome_options)  # run chrome from the driver path with the new options
 
-        # go to address
-        driver.get(download_link)
-        time.sleep(30)  # allow plenty of time for the download to complete
-
-        #download the file
-        downloaded_kmz = os.listdir(other_data_folder)[0]
-        downloaded_kmz_path = os.path.join(other_data_folder, downloaded_kmz)
+        # go to address and wait for the download to finish
+        downloaded_kmz_path = storeDownload("dtsc_vcp", waitForDownload(other_data_folder, lambda: driver.get(download_link)), download_link)
 
         vcp_gdb_name = "VCP_data"
         vcp_gdb_path = os.path.join(gis_data_folder, vcp_gdb_name + ".gdb")
@@ -0,0 +1,147 @@
+import os
+import hashlib
+
+import pytest
+
+import NaturalHazardUpdaterTool_DataStore as datastore
+from NaturalHazardUpdaterTool_DataStore import RawDataStore, hashFile
+
+
+class _FakeEngine:
+    """Stands in for the fetch engine: serves `body`, or 304 when asked conditionally and `not_modified` is set."""
+
+    def __init__(self, body=b"v1", etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.not_modified = False
+        self.requests = []
+
+    def download(self, url, dest_path, headers=None, ok_statuses=(304,)):
+        self.requests.append(dict(headers or {}))
+        if self.not_modified and headers and headers.get("If-None-Match") == self.etag:
+            return 304, {}, None
+        with open(dest_path, "wb") as f:
+            f.write(self.body)
+        return 200, {"ETag": self.etag}, hashlib.sha256(self.body).hexdigest()
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    fake = _FakeEngine()
+    monkeypatch.setattr(datastore, "getFetchEngine", lambda: fake)
+    return fake
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+def test_ingest_deduplicates_identical_files(tmp_path):
+    store = RawDataStore(str(tmp_path / "store"))
+    a = _write(tmp_path / "a.zip", b"same")
+    b = _write(tmp_path / "b.zip", b"same")
+    assert store.ingest("src", a) == store.ingest("src", b) == hashFile(a)
+    assert len(store.history("src")) == 1
+    assert os.path.exists(store.objectPath(hashFile(a)))
+    assert open(a, "rb").read() == b"same"  # replaced in place by a link to the stored object
+
+
+def test_fetch_reuses_stored_object_on_304(tmp_path, engine):
+    store = RawDataStore(str(tmp_path / "store"))
+    first = store.fetch("src", "http://example.test/data.zip", str(tmp_path / "run1"))
+    engine.not_modified = True
+    second = store.fetch("src", "http://example.test/data.zip", str(tmp_path / "run2"))
+
+    assert engine.requests[1] == {"If-None-Match": '"v1"'}
+    assert os.path.basename(second) == "data.zip"
+    assert open(first, "rb").read() == open(second, "rb").read() == b"v1"
+    assert len(store.history("src")) == 1
+
+
+def test_prune_keeps_newest_versions_and_drops_unreferenced_objects(tmp_path, engine):
+    store = RawDataStore(str(tmp_path / "store"), keep_versions=2)
+    shas = []
+    for body in (b"v1", b"v2", b"v3"):
+        engine.body, engine.etag = body, None
+        store.fetch("src", "http://example.test/data.zip", str(tmp_path / body.decode()))
+        shas.append(store.latest("src")["sha256"])
+
+    assert store.prune() == 1
+    assert [v["sha256"] for v in store.history("src")] == shas[:0:-1]
+    assert not os.path.exists(store.objectPath(shas[0]))
+    assert all(os.path.exists(store.objectPath(s)) for s in shas[1:])
+
+    # the newest version survives any age limit
+    assert store.prune(keep_versions=1, max_age_days=0) == 1
+    assert [v["sha256"] for v in store.history("src")] == [shas[2]]
+
+
+def test_prune_trims_cached_module_outputs(tmp_path):
+    store = RawDataStore(str(tmp_path / "store"), keep_versions=1)
+    cache_dir = store.outputCacheDir("Module")
+    old = _write(os.path.join(cache_dir, "old.gpkg"), b"a")
+    os.utime(old, (1, 1))
+    new = _write(os.path.join(cache_dir, "new.gpkg"), b"b")
+    assert store.prune() == 1
+    assert os.listdir(cache_dir) == [os.path.basename(new)]
+
+
+def test_hashPath_missing_inputs_raise(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        datastore.hashPath(str(tmp_path / "missing.csv"))
+    # a missing layer is only resolved inside an existing .gdb/.gpkg, never to a plain parent folder
+    with pytest.raises(FileNotFoundError):
+        datastore.hashPath(str(tmp_path / "layer"))
+    with pytest.raises(FileNotFoundError):
+        datastore.hashPath(str(tmp_path / "missing.gdb" / "layer"))
+
+
+def test_hashPath_layer_hashes_its_container(tmp_path):
+    gdb = tmp_path / "data.gdb"
+    gdb.mkdir()
+    _write(gdb / "a0000001.gdbtable", b"rows")
+    digest = datastore.hashPath(str(gdb))
+    assert datastore.hashPath(str(gdb / "Layer")) == digest
+
+    _write(gdb / "a0000001.sr.lock", b"lock")  # lock files don't change the hash
+    assert datastore.hashPath(str(gdb)) == digest
+    _write(gdb / "a0000001.gdbtable", b"changed")
+    assert datastore.hashPath(str(gdb)) != digest
+
+    gpkg = _write(tmp_path / "data.gpkg", b"gpkg")
+    assert datastore.hashPath(os.path.join(gpkg, "Layer")) == hashFile(gpkg)
+
+
+def test_fingerprint_depends_on_inputs_and_params():
+    base = datastore.fingerprint("Module", ["a"], {"wkid": 3857})
+    assert base == datastore.fingerprint("Module", ["a"], {"wkid": 3857})
+    assert base != datastore.fingerprint("Module", ["b"], {"wkid": 3857})
+    assert base != datastore.fingerprint("Module", ["a"], {"wkid": 4326})
+
+
+def test_cached_output_round_trip_restamps_last_updated(tmp_path, monkeypatch):
+    pytest.importorskip("selenium")
+    gp = pytest.importorskip("geopandas")
+    shapely = pytest.importorskip("shapely")
+    import datetime
+    import NaturalHazardUpdaterTool_Functions as functions
+    if functions.ARCPY_AVAILABLE:
+        pytest.skip("open-source output cache only")
+
+    monkeypatch.setattr(functions, "_raw_data_store", RawDataStore(str(tmp_path / "store")))
+    stamp = datetime.datetime(2020, 1, 1)
+    gdf = gp.GeoDataFrame({"Zone": ["IN"], "last_updated": [stamp]},
+                          geometry=[shapely.Point(0, 0)], crs=3857)
+    source = str(tmp_path / "run.gpkg")
+    gdf.to_file(source, layer="Hazard", driver="GPKG")
+
+    assert functions.restoreCachedOutput("Module", "abc", "Hazard", str(tmp_path / "out.gpkg")) is None
+    functions.cacheModuleOutput("Module", "abc", f"gpkg:{source}#Hazard", "Hazard")
+    restored = functions.restoreCachedOutput("Module", "abc", "Hazard", str(tmp_path / "out.gpkg"))
+
+    assert restored == "gpkg:{}#Hazard".format(tmp_path / "out.gpkg")
+    out = gp.read_file(str(tmp_path / "out.gpkg"), layer="Hazard")
+    assert out["Zone"].tolist() == ["IN"]
+    assert out["last_updated"].iloc[0].year > 2020
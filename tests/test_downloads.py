@@ -0,0 +1,41 @@
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from NaturalHazardUpdaterTool_Functions import DownloadWatcher, waitForDownload
+
+
+def _write(folder, name, data=b"x"):
+    with open(os.path.join(folder, name), "wb") as f:
+        f.write(data)
+
+
+def test_timeout_when_nothing_downloads(tmp_path):
+    _write(tmp_path, "old.zip")  # already there: never counts as the download
+    with pytest.raises(TimeoutError):
+        waitForDownload(str(tmp_path), lambda: None, timeout=0.3)
+
+
+def test_waits_for_temp_file_rename(tmp_path):
+    folder = str(tmp_path)
+
+    def trigger():
+        _write(folder, "data.zip.crdownload")
+        threading.Timer(0.3, os.replace, (os.path.join(folder, "data.zip.crdownload"),
+                                          os.path.join(folder, "data.zip"))).start()
+
+    path = waitForDownload(folder, trigger, timeout=10)
+    assert path == os.path.join(folder, "data.zip")
+
+
+def test_shared_watcher_hands_out_each_file_once(tmp_path):
+    folder = str(tmp_path)
+    with DownloadWatcher(folder, poll_interval=0.05) as watcher:
+        first = watcher.expect(lambda: _write(folder, "a.csv"), timeout=5)
+        second = watcher.expect(lambda: _write(folder, "b.csv"), timeout=5)
+        with pytest.raises(TimeoutError):
+            watcher.expect(lambda: None, timeout=0.2)
+    assert [os.path.basename(first), os.path.basename(second)] == ["a.csv", "b.csv"]
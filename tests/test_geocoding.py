@@ -0,0 +1,198 @@
+import datetime
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from NaturalHazardUpdaterTool_Geocoding import GeocodeCache, normalizeAddress
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = GeocodeCache(str(tmp_path / "cache" / "geocode.sqlite"), ttl_days=180, negative_ttl_days=30)
+    yield cache
+    cache.close()
+
+
+def _age(cache, days):
+    """Backdate every entry by `days`."""
+    stamp = (datetime.datetime.now() - datetime.timedelta(days=days)).isoformat(timespec="seconds")
+    cache._conn.execute("UPDATE geocode_cache SET fetched_at = ?", (stamp,))
+
+
+def test_cache_round_trip_by_normalized_address(cache):
+    cache.put("1 Main Street, Sacramento", "here", 38.58, -121.49, 0.97)
+    assert cache.get("1 MAIN ST SACRAMENTO", "here") == (38.58, -121.49, 0.97)
+    assert cache.get("1 MAIN ST SACRAMENTO", "nominatim") is None
+
+
+def test_cache_ttl_for_hits_and_misses(cache):
+    cache.put("1 Main St", "here", 38.5, -121.5)
+    cache.put("nowhere", "here", None, None)
+    assert cache.get("nowhere", "here") == (None, None, None)  # a cached miss
+
+    _age(cache, 60)  # past the negative TTL only
+    assert cache.get("nowhere", "here") is None
+    assert cache.get("1 Main St", "here") == (38.5, -121.5, None)
+
+    _age(cache, 200)
+    assert cache.get("1 Main St", "here") is None
+
+
+def test_cache_prune_removes_expired_entries(cache):
+    cache.put("1 Main St", "here", 38.5, -121.5)
+    cache.put("nowhere", "here", None, None)
+    assert cache.prune() == 0
+    _age(cache, 60)
+    assert cache.prune() == 1
+    _age(cache, 200)
+    assert cache.prune() == 1
+
+
+def test_cache_persists_across_connections(tmp_path):
+    path = str(tmp_path / "geocode.sqlite")
+    first = GeocodeCache(path)
+    first.put("1 Main St", "here", 38.5, -121.5)
+    first.close()
+    second = GeocodeCache(path, ttl_days=None)
+    assert second.get("1 Main St", "here") == (38.5, -121.5, None)
+    second.close()
+
+
+class _Provider:
+    """Fake online provider: answers getJsonAsync with a fixed location per normalized address (or no match)."""
+
+    def __init__(self, locations, fail_hosts=()):
+        self.locations = locations
+        self.fail_hosts = fail_hosts
+        self.calls = []
+
+    async def getJsonAsync(self, url, params=None, headers=None):
+        import asyncio
+        self.calls.append((url, params["q"]))
+        await asyncio.sleep(0.01)
+        if any(h in url for h in self.fail_hosts):
+            raise RuntimeError("provider down")
+        hit = self.locations.get(normalizeAddress(params["q"]))
+        if "hereapi" in url:
+            return {"items": [{"position": {"lat": hit[0], "lng": hit[1]}, "scoring": {"queryScore": 1.0}}] if hit else []}
+        return [{"lat": str(hit[0]), "lon": str(hit[1])}] if hit else []
+
+
+@pytest.fixture
+def engine():
+    from NaturalHazardUpdaterTool_Network import FetchEngine
+    engine = FetchEngine()
+    yield engine
+    engine.close()
+
+
+def _client(engine, locations, cache=None, **kwargs):
+    from NaturalHazardUpdaterTool_Geocoding import GeocoderClient
+    provider = _Provider(locations, kwargs.pop("fail_hosts", ()))
+    engine.getJsonAsync = provider.getJsonAsync
+    return GeocoderClient(engine, cache, **kwargs), provider
+
+
+def test_geocodeMany_deduplicates_and_fans_out(engine):
+    np = pytest.importorskip("numpy")
+    client, provider = _client(engine, {"1 MAIN ST FRESNO": (36.7, -119.8)}, provider="nominatim")
+    lat, lon, source = client.geocodeMany(["1 Main Street, Fresno", None, "1 MAIN ST FRESNO", "", "Nowhere"],
+                                          return_source=True)
+    assert sorted(q for _, q in provider.calls) == ["1 MAIN ST FRESNO", "NOWHERE"]  # blanks never sent
+    assert lat[[0, 2]].tolist() == [36.7, 36.7] and np.isnan(lat[[1, 3, 4]]).all()
+    assert lon[0] == -119.8
+    assert source.tolist() == ["nominatim", None, "nominatim", None, None]
+
+
+def test_here_failure_falls_back_to_nominatim_and_caches(engine, cache):
+    client, provider = _client(engine, {"1 MAIN ST FRESNO": (36.7, -119.8)}, cache,
+                               here_api_key="key", fail_hosts=("hereapi",))
+    assert [name for name, _ in client.chain] == ["here", "nominatim"]
+    assert client.geocode("1 Main St, Fresno") == (36.7, -119.8)
+    assert [("hereapi" in url) for url, _ in provider.calls] == [True, False]
+    assert cache.get("1 MAIN ST FRESNO", "nominatim") == (36.7, -119.8, None)
+
+    provider.calls.clear()
+    assert client.geocode("1 MAIN ST FRESNO") == (36.7, -119.8)
+    assert [("hereapi" in url) for url, _ in provider.calls] == [True]  # nominatim answered from the cache
+
+
+def test_cached_miss_is_final(engine, cache):
+    cache.put("NOWHERE", "nominatim", None, None)
+    client, provider = _client(engine, {"NOWHERE": (1.0, 2.0)}, cache, provider="nominatim")
+    assert client.geocode("Nowhere") == (None, None)
+    assert provider.calls == []
+
+
+def test_run_wide_geocoder_is_reused(tmp_path, monkeypatch):
+    pytest.importorskip("selenium")
+    import NaturalHazardUpdaterTool_Functions as functions
+    monkeypatch.setattr(functions, "_geocoder", None)
+    monkeypatch.setattr(functions, "_geocode_cache", GeocodeCache(str(tmp_path / "geocode.sqlite")))
+    monkeypatch.delenv("HERE_API_KEY", raising=False)
+
+    geocoder = functions.getGeocoder()
+    assert functions.getGeocoder() is geocoder
+    assert geocoder.cache is functions.getGeocodeCache()
+    assert [name for name, _ in geocoder.chain] == ["nominatim"]
+    assert functions.configureGeocoder(here_api_key="key") is functions.getGeocoder()
+    assert [name for name, _ in functions.getGeocoder().chain] == ["here", "nominatim"]
+
+
+@pytest.fixture
+def offline(tmp_path):
+    from NaturalHazardUpdaterTool_Geocoding import OfflineGeocoder
+    reference = pd.DataFrame({
+        "kind": ["address", "zip", "city", "city", "city"],
+        "name": ["1 Main St Sacramento", "95814", "San Francisco", "South San Francisco", "Fresno"],
+        "lat": [38.58, 38.58, 37.77, 37.65, 36.74],
+        "lon": [-121.49, -121.49, -122.42, -122.41, -119.79],
+    })
+    path = OfflineGeocoder.build(str(tmp_path / "index.sqlite"), reference)
+    offline = OfflineGeocoder(path)
+    yield offline
+    offline.close()
+
+
+def test_offline_lookup_precision(offline):
+    assert offline.lookup("1 MAIN ST, SACRAMENTO, CA 95814") == (38.58, -121.49, "address")
+    assert offline.lookup("9 Elm St, Sacramento, CA 95814-1234") == (38.58, -121.49, "zip")
+    assert offline.lookup("5 Oak Ave, South San Francisco, CA") == (37.65, -122.41, "city")  # longest name wins
+    assert offline.lookup("5 Oak Ave, San Francisco") == (37.77, -122.42, "city")
+    assert offline.lookup("Nowhere") == (None, None, None)
+    assert offline.lookup("") == (None, None, None)
+
+
+def test_offline_index_must_exist(tmp_path):
+    from NaturalHazardUpdaterTool_Geocoding import OfflineGeocoder
+    with pytest.raises(FileNotFoundError):
+        OfflineGeocoder(str(tmp_path / "missing.sqlite"))
+
+
+def test_confident_offline_match_skips_the_network(engine, offline):
+    from NaturalHazardUpdaterTool_Geocoding import GeocoderClient
+    client, provider = _client(engine, {"5 OAK AVE FRESNO": (36.8, -119.7)}, provider="nominatim",
+                               offline=offline, offline_min_confidence="zip")
+    assert client.engine.run(client.resolveAsync("9 Elm St, Sacramento 95814")) == (38.58, -121.49, "offline_zip")
+    assert provider.calls == []
+    # a city-level match only loses to the online chain
+    assert client.engine.run(client.resolveAsync("5 Oak Ave, Fresno")) == (36.8, -119.7, "nominatim")
+    assert client.engine.run(client.resolveAsync("6 Oak Ave, Fresno")) == (36.74, -119.79, "offline_city")
+
+    offline_only = GeocoderClient(engine, None, offline=offline, online=False)
+    assert offline_only.geocode("6 Oak Ave, Fresno") == (36.74, -119.79)
+
+
+def test_normalizeAddresses_folds_punctuation_and_abbreviations():
+    from NaturalHazardUpdaterTool_Geocoding import normalizeAddresses
+    out = normalizeAddresses(["123 N. Main Street, Apt #5, Sacramento, California 95814-1234",
+                              "  O'Brien  Rd.,, Fresno ", None, "Piñon Way (rear)"])
+    assert out.tolist() == ["123 N MAIN ST APT 5 SACRAMENTO CA 95814", "OBRIEN RD FRESNO", "", "PIÑON WAY REAR"]
+    assert normalizeAddress("1 Main St, Fresno") == normalizeAddress("1 main street fresno")
+
+
+def test_composeAddresses_skips_blank_components():
+    from NaturalHazardUpdaterTool_Geocoding import composeAddresses
+    frame = pd.DataFrame({"STREET": ["1 Main Street", "", None], "CITY": ["Fresno", "Clovis", None]})
+    assert composeAddresses(frame, ["STREET", "CITY"], suffix="CA").tolist() == ["1 MAIN ST FRESNO CA", "CLOVIS CA", ""]
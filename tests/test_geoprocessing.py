@@ -0,0 +1,229 @@
+import os
+
+import pytest
+
+gp = pytest.importorskip("geopandas")
+shapely = pytest.importorskip("shapely")
+pd = pytest.importorskip("pandas")
+
+from NaturalHazardUpdaterTool_Geoprocessing import readFrame, readFramesParallel
+
+
+def _counties(tmp_path, n=3, crs=4326):
+    paths = []
+    for i in range(n):
+        gdf = gp.GeoDataFrame({"polygon_ty": [f"T{i}", "X"], "acres": [1.5 * i, 2.0]},
+                              geometry=[shapely.box(i, 0, i + 1, 1), shapely.box(i, 1, i + 1, 2)], crs=crs)
+        path = str(tmp_path / f"county{i}.shp")
+        gdf.to_file(path)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.filterwarnings("ignore:'crs' was not provided")
+def test_readFrame_assumes_crs_and_reprojects(tmp_path):
+    path = _counties(tmp_path, 1, crs=None)[0]
+    gdf = readFrame(path, to_epsg=3857, assume_epsg=4326)
+    assert gdf.crs.to_epsg() == 3857
+    assert round(gdf.total_bounds[2]) == 111319  # 1 degree east in Web Mercator
+
+
+def test_readFrame_layer_path_and_where(tmp_path):
+    gpkg = str(tmp_path / "data.gpkg")
+    gp.GeoDataFrame({"Zone": ["IN", "OUT"]}, geometry=[shapely.box(0, 0, 1, 1)] * 2, crs=3310).to_file(gpkg, layer="Hazard")
+    gdf = readFrame(os.path.join(gpkg, "Hazard"), where="Zone = 'IN'")
+    assert gdf["Zone"].tolist() == ["IN"] and gdf.crs.to_epsg() == 3310
+
+
+def test_readFrame_arrow_and_plain_reads_match(tmp_path):
+    pytest.importorskip("pyogrio")
+    pytest.importorskip("pyarrow")
+    path = _counties(tmp_path, 1)[0]
+    plain, arrow = readFrame(path, use_arrow=False), readFrame(path, use_arrow=True)
+    assert plain.drop(columns="geometry").astype(str).equals(arrow.drop(columns="geometry").astype(str))
+    assert plain.geometry.geom_equals(arrow.geometry).all()
+
+
+def test_readFramesParallel_keeps_order_and_runs_prepare(tmp_path):
+    paths = _counties(tmp_path, 4)
+    frames = readFramesParallel(paths, to_epsg=3857, prepare=lambda i, gdf: gdf.assign(county=i),
+                                max_workers=4, use_arrow=False)
+    assert [f["county"].iloc[0] for f in frames] == [0, 1, 2, 3]
+    assert [f["polygon_ty"].iloc[0] for f in frames] == ["T0", "T1", "T2", "T3"]
+    assert all(f.crs.to_epsg() == 3857 for f in frames)
+
+
+def _assert_same_polygons(ours, theirs, by):
+    """Same groups, and each group's geometry covers the same area."""
+    theirs = theirs.reset_index().sort_values(by).reset_index(drop=True)
+    assert ours[by].astype(str).values.tolist() == theirs[by].astype(str).values.tolist()
+    diff = shapely.symmetric_difference(ours.geometry.to_numpy(), theirs.geometry.to_numpy())
+    assert (shapely.area(diff) < 1e-6).all()
+
+
+def _sra_layers():
+    import numpy as np
+    rng = np.random.default_rng(7)
+    left = gp.GeoDataFrame({"SRA": rng.choice(["FRA", "SRA", "LRA"], 40)},
+                           geometry=[shapely.box(x, y, x + 3, y + 3) for x, y in rng.uniform(0, 20, (40, 2))], crs=3310)
+    right = gp.GeoDataFrame({"COUNTY": [f"C{i % 3}" for i in range(16)], "CITY": [f"Y{i}" for i in range(16)]},
+                            geometry=[shapely.box(x * 6, y * 6, x * 6 + 6, y * 6 + 6) for x in range(4) for y in range(4)],
+                            crs=3310)
+    return left, right
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_overlayDissolve_matches_geopandas(workers):
+    from NaturalHazardUpdaterTool_Geoprocessing import overlayDissolve
+    left, right = _sra_layers()
+    ours = overlayDissolve(left, right, ["COUNTY"], ["SRA", "COUNTY"], "COUNTY", max_workers=workers)
+    theirs = gp.overlay(left, right[["COUNTY", "geometry"]], how="intersection", keep_geom_type=True).dissolve(by=["SRA", "COUNTY"])
+    _assert_same_polygons(ours, theirs, ["SRA", "COUNTY"])
+    assert ours.crs == left.crs
+
+
+def test_overlayDissolve_partition_field_must_be_dissolved():
+    from NaturalHazardUpdaterTool_Geoprocessing import overlayDissolve
+    left, right = _sra_layers()
+    with pytest.raises(ValueError):
+        overlayDissolve(left, right, ["COUNTY"], ["SRA"], "COUNTY")
+
+
+def test_overlayDissolve_without_overlap_is_empty():
+    from NaturalHazardUpdaterTool_Geoprocessing import overlayDissolve
+    left, right = _sra_layers()
+    out = overlayDissolve(left, right.set_geometry(right.translate(1000, 1000)), ["COUNTY"], ["SRA", "COUNTY"], "COUNTY")
+    assert len(out) == 0 and list(out.columns) == ["SRA", "COUNTY", "geometry"]
+
+
+def _habitat(n=200):
+    import numpy as np
+    rng = np.random.default_rng(11)
+    species = rng.choice(["frog", "owl", None], n)
+    return gp.GeoDataFrame({"species": species, "status": rng.choice(["E", "T"], n)},
+                           geometry=[shapely.Point(x, y).buffer(1.5) for x, y in rng.uniform(0, 40, (n, 2))], crs=3310)
+
+
+@pytest.mark.parametrize("max_parts", [5000, 7])
+def test_dissolveFrame_matches_geopandas(max_parts):
+    from NaturalHazardUpdaterTool_Geoprocessing import dissolveFrame
+    habitat = _habitat()
+    ours = dissolveFrame(habitat, ["species", "status"], max_parts=max_parts, max_workers=4)
+    theirs = habitat.dissolve(by=["species", "status"], dropna=False)
+    _assert_same_polygons(ours, theirs, ["species", "status"])
+    assert ours["species"].isna().sum() == 2  # null keys form their own groups
+
+
+def test_dissolveFrame_single_part_matches_explode():
+    from NaturalHazardUpdaterTool_Geoprocessing import dissolveFrame
+    habitat = _habitat()
+    ours = dissolveFrame(habitat, ["species"], single_part=True, max_parts=10)
+    theirs = habitat.dissolve(by="species", dropna=False).explode(index_parts=False).reset_index()
+    assert (shapely.get_type_id(ours.geometry.to_numpy()) == 3).all()
+    assert len(ours) == len(theirs)
+    assert abs(ours.area.sum() - theirs.area.sum()) < 1e-6
+
+
+@pytest.fixture
+def subsidence_tif(tmp_path):
+    np = pytest.importorskip("numpy")
+    rio = pytest.importorskip("rasterio")
+    from rasterio.transform import from_origin
+    rng = np.random.default_rng(3)
+    data = np.repeat(np.repeat(rng.integers(-3, 2, (6, 8)), 5, axis=0), 5, axis=1).astype("float32") * 0.1
+    data[:4, :4] = -999  # NoData corner
+    data[10, 10] = np.nan
+    path = str(tmp_path / "subsidence.tif")
+    with rio.open(path, "w", driver="GTiff", width=data.shape[1], height=data.shape[0], count=1, dtype="float32",
+                  crs="EPSG:3310", transform=from_origin(1000, 5000, 30, 30), nodata=-999) as dst:
+        dst.write(data, 1)
+    return path
+
+
+def _by_value(gdf, field="gridcode"):
+    return {v: (len(g), round(g.area.sum(), 6)) for v, g in gdf.groupby(field)}
+
+
+def test_rasterToPolygons_windows_match_a_single_pass(subsidence_tif):
+    np = pytest.importorskip("numpy")
+    rio = pytest.importorskip("rasterio")
+    from rasterio.features import shapes
+    from NaturalHazardUpdaterTool_Geoprocessing import rasterToPolygons
+
+    windowed = rasterToPolygons(subsidence_tif, scale=100, window_size=7, max_workers=4)
+    with rio.open(subsidence_tif) as src:
+        data = src.read(1, out_dtype="float64")
+        valid = np.isfinite(data) & (data != src.nodata)
+        values = np.where(valid, data * 100, 0).astype(np.int32)
+        reference = gp.GeoDataFrame(
+            [{"gridcode": int(v), "geometry": shapely.geometry.shape(g)}
+             for g, v in shapes(values, mask=valid, transform=src.transform, connectivity=4)], crs=src.crs)
+
+    assert windowed.crs.to_epsg() == 3310
+    assert _by_value(windowed) == _by_value(reference)
+    assert _by_value(rasterToPolygons(subsidence_tif, scale=100, window_size=1024)) == _by_value(reference)
+
+
+def test_rasterToPolygons_quantizer_merges_classes(subsidence_tif):
+    from NaturalHazardUpdaterTool_Geoprocessing import Quantizer, rasterToPolygons
+    plain = rasterToPolygons(subsidence_tif, scale=100, window_size=9)
+    classed = rasterToPolygons(subsidence_tif, scale=100, window_size=9, quantizer=Quantizer(breaks=[-15, 5]))
+    assert set(plain["gridcode"]) == {-30, -20, -10, 0, 10}
+    assert set(classed["gridcode"]) == {0, 1, 2}
+    assert len(classed) < len(plain)
+    assert abs(classed.area.sum() - plain.area.sum()) < 1e-6
+
+
+@pytest.fixture
+def reference(tmp_path):
+    from NaturalHazardUpdaterTool_Geoprocessing import ReferenceData
+    path = str(tmp_path / "juris.gpkg")
+    gp.GeoDataFrame({"NAME": ["A", "B"]}, geometry=[shapely.box(0, 0, 10, 10), shapely.box(10, 0, 20, 10)],
+                    crs=3310).to_file(path, layer="CA_Jurisdictions")
+    return ReferenceData(os.path.join(path, "CA_Jurisdictions"))
+
+
+def test_reference_layers_are_read_once_per_epsg(reference):
+    assert reference.jurisdictions(3310) is reference.jurisdictions(3310)
+    assert reference.jurisdictions(4326) is reference.jurisdictions(4326)
+    assert reference.boundary(3310).equals(shapely.box(0, 0, 20, 10))
+    assert reference.tree(3310) is reference.tree(3310)
+
+
+def test_containsPoints(reference):
+    np = pytest.importorskip("numpy")
+    inside = reference.containsPoints([5, 15, 25, np.nan], [5, 5, 5, 5], epsg=3310)
+    assert inside.tolist() == [True, True, False, False]
+    x, y = gp.GeoSeries([shapely.Point(5, 5)], crs=3310).to_crs(4326).iloc[0].coords[0]
+    assert reference.containsPoints([x], [y], epsg=4326).tolist() == [True]
+
+
+def test_clip_matches_geopandas(reference):
+    layer = gp.GeoDataFrame({"id": [1, 2, 3]}, geometry=[shapely.box(1, 1, 2, 2), shapely.box(15, 5, 25, 15),
+                                                          shapely.box(30, 30, 31, 31)], crs=3310)
+    ours = reference.clip(layer)
+    theirs = gp.clip(layer, reference.boundary(3310)).sort_values("id")
+    assert ours["id"].tolist() == theirs["id"].tolist() == [1, 2]
+    assert all(a.equals(b) for a, b in zip(ours.geometry, theirs.geometry))
+
+
+def test_erase_matches_geopandas_difference(reference):
+    subsidence = gp.GeoDataFrame({"gridcode": [1, 2]}, geometry=[shapely.box(5, 5, 12, 12), shapely.box(2, 2, 3, 3)],
+                                 crs=3310)
+    ours = reference.erase(subsidence, epsg=3310)
+    theirs = gp.overlay(reference.jurisdictions(3310), subsidence, how="difference")
+    assert ours["NAME"].tolist() == theirs["NAME"].tolist() == ["A", "B"]
+    assert all(a.equals(b) for a, b in zip(ours.geometry, theirs.geometry))
+    assert reference.jurisdictions(3310).area.sum() == 200  # the cached frame is not modified
+
+
+def test_getReferenceData_is_configured_once_per_run(reference, monkeypatch):
+    pytest.importorskip("selenium")
+    import NaturalHazardUpdaterTool_Functions as functions
+    monkeypatch.setattr(functions, "_reference_data", {})
+    monkeypatch.setattr(functions, "_default_reference_path", None)
+    with pytest.raises(RuntimeError):
+        functions.getReferenceData()
+    configured = functions.configureReferenceData(reference.jurisdictions_path)
+    assert functions.getReferenceData() is configured
+    assert functions.getReferenceData(reference.jurisdictions_path) is configured
@@ -0,0 +1,136 @@
+import json
+import time
+import random
+import asyncio
+
+import pytest
+
+from NaturalHazardUpdaterTool_Network import FetchEngine, FetchError, HostLimiter, HostPolicy, _retry_after_seconds
+
+
+@pytest.fixture
+def engine():
+    engine = FetchEngine(max_connections=8, host_policies={"example.test": HostPolicy(rate=200.0, burst=8, max_concurrent=4)})
+    engine._aiohttp = None  # requests go through _request_blocking, replaced per test
+    yield engine
+    engine.close()
+
+
+def _serve(engine, handler):
+    """Route the engine's blocking transport to handler(url, params) -> (status, headers, payload)."""
+    calls = []
+
+    def transport(url, params, headers, dest_path, ok_statuses):
+        calls.append((url, dict(params or {})))
+        status, resp_headers, payload = handler(url, params or {})
+        body = json.dumps(payload).encode("utf-8")
+        if status >= 400 and status not in ok_statuses:
+            raise FetchError(url, status, "", resp_headers)
+        if dest_path is None:
+            return status, resp_headers, body, None
+        with open(dest_path, "wb") as f:
+            f.write(body)
+        return status, resp_headers, None, "sha"
+
+    engine._request_blocking = transport
+    return calls
+
+
+def test_getJson_and_download(engine, tmp_path):
+    _serve(engine, lambda url, params: (200, {"ETag": "x"}, {"ok": True, "q": params.get("q")}))
+    assert engine.getJson("http://example.test/a", {"q": "1"}) == {"ok": True, "q": "1"}
+    status, headers, sha = engine.download("http://example.test/b", str(tmp_path / "b.json"))
+    assert (status, headers["ETag"], sha) == (200, "x", "sha")
+    assert json.loads((tmp_path / "b.json").read_text())["ok"] is True
+
+
+def test_queryLayer_pages_in_object_id_order(engine):
+    def handler(url, params):
+        if params.get("returnIdsOnly"):
+            return 200, {}, {"objectIds": [5, 1, 4, 2, 3]}
+        time.sleep(random.uniform(0, 0.05))  # pages finish out of order
+        return 200, {}, {"ids": [int(i) for i in params["objectIds"].split(",")]}
+
+    calls = _serve(engine, handler)
+    pages = engine.queryLayer("http://example.test/layer/0", chunk_size=2)
+    assert [p["ids"] for p in pages] == [[1, 2], [3, 4], [5]]
+    assert len(calls) == 4
+
+
+def test_queryLayer_error_payload_raises(engine):
+    _serve(engine, lambda url, params: (200, {}, {"error": {"code": 400}}))
+    with pytest.raises(FetchError):
+        engine.queryLayer("http://example.test/layer/0")
+
+
+def test_submit_runs_requests_concurrently(engine):
+    def handler(url, params):
+        time.sleep(0.2)
+        return 200, {}, {}
+
+    _serve(engine, handler)
+    start = time.monotonic()
+    futures = [engine.submit(engine.getJsonAsync(f"http://example.test/{i}")) for i in range(4)]
+    assert [f.result() for f in futures] == [{}] * 4
+    assert time.monotonic() - start < 0.6  # 4 x 0.2 s would be 0.8 s serially
+
+
+def test_host_limiter_paces_after_burst():
+    limiter = HostLimiter(HostPolicy(rate=20.0, burst=2, max_concurrent=1))
+
+    async def take(n):
+        start = time.monotonic()
+        for _ in range(n):
+            await limiter.acquire()
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(take(6))
+    assert 0.18 <= elapsed < 0.5  # 2 free, then 4 at 20/s
+
+
+def test_host_limiter_penalize_and_reward():
+    limiter = HostLimiter(HostPolicy(rate=16.0, burst=1, max_concurrent=1))
+    assert limiter.penalize(None) == 2.0  # first strike: 2 s exponential delay
+    assert limiter.penalize(7.5) == 7.5  # Retry-After wins
+    assert limiter._factor == 0.25
+    for _ in range(10):
+        limiter.penalize(0)
+    assert limiter._factor == 1.0 / 16.0  # floor
+    for _ in range(20):
+        limiter.reward()
+    assert limiter._factor == 1.0
+
+
+def test_retry_after_header_forms():
+    assert _retry_after_seconds({"Retry-After": "3"}) == 3.0
+    assert _retry_after_seconds({"retry-after": "-1"}) == 0.0
+    assert _retry_after_seconds({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0  # in the past
+    assert _retry_after_seconds({"Retry-After": "soon"}) is None
+    assert _retry_after_seconds({}) is None
+
+
+def test_429_is_retried_after_backoff(engine):
+    statuses = [429, 503, 200]
+    _serve(engine, lambda url, params: (statuses.pop(0), {"Retry-After": "0"}, {"ok": True}))
+    assert engine.getJson("http://example.test/a") == {"ok": True}
+    assert statuses == []
+    assert engine._host("http://example.test/a")._factor == 0.25 * 1.25  # halved twice, one success
+
+
+def test_retries_give_up_and_other_errors_are_not_retried(engine):
+    engine.max_retries = 2
+    calls = _serve(engine, lambda url, params: (429, {"Retry-After": "0"}, {}))
+    with pytest.raises(FetchError) as e:
+        engine.getJson("http://example.test/a")
+    assert e.value.status == 429 and len(calls) == 3
+
+    calls = _serve(engine, lambda url, params: (404, {}, {}))
+    with pytest.raises(FetchError) as e:
+        engine.getJson("http://example.test/b")
+    assert e.value.status == 404 and len(calls) == 1
+
+
+def test_numbered_hosts_share_a_policy(engine):
+    policy = engine._host("https://services3.arcgis.com/x/FeatureServer/0").policy
+    assert policy is engine.host_policies["services.arcgis.com"]
+    assert engine._host("https://other.test/").policy.max_concurrent == engine.per_host
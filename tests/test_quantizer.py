@@ -0,0 +1,24 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from NaturalHazardUpdaterTool_Geoprocessing import Quantizer
+
+
+def test_bin_edges_land_in_upper_bin():
+    q = Quantizer(bin_width=0.1)
+    assert q.codes([0.3]).tolist() == [3]
+    assert q.codes([0.0, 0.1, 0.2, 0.7, 1.0]).tolist() == [0, 1, 2, 7, 10]
+    assert q.codes([0.29999, 0.35]).tolist() == [2, 3]
+
+
+def test_negative_bin_edges():
+    q = Quantizer(bin_width=0.25)
+    assert q.codes([-0.25, -0.2, -0.5, -0.75]).tolist() == [-1, -1, -2, -3]
+    assert q.lower(q.codes([-0.25])).tolist() == [-0.25]
+
+
+def test_break_edges_land_in_upper_class():
+    q = Quantizer(breaks=[-2, -1, -0.5, 0])
+    assert q.codes([-3, -2, -1, -0.5, 0, 1]).tolist() == [0, 1, 2, 3, 4, 4]
+    assert q.codes([-1.0000001]).tolist() == [1]
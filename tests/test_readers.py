@@ -0,0 +1,85 @@
+import pytest
+
+pytest.importorskip("selenium")
+pd = pytest.importorskip("pandas")
+
+from NaturalHazardUpdaterTool_Functions import dmsToDecimal, readDelimitedTable, readExcelSheet
+
+
+def _write(path, text, encoding="cp1252"):
+    path.write_bytes(text.encode(encoding) if isinstance(text, str) else text)
+    return str(path)
+
+
+def test_readDelimitedTable_chunks_and_column_subset(tmp_path):
+    lines = ["GLOBAL ID\tBUSINESS NAME\tSKIP\tLATITUDE"] + [f"T{i}\tCafé {i}\tx\t{i}" for i in range(5)]
+    path = _write(tmp_path / "sites.txt", "\n".join(lines) + "\n")
+
+    chunks = list(readDelimitedTable(path, ["GLOBAL_ID", "BUSINESS_NAME", "LATITUDE"], chunksize=2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    df = pd.concat(chunks, ignore_index=True)
+    assert list(df.columns) == ["GLOBAL_ID", "BUSINESS_NAME", "LATITUDE"]
+    assert df["BUSINESS_NAME"].iloc[4] == "Café 4"
+    assert df["LATITUDE"].tolist() == ["0", "1", "2", "3", "4"]  # text, as the old split() loader
+
+
+def test_readDelimitedTable_keeps_blanks_and_ignores_trailing_columns(tmp_path):
+    path = _write(tmp_path / "sites.txt", 'A\tB\t\nNA\t"q\t\n\t2\textra\n')
+    df = readDelimitedTable(path)
+    assert list(df.columns) == ["A", "B"]
+    assert df["A"].tolist() == ["NA", ""]  # no NA sniffing
+    assert df["B"].tolist() == ['"q', "2"]  # quotes left alone without quoted=True
+
+
+def test_readDelimitedTable_strips_nul_bytes(tmp_path):
+    raw = b"N\x00ame,Lat\x00itude\n\x00Dump A,38.5\nDump\x00 B,x\n"  # NUL-padded like the SWIS export
+    path = _write(tmp_path / "swis.csv", raw)
+    df = readDelimitedTable(path, sep=",", encoding="utf-8", quoted=True, strip_nul=True, numeric=["Latitude"])
+    assert df["Name"].tolist() == ["Dump A", "Dump B"]
+    assert df["Latitude"].iloc[0] == 38.5 and pd.isna(df["Latitude"].iloc[1])
+
+
+def test_readDelimitedTable_nul_stripping_in_chunks(tmp_path):
+    rows = "".join(f"S{i}\x00,{i}\n" for i in range(5))
+    path = _write(tmp_path / "swis.csv", ("ID,N\n" + rows).encode("utf-8"))
+    chunks = list(readDelimitedTable(path, sep=",", encoding="utf-8", strip_nul=True, chunksize=2))
+    assert pd.concat(chunks)["ID"].tolist() == [f"S{i}" for i in range(5)]
+
+
+def test_readDelimitedTable_quoted_fields(tmp_path):
+    path = _write(tmp_path / "swis.csv", 'Name,Address\n"Dump, Inc.","1 ""Main"" St"\n', "utf-8")
+    df = readDelimitedTable(path, sep=",", encoding="utf-8", quoted=True)
+    assert df.iloc[0].tolist() == ["Dump, Inc.", '1 "Main" St']
+
+
+def test_nul_filter_across_block_boundaries():
+    import io
+    from NaturalHazardUpdaterTool_Functions import _NulFilteredReader
+    data = b"\x00\x00ab\x00c" * 50 + b"\x00" * 10
+    reader = io.BufferedReader(_NulFilteredReader(io.BytesIO(data), block_size=3), buffer_size=4)
+    assert reader.read() == b"abc" * 50
+
+
+def test_readExcelSheet_filters_and_selects_columns(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "CALLS"
+    ws.append(["SEQNOS", "LOCATION STATE", "DESCRIPTION", "LAT DEG"])
+    ws.append([1, "CA ", "spill", 38])
+    ws.append([2, "NV", "spill", 39])
+    ws.append([3, "CA", None])
+    path = str(tmp_path / "erns.xlsx")
+    wb.save(path)
+
+    df = readExcelSheet(path, "CALLS", ["SEQNOS", "LAT_DEG"], {"LOCATION_STATE": ["CA"]}, {"SEQNOS": "int"})
+    assert list(df.columns) == ["SEQNOS", "LOCATION_STATE", "LAT_DEG"]  # filter columns are kept too
+    assert df["SEQNOS"].tolist() == [1, 3]
+    assert df["LAT_DEG"].tolist() == ["38", ""]  # short rows padded with ""
+
+
+def test_dmsToDecimal():
+    np = pytest.importorskip("numpy")
+    lat = dmsToDecimal(["38", " 34 ", "x"], ["30", "0", "1"], ["0", "36", "1"])
+    assert lat[:2].tolist() == [38.5, 34.01] and np.isnan(lat[2])
+    assert dmsToDecimal([-121], [15], [0], negative=True).tolist() == [-121.25]
@@ -0,0 +1,151 @@
+import pytest
+
+pytest.importorskip("selenium")
+pd = pytest.importorskip("pandas")
+gp = pytest.importorskip("geopandas")
+
+import NaturalHazardUpdaterTool_Functions as functions
+from NaturalHazardUpdaterTool_Functions import tableToPointsFrame, tableToPointsStream, textFieldLengths
+
+open_source_only = pytest.mark.skipif(functions.ARCPY_AVAILABLE, reason="open-source output path")
+
+
+def _sites(n=4):
+    return pd.DataFrame({
+        "SITE ID": [f"S{i}" for i in range(n)],
+        "LAT": ["38.5", "", "0", "38.6"][:n],
+        "LON": ["-121.5", "-121.4", "0", "-121.6"][:n],
+    })
+
+
+@open_source_only
+def test_tableToPointsFrame_writes_valid_rows(tmp_path):
+    out = str(tmp_path / "points.gpkg")
+    path, missed = tableToPointsFrame(_sites(), "LAT", "LON", 4326, str(tmp_path), "Sites", open_source_output=out)
+
+    gdf = gp.read_file(path, layer="Sites")
+    assert gdf["SITE_ID"].tolist() == ["S0", "S3"]  # headers normalized like the old loader
+    assert gdf.geometry.x.round(1).tolist() == [-121.5, -121.6]
+    assert missed["SITE_ID"].tolist() == ["S1", "S2"]
+
+
+@open_source_only
+def test_tableToPointsFrame_accepts_pyarrow_tables(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    out = str(tmp_path / "points.gpkg")
+    path, missed = tableToPointsFrame(pa.Table.from_pandas(_sites()), "LAT", "LON", 4326, str(tmp_path), "Sites",
+                                      open_source_output=out)
+    assert len(gp.read_file(path, layer="Sites")) == 2 and len(missed) == 2
+
+
+@open_source_only
+def test_tableToPointsFrame_requires_an_output_without_arcpy(tmp_path):
+    with pytest.raises(RuntimeError):
+        tableToPointsFrame(_sites(), "LAT", "LON", 4326, str(tmp_path), "Sites")
+
+
+@open_source_only
+def test_tableToPointsStream_appends_every_chunk(tmp_path):
+    out = str(tmp_path / "points.gpkg")
+    rows = [["A", "38.5", "-121.5"], ["B", "", "-121.5"], ["C", "38.7", "-121.7"], ["D", "40", "10"], ["E", "39", "-122"]]
+    chunks = [rows[:2], rows[2:4], rows[4:]]
+    path, counts, rejects = tableToPointsStream(chunks, "LAT", "LON", 4326, str(tmp_path), "Sites",
+                                                open_source_output=out, header=["ID", "LAT", "LON"])
+
+    assert gp.read_file(path, layer="Sites")["ID"].tolist() == ["A", "C", "E"]
+    assert counts == {"missing_lat": 1, "outside_ca": 1}
+    assert pd.read_parquet(rejects)["ID"].tolist() == ["B", "D"]
+
+
+@open_source_only
+def test_tableToPointsStream_without_valid_rows_raises(tmp_path):
+    with pytest.raises(RuntimeError):
+        tableToPointsStream([[["A", "", ""]]], "LAT", "LON", 4326, str(tmp_path), "Sites",
+                            open_source_output=str(tmp_path / "points.gpkg"), header=["ID", "LAT", "LON"])
+
+
+def test_textFieldLengths_takes_the_longest_value_over_all_chunks():
+    chunks = [pd.DataFrame({"NAME": ["ab", None], "N": [1, 2]}),
+              pd.DataFrame({"NAME": pd.Series(["abcdef"], dtype="category"), "N": [3]})]
+    assert textFieldLengths(chunks) == {"NAME": 7}  # length + 1, numeric columns skipped
+
+
+def test_points_to_records_sizes_text_fields():
+    np = pytest.importorskip("numpy")
+    good = pd.DataFrame({"NAME": ["abcdef", None], "CITY": pd.Series(["X", "Y"], dtype="category")})
+    records = functions._points_to_records(good, [1.0, 2.0], [3.0, 4.0], {"NAME": 4, "CITY": 300})
+    assert records.dtype["NAME"] == np.dtype("<U4") and records.dtype["CITY"] == np.dtype("<U255")
+    assert records["NAME"].tolist() == ["abcd", ""]
+    assert records["POINT_X_"].tolist() == [1.0, 2.0]
+
+
+@open_source_only
+def test_tableToPointsFrame_reprojects_in_memory(tmp_path):
+    out = str(tmp_path / "points.gpkg")
+    path, _ = tableToPointsFrame(_sites(1), "LAT", "LON", 4326, str(tmp_path), "Sites", open_source_output=out,
+                                 out_sr_wkid=3857)
+    gdf = gp.read_file(path, layer="Sites")
+    assert gdf.crs.to_epsg() == 3857
+    assert round(gdf.geometry.x.iloc[0]) == -13525318  # -121.5 degrees in Web Mercator
+
+
+def test_normalizeFieldName_matches_reader_headers():
+    assert functions.normalizeFieldName(" SITE / NAME ") == "SITE___NAME"
+    assert functions.normalizeFieldName("2nd Address") == "_2nd_Address"
+    assert functions._normalize_header(["Lat.", "Site-ID"]) == ["Lat_", "Site_ID"]
+
+
+def test_applySchema_casts_to_compact_types():
+    df = pd.DataFrame({"STATUS": [" Open", "Closed ", "Open"], "ZIP": ["95814", "x", "95816.0"],
+                       "DEPTH": ["1.5", "", "2"], "CLOSED": ["2020-01-02", "", "bad"], "NAME": ["a", None, "c"]})
+    out = functions.applySchema(df, {"STATUS": "category", "ZIP": "int", "DEPTH": "float", "CLOSED": "date",
+                                     "NAME": "text", "MISSING": "int"})
+    assert out["STATUS"].cat.categories.tolist() == ["Closed", "Open"]
+    assert out["ZIP"].tolist()[::2] == [95814, 95816] and pd.isna(out["ZIP"].iloc[1])
+    assert str(out["ZIP"].dtype) == "Int64"
+    assert out["DEPTH"].iloc[0] == 1.5 and pd.isna(out["DEPTH"].iloc[1])
+    assert out["CLOSED"].iloc[0] == pd.Timestamp("2020-01-02") and out["CLOSED"].iloc[1:].isna().all()
+    assert df["ZIP"].tolist() == ["95814", "x", "95816.0"]  # input untouched
+    with pytest.raises(ValueError):
+        functions.applySchema(df, {"ZIP": "zipcode"})
+
+
+def test_points_to_records_handles_nullable_ints_and_dates():
+    np = pytest.importorskip("numpy")
+    good = pd.DataFrame({"COMPLETE": pd.array([1, 2], dtype="Int64"), "GAPPY": pd.array([1, None], dtype="Int64"),
+                         "WHEN": pd.to_datetime(["2020-01-01", None])})
+    records = functions._points_to_records(good, [0.0, 0.0], [0.0, 0.0], {})
+    assert records.dtype["COMPLETE"] == np.dtype("int32")
+    assert records.dtype["GAPPY"] == np.dtype("float64") and np.isnan(records["GAPPY"][1])
+    assert records.dtype["WHEN"] == np.dtype("datetime64[us]")
+
+
+def test_rejectionReasons_codes_in_precedence_order():
+    df = pd.DataFrame({"LAT": ["38.5", "", " ", "abc", "0", "45", "", "38.5", None],
+                       "LON": ["-121.5", "-121", "", "-121", "0.0000001", "-121", "", "x", "-121"]})
+    reasons = functions.rejectionReasons(df, "LAT", "LON")
+    assert reasons.tolist()[1:] == ["missing_lat", "missing_lat", "non_numeric", "null_island", "outside_ca",
+                                    "missing_lat", "non_numeric", "missing_lat"]
+    assert pd.isna(reasons.iloc[0])
+    # without bounds, only the coordinate checks apply
+    assert pd.isna(functions.rejectionReasons(df, "LAT", "LON", bounds=None).iloc[5])
+
+
+def test_projected_inputs_skip_the_ca_bounds_check():
+    df = pd.DataFrame({"Y": ["4000000"], "X": ["-13500000"]})
+    good, missed, lon, lat = functions._split_valid_points(df, "Y", "X", 3857)
+    assert len(good) == 1 and len(missed) == 0
+
+
+def test_rejected_rows_writer_appends_chunks(tmp_path):
+    path = str(tmp_path / "rejected.parquet")
+    with functions.RejectedRowsWriter(path) as rejects:
+        rejects.write(pd.DataFrame({"ID": [1], "REJECT_REASON": ["missing_lat"]}))
+        rejects.write(pd.DataFrame({"ID": ["b", "c"], "REJECT_REASON": ["outside_ca", "missing_lat"]}))
+        rejects.write(pd.DataFrame({"ID": [], "REJECT_REASON": []}))
+    assert rejects.counts == {"missing_lat": 2, "outside_ca": 1}
+    out = pd.read_csv(rejects.path, dtype=str) if rejects.path.endswith(".csv") else pd.read_parquet(rejects.path)
+    assert out["ID"].tolist() == ["1", "b", "c"]  # stored as text so chunks share one schema
+
+    summary = functions.rejectionSummary(rejects.counts, rejects.path)
+    assert summary.splitlines()[:3] == ["Warning, 3 records were rejected:", "\tmissing_lat: 2", "\toutside_ca: 1"]
@@ -0,0 +1,49 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from NaturalHazardUpdaterTool_Geoprocessing import ZoneRules
+
+
+def test_numeric_codes_with_nulls_match():
+    rules = ZoneRules("code", {1: "IN", 2: "OUT"}, default="NA")
+    zones, unknown = rules.apply({"code": [1, 2, None]})
+    assert zones.tolist() == ["IN", "OUT", "NA"]
+    assert unknown == set()
+
+
+def test_float_column_matches_integral_codes():
+    rules = ZoneRules("code", {1: "IN", 2: "OUT"}, default="NA")
+    zones, unknown = rules.apply(pd.DataFrame({"code": [1.0, 2.0, 3.5, np.nan]}))
+    assert zones.tolist() == ["IN", "OUT", "NA", "NA"]
+    assert unknown == {"3.5"}
+
+
+def test_string_codes_and_blanks():
+    rules = ZoneRules("code", {"1": "IN"}, default="NA")
+    zones, unknown = rules.apply({"code": [1, "1", " ", "X"]})
+    assert zones.tolist() == ["IN", "IN", "NA", "NA"]
+    assert unknown == {"X"}
+
+
+def test_override_on_float_field():
+    rules = ZoneRules("code", {"A": "IN"}).override("A", "sub", [3], "MAYBE")
+    zones, _ = rules.apply({"code": ["A", "A"], "sub": [3.0, None]})
+    assert zones.tolist() == ["MAYBE", "IN"]
+
+
+def test_first_matching_override_wins_and_fields_lists_inputs():
+    rules = (ZoneRules("code", {"A": "IN"}, default="OUT")
+             .override("A", "kind", [" Pond "], "WATER")
+             .override("A", "kind", ["pond", "lake"], "LATER")
+             .override("A", "name", ["x"], "NAME"))
+    assert rules.fields == ["code", "kind", "name"]
+    zones, _ = rules.apply({"code": ["A", "A", "B"], "kind": ["POND", "lake", "pond"]})  # "name" missing: skipped
+    assert zones.tolist() == ["WATER", "LATER", "OUT"]
+
+
+def test_no_code_field_and_empty_frames():
+    assert ZoneRules(default="NA").apply({"x": [1, 2]})[0].tolist() == ["NA", "NA"]
+    zones, unknown = ZoneRules("code", {1: "IN"}).apply({"code": []})
+    assert zones.tolist() == [] and unknown == set()